@@ -0,0 +1,110 @@
+# -------------------------------------------------------------------------------- #
+# CMS Bulk Write Benchmark
+# -------------------------------------------------------------------------------- #
+# Creates a stream of articles against the fake CMS one `create_article_in_cms` call at
+# a time, then with the bulk writer (one request per article, and through the bulk
+# endpoint), and replays the stream to check that it upserts instead of duplicating.
+#
+# Usage: python -m benchmarks.bench_cms_bulk --articles 500 --concurrency 8 \
+#            --cms-latency lognormal:median=0.05,sigma=0.3 --cms-error-rate 0.02
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import argparse
+import asyncio
+import collections
+import os
+import sys
+import time
+from typing import Dict, List
+
+# Fake Servers
+from benchmarks.fake_cms import FakeCmsServer
+from benchmarks.latency import LatencyDistribution
+
+
+# -------------------------------------------------------------------------------- #
+# Main
+# -------------------------------------------------------------------------------- #
+
+def report(name: str, elapsed: float, statuses: Dict[str, int], server: FakeCmsServer, created_before: int) -> None:
+    print(f"{name:<22} {elapsed:8.2f}s {sum(statuses.values()) / elapsed:10.1f}/s "
+          f"{len(server.created_articles) - created_before:8d}  {dict(statuses)}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    server = FakeCmsServer(latency=LatencyDistribution.parse(args.cms_latency), error_rate=args.cms_error_rate)
+    async with server:
+        os.environ.update({"CMS_BASE_URL": server.base_url, "CMS_ARTICLES_PATH": server.articles_path})
+
+        # Imported once the fake CMS URL is in the environment
+        from src.cms.bulk import article_dedup_key, create_articles_in_cms
+        from src.cms.calls import create_article_in_cms
+        from src.cms.types import CmsBulkArticleItem, CmsCreateArticleRequest
+
+        def make_items(run_name: str) -> List[CmsBulkArticleItem]:
+            items = []
+            for index in range(args.articles):
+                source_index = index % (args.articles - args.duplicates)
+                request = CmsCreateArticleRequest(title=f"Article {index}", excerpt="An excerpt.",
+                                                  content="Content. " * 200, brandId=f"brand-{source_index % 4}",
+                                                  tagIds=["category"])
+                dedup_key = article_dedup_key(request.brandId, f"{run_name} source {source_index}")
+                items.append(CmsBulkArticleItem(request=request, dedup_key=dedup_key))
+            return items
+
+        print(f"{args.articles} articles ({args.duplicates} duplicate keys), concurrency {args.concurrency}\n")
+        print(f"{'variant':<22} {'time':>9} {'throughput':>12} {'created':>8}  statuses")
+
+        # One create call at a time, as before
+        items = make_items("sequential")
+        created_before, statuses = len(server.created_articles), collections.Counter()
+        start_time = time.perf_counter()
+        for item in items:
+            try:
+                await create_article_in_cms(item.request, idempotency_key=item.dedup_key)
+                statuses["created"] += 1
+            except ValueError:
+                statuses["error"] += 1
+        report("sequential", time.perf_counter() - start_time, statuses, server, created_before)
+
+        # The bulk writer, per article and through the bulk endpoint, then replayed
+        for name, bulk_path, run_name in (("bulk writer", None, "single"),
+                                          ("bulk endpoint", server.articles_bulk_path, "bulk"),
+                                          ("bulk endpoint replay", server.articles_bulk_path, "bulk")):
+            created_before = len(server.created_articles)
+            start_time = time.perf_counter()
+            results = await create_articles_in_cms(make_items(run_name), concurrency=args.concurrency,
+                                                   batch_size=args.batch_size, bulk_path=bulk_path)
+            assert [result.index for result in results] == list(range(args.articles))
+            report(name, time.perf_counter() - start_time,
+                   collections.Counter(result.status for result in results), server, created_before)
+
+        print(f"\nServer: {server.counters()}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare sequential and bulk article creation against a fake CMS.")
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--duplicates", type=int, default=10, help="Articles repeating an earlier dedup key.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=25)
+    parser.add_argument("--cms-latency", default="lognormal:median=0.05,sigma=0.3")
+    parser.add_argument("--cms-error-rate", type=float, default=0.02, help="Share of CMS requests failing with 500.")
+    args = parser.parse_args()
+
+    os.environ.setdefault("PROMPT_TEMPLATE_DIR", "prompt_templates")
+    os.environ.update({
+        "CMS_WRITE_RETRY_BASE_DELAY": os.getenv("CMS_WRITE_RETRY_BASE_DELAY", "0.05"),
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "ERROR"),
+    })
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+# -------------------------------------------------------------------------------- #
+# Draft Validation Benchmark
+# -------------------------------------------------------------------------------- #
+# Measures the streaming MDX/custom-XML validator: its cost per streamed chunk on a
+# 1500-word draft, and, against a fake OpenAI server whose first draft uses an unknown
+# tag early on, how soon the doomed generation is aborted and regenerated compared to
+# generating it in full.
+#
+# Usage: python -m benchmarks.bench_draft_validation --chunk-chars 16 --token-interval 0.002
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+# Fake Servers
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.latency import LatencyDistribution
+
+# Fixtures
+from benchmarks.bench_e2e import make_xml_block_docs
+
+
+# -------------------------------------------------------------------------------- #
+# Fixtures
+# -------------------------------------------------------------------------------- #
+
+def make_draft(sections: int, bad_section: int = -1) -> str:
+    """
+    Build a draft of about 100 words per section, using a valid custom tag in each section
+    and an unknown one in `bad_section`.
+    """
+    parts = ["Intro paragraph for the article.\n\n"]
+    for index in range(sections):
+        tag = ('<NotABlock title="x" />' if index == bad_section
+               else f'<Block{index % 3} param0="value" param1={{{index}}}>\nInside the block.\n</Block{index % 3}>')
+        parts.append(f"## Section {index + 1}\n\n{'Some generated content for the section. ' * 15}\n\n{tag}\n\n"
+                     f"```python\n# not a heading\nprint({index})\n```\n\n")
+    return "".join(parts)
+
+
+class InvalidFirstDraftServer(FakeOpenAIServer):
+    """
+    Fake OpenAI server whose first draft has an unknown tag in its second section.
+    """
+
+    def __init__(self, sections: int, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.sections = sections
+        self.drafts = 0
+
+    def complete_chat(self, body: Dict[str, Any], choice_index: int = 0) -> str:
+        self.drafts += 1
+        return make_draft(self.sections, bad_section=1 if self.drafts == 1 else -1)
+
+
+# -------------------------------------------------------------------------------- #
+# Main
+# -------------------------------------------------------------------------------- #
+
+async def run(args: argparse.Namespace) -> None:
+    # Imported once the environment is set
+    from pydantic import TypeAdapter
+    from src.cms.types import CmsXmlBlock
+    from src.llm.validation import MdxDraftValidator, build_xml_block_index
+
+    xml_blocks = TypeAdapter(List[CmsXmlBlock]).validate_python(
+        [doc["xmlBlock"] for doc in make_xml_block_docs(args.xml_blocks)])
+    index = build_xml_block_index(xml_blocks)
+
+    # Validator cost per streamed chunk
+    draft = make_draft(args.sections)
+    chunks = [draft[i:i + args.chunk_chars] for i in range(0, len(draft), args.chunk_chars)]
+    start_time = time.perf_counter()
+    for _ in range(args.iterations):
+        validator = MdxDraftValidator(index)
+        for chunk in chunks:
+            validator.feed(chunk)
+        validator.finish()
+    elapsed = (time.perf_counter() - start_time) / args.iterations
+    assert not validator.issues, validator.issues
+    print(f"Draft: {validator.words} words, {validator.tags} tags, {len(chunks)} chunks of {args.chunk_chars} chars")
+    print(f"Validation: {elapsed * 1e3:.2f} ms per draft, {elapsed / len(chunks) * 1e6:.2f} us per chunk\n")
+
+    # Early abort of a doomed streamed draft
+    server = InvalidFirstDraftServer(sections=args.sections, default_latency=LatencyDistribution.parse(args.openai_latency),
+                                     token_interval=LatencyDistribution.parse(args.token_interval),
+                                     chunk_chars=args.chunk_chars)
+    async with server:
+        os.environ["OPENAI_BASE_URL"] = f"{server.base_url}/v1"
+        from src.llm.calls import call_content_generation_agent
+
+        for validate in (False, True):
+            server.drafts = 0
+            start_time = time.perf_counter()
+            content = await call_content_generation_agent("ai-prompt-engineering",
+                                                          {"raw_content": "notes", "custom_xml_tags": ""},
+                                                          stream=True, bypass_cache=True, brand_id="brand",
+                                                          xml_blocks=xml_blocks if validate else None)
+            elapsed = time.perf_counter() - start_time
+            valid = MdxDraftValidator(index).feed(content) is None
+            print(f"{'with validator' if validate else 'without validator':<18} {elapsed:6.2f}s  "
+                  f"drafts requested: {server.drafts}  final draft valid: {valid}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure the draft validator's cost and early abort.")
+    parser.add_argument("--sections", type=int, default=12, help="Sections of about 100 words each.")
+    parser.add_argument("--xml-blocks", type=int, default=20)
+    parser.add_argument("--chunk-chars", type=int, default=16)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--openai-latency", default="0.5", help="Time to first token.")
+    parser.add_argument("--token-interval", default="0.002", help="Delay between streamed chunks.")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ.setdefault("PROMPT_TEMPLATE_DIR", "prompt_templates")
+    os.environ.update({"LLM_CACHE_BACKEND": "none", "LOG_LEVEL": os.getenv("LOG_LEVEL", "ERROR")})
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+# -------------------------------------------------------------------------------- #
+# End-to-end Latency Benchmark
+# -------------------------------------------------------------------------------- #
+# Replays a corpus of article requests through `write_long_form_article_async` against
+# local fake OpenAI and CMS servers with configurable latency distributions, streaming
+# and error injection. Reports p50/p95/p99 per pipeline stage, throughput and the number
+# of connections each server saw, and saves the results as JSON so runs can be compared.
+#
+# Usage: python -m benchmarks.bench_e2e --corpus requests.jsonl --requests 200 --concurrency 16 \
+#            --openai-latency lognormal:median=0.8,sigma=0.4 --output results.json --compare baseline.json
+#
+# Each corpus line is a request body for the handler. Without a corpus, synthetic requests
+# are generated across every category template.
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+# Fake Servers
+from benchmarks.fake_cms import FakeCmsServer
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.latency import LatencyDistribution
+
+
+# -------------------------------------------------------------------------------- #
+# Corpus
+# -------------------------------------------------------------------------------- #
+
+def load_corpus(path: Optional[str], brands: int, content_chars: int) -> List[Dict[str, Any]]:
+    """
+    Read request bodies from a JSONL file, or build a synthetic corpus over every category template.
+    """
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    template_dir = Path(os.environ["PROMPT_TEMPLATE_DIR"])
+    slugs = sorted(p.name.removesuffix("-template.jinja") for p in template_dir.glob("*-template.jinja"))
+    paragraph = "Raw notes about a topic, with enough detail to be turned into a long form article. "
+    return [
+        {
+            "content": f"# Request {index}\n\n" + (paragraph * (content_chars // len(paragraph) + 1))[:content_chars],
+            "category_id": f"category-{slug}",
+            "category_slug": slug,
+            "brand_id": f"brand-{index % brands}",
+        }
+        for index, slug in enumerate(slugs * brands)
+    ]
+
+
+def make_xml_block_docs(count: int, parameters: int = 4) -> List[Dict[str, Any]]:
+    """
+    Build CMS xml-block documents. Plain dicts, so nothing under `src` is imported before the environment is set.
+    """
+    return [
+        {
+            "id": f"doc-{i}",
+            "updatedAt": "2025-01-01T00:00:00.000Z",
+            "xmlBlock": {
+                "id": f"block-{i}",
+                "name": f"Block {i}",
+                "tsName": f"Block{i}",
+                "description": f"Use block {i} to highlight a specific kind of content.",
+                "xmlBlockParameters": [
+                    {"id": f"param-{i}-{j}", "name": f"Param {j}", "tsName": f"param{j}",
+                     "required": j == 0, "description": f"Parameter {j} of block {i}", "dataType": "string"}
+                    for j in range(parameters)
+                ],
+            },
+        }
+        for i in range(count)
+    ]
+
+
+# -------------------------------------------------------------------------------- #
+# Statistics
+# -------------------------------------------------------------------------------- #
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of values.
+    """
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean": statistics.fmean(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
+
+
+# -------------------------------------------------------------------------------- #
+# Replay
+# -------------------------------------------------------------------------------- #
+
+async def replay(corpus: List[Dict[str, Any]], requests: int, concurrency: int) -> Dict[str, Any]:
+    """
+    Send `requests` corpus entries through the handler with at most `concurrency` in flight.
+    """
+    # Imported here so the environment pointing at the fake servers is set first
+    from src.handler import write_long_form_article_async
+
+    semaphore = asyncio.Semaphore(concurrency)
+    stage_latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+
+    async def send(body: Dict[str, Any]) -> None:
+        async with semaphore:
+            start_time = time.monotonic()
+            response = await write_long_form_article_async({"body": json.dumps(body)}, {})
+            end_to_end = time.monotonic() - start_time
+        if response.statusCode != 200:
+            errors[response.body.message] = errors.get(response.body.message, 0) + 1
+            return
+        stage_latencies.setdefault("end_to_end", []).append(end_to_end)
+        for stage, duration in response.body.data["timings"].items():
+            stage_latencies.setdefault(stage, []).append(duration)
+
+    start_time = time.monotonic()
+    await asyncio.gather(*(send(body) for body in itertools.islice(itertools.cycle(corpus), requests)))
+    wall_time = time.monotonic() - start_time
+
+    succeeded = len(stage_latencies.get("end_to_end", []))
+    return {
+        "wall_time": wall_time,
+        "succeeded": succeeded,
+        "failed": sum(errors.values()),
+        "errors": errors,
+        "throughput_per_second": succeeded / wall_time if wall_time else 0.0,
+        "stages": {stage: summarize(values) for stage, values in stage_latencies.items()},
+    }
+
+
+# -------------------------------------------------------------------------------- #
+# Reporting
+# -------------------------------------------------------------------------------- #
+
+def print_report(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    print(f"{results['succeeded']} succeeded, {results['failed']} failed in {results['wall_time']:.2f}s "
+          f"({results['throughput_per_second']:.2f} articles/s at concurrency {results['config']['concurrency']})")
+    for message, count in results["errors"].items():
+        print(f"  {count} x {message}")
+
+    print(f"\n{'stage':<20} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'mean s':>8}" + ("  p95 vs baseline" if baseline else ""))
+    for stage, summary in results["stages"].items():
+        line = f"{stage:<20} {summary['p50']:8.3f} {summary['p95']:8.3f} {summary['p99']:8.3f} {summary['mean']:8.3f}"
+        base = (baseline or {}).get("stages", {}).get(stage)
+        if base and base["p95"]:
+            line += f"  {(summary['p95'] - base['p95']) / base['p95']:+.1%}"
+        print(line)
+
+    print(f"\n{'server':<8} {'connections':>12} {'requests':>10} {'errors':>8}")
+    for server, counters in results["servers"].items():
+        print(f"{server:<8} {counters['connections_opened']:12d} {counters['requests_served']:10d} "
+              f"{counters['errors_injected']:8d}")
+
+    if baseline:
+        delta = results["throughput_per_second"] - baseline["throughput_per_second"]
+        print(f"\nThroughput vs baseline: {delta:+.2f} articles/s")
+
+
+# -------------------------------------------------------------------------------- #
+# Main
+# -------------------------------------------------------------------------------- #
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    openai_server = FakeOpenAIServer(default_latency=LatencyDistribution.parse(args.openai_latency),
+                                     token_interval=LatencyDistribution.parse(args.token_interval),
+                                     error_rate=args.openai_error_rate)
+    cms_server = FakeCmsServer(xml_block_docs=make_xml_block_docs(args.xml_blocks),
+                               latency=LatencyDistribution.parse(args.cms_latency),
+                               error_rate=args.cms_error_rate)
+
+    async with openai_server, cms_server:
+        os.environ.update({
+            "OPENAI_BASE_URL": f"{openai_server.base_url}/v1",
+            "CMS_BASE_URL": cms_server.base_url,
+            "CMS_XML_BLOCKS_PATH": cms_server.xml_blocks_path,
+            "CMS_ARTICLES_PATH": cms_server.articles_path,
+            "LLM_STREAM_CONTENT": str(args.stream).lower(),
+        })
+        corpus = load_corpus(args.corpus, brands=args.brands, content_chars=args.content_chars)
+        results = await replay(corpus, requests=args.requests or len(corpus), concurrency=args.concurrency)
+        results["servers"] = {"openai": openai_server.counters(), "cms": cms_server.counters()}
+
+    results["config"] = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+    results["environment"] = {"python": platform.python_version(), "platform": platform.platform()}
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay article requests against fake OpenAI and CMS servers.")
+    parser.add_argument("--corpus", help="JSONL file of handler request bodies. Synthetic when omitted.")
+    parser.add_argument("--requests", type=int, default=0, help="Requests to send, cycling the corpus. Defaults to the corpus size.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--brands", type=int, default=4, help="Brands in the synthetic corpus.")
+    parser.add_argument("--content-chars", type=int, default=4000, help="Raw content size in the synthetic corpus.")
+    parser.add_argument("--xml-blocks", type=int, default=20, help="XML blocks served per brand by the fake CMS.")
+    parser.add_argument("--openai-latency", default="lognormal:median=0.5,sigma=0.4", help="Time to first token.")
+    parser.add_argument("--token-interval", default="0.002", help="Delay between streamed chunks.")
+    parser.add_argument("--cms-latency", default="lognormal:median=0.05,sigma=0.3")
+    parser.add_argument("--openai-error-rate", type=float, default=0.0, help="Share of chat completions failing with 429.")
+    parser.add_argument("--cms-error-rate", type=float, default=0.0, help="Share of CMS requests failing with 500.")
+    parser.add_argument("--stream", action=argparse.BooleanOptionalAction, default=True, help="Stream content generation.")
+    parser.add_argument("--output", help="Write the results as JSON to this path.")
+    parser.add_argument("--compare", help="Results JSON of an earlier run to compare against.")
+    args = parser.parse_args()
+
+    # Keep runs independent of caches and checkpoints left by earlier runs
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ.setdefault("PROMPT_TEMPLATE_DIR", "prompt_templates")
+    os.environ.update({
+        "LLM_CACHE_BACKEND": "none",
+        "PIPELINE_CHECKPOINTS_ENABLED": "false",
+        "CMS_XML_BLOCKS_CACHE_ENABLED": "true",
+        # The fake drafts are a few hundred words, below the validator's truncation floor
+        "DRAFT_VALIDATION_MIN_WORDS": "0",
+        "JOB_STORE_PATH": os.path.join(tempfile.mkdtemp(prefix="bench-e2e-"), "jobs.sqlite3"),
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING"),
+    })
+
+    results = asyncio.run(run(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# -------------------------------------------------------------------------------- #
+# Import Time Benchmark
+# -------------------------------------------------------------------------------- #
+# Measures the cold-start import of the handler with `python -X importtime` in fresh
+# interpreters, reports the slowest modules, and exits non-zero when the median import
+# time passes the threshold or a module that should be deferred is imported eagerly.
+#
+# Usage: PROMPT_TEMPLATE_DIR=prompt_templates python -m benchmarks.bench_import_time
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Dict
+
+
+# -------------------------------------------------------------------------------- #
+# Constants
+# -------------------------------------------------------------------------------- #
+
+# Modules that must not be imported until first use
+DEFERRED_MODULES = ["openai", "requests", "pydantic_ai", "tiktoken", "boto3", "redis", "sqlite3", "src.jobs.store",
+                    "src.jobs.queue"]
+
+
+# -------------------------------------------------------------------------------- #
+# Parsing
+# -------------------------------------------------------------------------------- #
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportTiming]:
+    """
+    Parse `-X importtime` output lines of the form `import time: self | cumulative | module`.
+    """
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append(ImportTiming(module=name.strip(),
+                                    self_us=int(self_us),
+                                    cumulative_us=int(cumulative_us),
+                                    depth=(len(name) - len(name.lstrip())) // 2))
+    return timings
+
+
+def measure(module: str) -> List[ImportTiming]:
+    """
+    Import a module in a fresh interpreter and return its import timings.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+# -------------------------------------------------------------------------------- #
+# Main
+# -------------------------------------------------------------------------------- #
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure and guard the handler's cold-start import time.")
+    parser.add_argument("--module", default="src.handler")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--threshold-ms", type=float, default=float(os.getenv("IMPORT_TIME_THRESHOLD_MS", "750")))
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    # Warm the bytecode cache so every measured run is comparable
+    measure(args.module)
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    totals_ms = [next(t.cumulative_us for t in timings if t.module == args.module) / 1000 for timings in runs]
+    median_ms = statistics.median(totals_ms)
+
+    # Report the slowest modules of the median run
+    median_run = runs[totals_ms.index(sorted(totals_ms)[len(totals_ms) // 2])]
+    print(f"Import of {args.module}: median {median_ms:.1f} ms over {args.runs} runs "
+          f"(min {min(totals_ms):.1f} ms, max {max(totals_ms):.1f} ms). Threshold: {args.threshold_ms:.0f} ms")
+    print(f"\n{'self ms':>9} {'cumul ms':>9}  module")
+    for timing in sorted(median_run, key=lambda t: t.cumulative_us, reverse=True)[:args.top]:
+        print(f"{timing.self_us / 1000:9.1f} {timing.cumulative_us / 1000:9.1f}  {'  ' * timing.depth}{timing.module}")
+
+    # Check the guards
+    failures = []
+    imported: Dict[str, ImportTiming] = {timing.module: timing for timing in median_run}
+    eager = [module for module in DEFERRED_MODULES if module in imported]
+    if eager:
+        failures.append(f"Deferred modules imported at cold start: {', '.join(eager)}")
+    if median_ms > args.threshold_ms:
+        failures.append(f"Median import time {median_ms:.1f} ms is over the threshold of {args.threshold_ms:.0f} ms")
+
+    for failure in failures:
+        print(f"\nFAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
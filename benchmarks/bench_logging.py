@@ -0,0 +1,156 @@
+# -------------------------------------------------------------------------------- #
+# Logging Cost Benchmark
+# -------------------------------------------------------------------------------- #
+# Replays the log calls one article request makes, for a 1500-word article, in the
+# old style (eager f-strings, full payloads, text formatter) and the current style
+# (lazy arguments, level guards, truncated payloads, JSON formatter, optional queue).
+# Reports the time spent in logging calls and the characters written per request.
+#
+# Usage: PROMPT_TEMPLATE_DIR=prompt_templates python -m benchmarks.bench_logging
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import argparse
+import io
+import json
+import logging
+import time
+from typing import Any, Callable, Dict
+
+# Logger
+from src.utils.logger import LogPayload, create_log_handler
+
+# CMS Types
+from src.cms.types import CmsCreateArticleRequest
+
+
+# -------------------------------------------------------------------------------- #
+# Fixtures
+# -------------------------------------------------------------------------------- #
+
+class CountingStream(io.TextIOBase):
+    """
+    Text stream that discards what is written and counts the characters.
+    """
+
+    def __init__(self):
+        self.chars = 0
+
+    def write(self, text: str) -> int:
+        self.chars += len(text)
+        return len(text)
+
+
+def make_request(words: int = 1500, xml_blocks: int = 20) -> Dict[str, Any]:
+    """
+    Build the payloads one request logs: the event, prompt kwargs, draft, CMS body and response.
+    """
+    article = " ".join(f"word{i % 97}" + ("\n\n## Section\n\n" if i % 250 == 249 else "") for i in range(words))
+    raw_content = article[: len(article) // 2]
+    event = {"body": json.dumps({"content": raw_content, "brand_id": "brand", "category_id": "category",
+                                 "category_slug": "ai-prompt-engineering"}),
+             "headers": {f"header-{i}": "value" for i in range(20)}}
+    cms_request = CmsCreateArticleRequest(title="A Title", excerpt="An excerpt.", content=article,
+                                          brandId="brand", tagIds=["category"])
+    return {
+        "event": event,
+        "body": json.loads(event["body"]),
+        "kwargs": {"raw_content": raw_content, "custom_xml_tags": "<custom-xml-tags>" + "x" * 4000},
+        "article": article,
+        "cms_request": cms_request,
+        "cms_response": cms_request.model_dump_json(),
+        "block_names": [f"Block {i}" for i in range(xml_blocks)],
+        "rate_limiter_metrics": lambda: {"requests_remaining": 9999, "tokens_remaining": 29990000, "throttled": 0},
+    }
+
+
+# -------------------------------------------------------------------------------- #
+# Log Calls Per Request
+# -------------------------------------------------------------------------------- #
+
+def log_request_before(logger: logging.Logger, request: Dict[str, Any]) -> None:
+    logger.info(f"Received event: {request['event']}")
+    logger.debug("Parsed JSON body: %s", request["body"])
+    for name in request["block_names"]:
+        logger.debug(f"Successfully parsed XML block: {name}")
+    logger.debug(f"Calling content generation agent with template name: template and kwargs: {request['kwargs']}")
+    logger.info(f"Template template rendered successfully")
+    logger.debug(f"The response is: {request['article']}")
+    logger.info(f"Finished calling model. Took: {1.23:.2f}s to generate draft article content from source.")
+    logger.debug(f"Rate limiter state for model: {request['rate_limiter_metrics']()}")
+    logger.info(f"\n\nCreating article in CMS. Request URL: url. With body: {request['cms_request'].model_dump()}\n\n")
+    logger.info(f"Article created in CMS.")
+    logger.debug(f"Article created in CMS. Response: {json.loads(request['cms_response'])}")
+
+
+def log_request_after(logger: logging.Logger, request: Dict[str, Any]) -> None:
+    logger.info("Received event. Body: %d chars", len(request["event"].get("body") or ""))
+    logger.debug("Event: %s", LogPayload(request["event"]))
+    logger.debug("Parsed JSON body: %s", LogPayload(request["body"]))
+    logger.debug("Calling content generation agent with template name: %s and kwargs: %s",
+                 "template", LogPayload(request["kwargs"]))
+    logger.info("Template %s rendered successfully", "template")
+    logger.debug("The response is: %s", LogPayload(request["article"]))
+    logger.info(f"Finished calling model. Took: {1.23:.2f}s to generate draft article content from source.")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Rate limiter state for %s: %s", "model", request["rate_limiter_metrics"]())
+    logger.info("Creating article in CMS. Request URL: %s. Title: %s", "url", request["cms_request"].title)
+    logger.debug("Article create request body: %s", LogPayload(request["cms_request"]))
+    logger.info(f"Article created in CMS.")
+    logger.debug("Article created in CMS. Response: %s", LogPayload(request["cms_response"]))
+
+
+# -------------------------------------------------------------------------------- #
+# Main
+# -------------------------------------------------------------------------------- #
+
+def measure(name: str, level: int, log_request: Callable[[logging.Logger, Dict[str, Any]], None],
+            handler_factory: Callable[[CountingStream], Any], request: Dict[str, Any], iterations: int) -> None:
+    stream = CountingStream()
+    handler, listener = handler_factory(stream)
+    logger = logging.getLogger(f"bench-logging-{name}-{level}")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(level)
+
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        log_request(logger, request)
+    call_time = time.perf_counter() - start_time
+    if listener is not None:
+        listener.stop()
+    total_time = time.perf_counter() - start_time
+
+    print(f"{name:<14} {logging.getLevelName(level):<6} {call_time / iterations * 1e6:12.1f} "
+          f"{total_time / iterations * 1e6:12.1f} {stream.chars / iterations:12.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the per-request cost of the old and current logging.")
+    parser.add_argument("--words", type=int, default=1500)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    request = make_request(words=args.words)
+
+    def before_handler(stream: CountingStream):
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(funcName)s - %(message)s'))
+        return handler, None
+
+    print(f"Per-request logging cost for a {args.words}-word article over {args.iterations} requests\n")
+    print(f"{'variant':<14} {'level':<6} {'in-call us':>12} {'total us':>12} {'chars':>12}")
+    for level in (logging.INFO, logging.DEBUG):
+        measure("before", level, log_request_before, before_handler, request, args.iterations)
+        measure("after", level, log_request_after,
+                lambda stream: create_log_handler(stream, log_format="json", use_queue=False), request, args.iterations)
+        measure("after+queue", level, log_request_after,
+                lambda stream: create_log_handler(stream, log_format="json", use_queue=True), request, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
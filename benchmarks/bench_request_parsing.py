@@ -0,0 +1,93 @@
+# -------------------------------------------------------------------------------- #
+# Request Parsing Benchmark
+# -------------------------------------------------------------------------------- #
+# Compares the old request parsing path (json.loads, a JSON schema generated per request
+# for the required keys, then validating and constructing the model twice) against the
+# single-pass `parse_and_validate_request`, over 10k API Gateway events.
+#
+# Usage: PROMPT_TEMPLATE_DIR=prompt_templates python -m benchmarks.bench_request_parsing
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+# Types
+from src.api.types import HandlerApiRequest
+
+# Handler Utils
+from src.utils.handler_utils import parse_and_validate_request
+
+
+# -------------------------------------------------------------------------------- #
+# Parsing Paths
+# -------------------------------------------------------------------------------- #
+
+def parse_before(event: Dict[str, Any]) -> HandlerApiRequest:
+    """
+    The request parsing path before the single-pass parser, without its logging.
+    """
+    body = json.loads(event.get("body", "{}"))
+    if not body:
+        raise ValueError("Request body cannot be empty.")
+    missing_keys = [key for key in HandlerApiRequest.model_json_schema()["required"] if key not in body]
+    if missing_keys:
+        raise ValueError(f"Missing required keys: {', '.join(missing_keys)}")
+    HandlerApiRequest(**body)
+    return HandlerApiRequest(**body)
+
+
+def parse_after(event: Dict[str, Any]) -> HandlerApiRequest:
+    return parse_and_validate_request(event=event, request_model=HandlerApiRequest)
+
+
+# -------------------------------------------------------------------------------- #
+# Main
+# -------------------------------------------------------------------------------- #
+
+def make_events(count: int, content_chars: int) -> List[Dict[str, Any]]:
+    return [
+        {"body": json.dumps({"content": f"Request {index}. " + "x" * content_chars,
+                             "category_id": f"category-{index % 8}",
+                             "category_slug": "ai-prompt-engineering",
+                             "brand_id": f"brand-{index % 4}"})}
+        for index in range(count)
+    ]
+
+
+def measure(parse: Callable[[Dict[str, Any]], HandlerApiRequest], events: List[Dict[str, Any]]) -> float:
+    start_time = time.perf_counter()
+    for event in events:
+        parse(event)
+    return time.perf_counter() - start_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the old and single-pass request parsing.")
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--content-chars", type=int, default=9000, help="Raw content size, about 1500 words.")
+    args = parser.parse_args()
+
+    events = make_events(args.requests, args.content_chars)
+    assert parse_before(events[0]) == parse_after(events[0])
+
+    # Warm up both paths (schema generation and validator caches)
+    measure(parse_before, events[:100])
+    measure(parse_after, events[:100])
+
+    before = measure(parse_before, events)
+    after = measure(parse_after, events)
+    print(f"Parsed {args.requests} requests with {args.content_chars}-char content")
+    print(f"before: {before:.3f}s ({before / args.requests * 1e6:.1f} us/request)")
+    print(f"after:  {after:.3f}s ({after / args.requests * 1e6:.1f} us/request)")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
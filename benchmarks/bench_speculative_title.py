@@ -0,0 +1,171 @@
+# -------------------------------------------------------------------------------- #
+# Speculative Title Benchmark
+# -------------------------------------------------------------------------------- #
+# Replays requests in two categories through the handler against fake OpenAI and CMS
+# servers, without and with the speculative title/excerpt call. In one category the
+# sources are focused notes, so a title from the source fits the draft. In the other the
+# sources are noisy transcripts whose draft covers only their headline topic, so the
+# speculative title misses and is re-run. Reports, per category, the hit rate and the
+# title stage and end-to-end latencies.
+#
+# Usage: python -m benchmarks.bench_speculative_title --requests 8 --openai-latency 2.0 --title-latency 0.8
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import argparse
+import asyncio
+import collections
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+# Fake Servers
+from benchmarks.fake_cms import FakeCmsServer
+from benchmarks.fake_openai import FakeOpenAIServer, _message_texts
+from benchmarks.latency import LatencyDistribution
+
+# Fixtures
+from benchmarks.bench_e2e import make_xml_block_docs
+
+
+# -------------------------------------------------------------------------------- #
+# Fixtures
+# -------------------------------------------------------------------------------- #
+
+FOCUSED_CATEGORY = "ai-tool-comparisons"
+NOISY_CATEGORY = "recent-ai-developments-and-news"
+
+TOPIC_PATTERN = re.compile(r"Topic: ([^\n]+)")
+CONTENT_PATTERN = re.compile(r"<content>(.*)</content>", re.S)
+
+
+def make_corpus(requests: int) -> List[Dict[str, Any]]:
+    """
+    Alternate focused and noisy requests. Each source starts with its headline topic.
+    """
+    topics = ["vector databases compared", "prompt caching pricing", "agent evaluation harnesses",
+              "semantic search latency"]
+    corpus = []
+    for index in range(requests):
+        topic = topics[index // 2 % len(topics)]
+        if index % 2 == 0:
+            category, notes = FOCUSED_CATEGORY, f"Notes on {topic}, benchmarks and tradeoffs of {topic}. " * 40
+        else:
+            category, notes = NOISY_CATEGORY, ("Podcast transcript: welcome back listeners, sponsor segment, "
+                                               "newsletter giveaway, hosts banter about weekend hiking. ") * 40
+        corpus.append({"content": f"Topic: {topic}\n\n{notes}", "category_id": f"category-{category}",
+                       "category_slug": category, "brand_id": "brand-0"})
+    return corpus
+
+
+class TopicalOpenAIServer(FakeOpenAIServer):
+    """
+    Fake OpenAI server whose drafts are about the source's headline topic and whose titles
+    use the most frequent words of the content they are given.
+    """
+
+    def complete_chat(self, body: Dict[str, Any], choice_index: int = 0) -> str:
+        text = "\n".join(_message_texts(body))
+        if body.get("response_format"):
+            content = CONTENT_PATTERN.search(text)
+            words = re.findall(r"[a-z]{5,}", (content.group(1) if content else text).lower())
+            top = [word for word, _ in collections.Counter(words).most_common(3)]
+            return json.dumps({"title": " ".join(top).title(), "excerpt": f"A look at {', '.join(top)}."})
+
+        topic = TOPIC_PATTERN.search(text)
+        topic = topic.group(1) if topic else "the topic"
+        sections = "".join(f"## Section {index + 1}\n\n{f'Some generated content about {topic}. ' * 20}\n\n"
+                           for index in range(self.draft_sections))
+        return f"Intro paragraph about {topic}.\n\n{sections}"
+
+
+# -------------------------------------------------------------------------------- #
+# Main
+# -------------------------------------------------------------------------------- #
+
+async def replay(corpus: List[Dict[str, Any]], speculative: bool) -> Dict[str, Dict[str, List[float]]]:
+    """
+    Send the corpus through the handler one request at a time. Returns latencies per category.
+    """
+    # Imported here so the environment pointing at the fake servers is set first
+    import src.handler as handler
+
+    handler.LLM_SPECULATIVE_TITLE_CATEGORIES = frozenset({FOCUSED_CATEGORY, NOISY_CATEGORY}) if speculative else frozenset()
+    latencies: Dict[str, Dict[str, List[float]]] = {}
+    for body in corpus:
+        response = await handler.write_long_form_article_async({"body": json.dumps(body)}, {})
+        assert response.statusCode == 200, response.body.message
+        timings = response.body.data["timings"]
+        category = latencies.setdefault(body["category_slug"], {"title_and_excerpt": [], "total": []})
+        category["title_and_excerpt"].append(timings["title_and_excerpt"])
+        category["total"].append(timings["total"])
+    return latencies
+
+
+async def run(args: argparse.Namespace) -> None:
+    from src.llm.constants import BASE_MODEL
+
+    openai_server = TopicalOpenAIServer(default_latency=LatencyDistribution.parse(args.openai_latency),
+                                        model_latency={BASE_MODEL: LatencyDistribution.parse(args.title_latency)},
+                                        token_interval=LatencyDistribution.parse(args.token_interval))
+    cms_server = FakeCmsServer(xml_block_docs=make_xml_block_docs(args.xml_blocks),
+                               latency=LatencyDistribution.parse(args.cms_latency))
+
+    async with openai_server, cms_server:
+        os.environ.update({
+            "OPENAI_BASE_URL": f"{openai_server.base_url}/v1",
+            "CMS_BASE_URL": cms_server.base_url,
+            "CMS_XML_BLOCKS_PATH": cms_server.xml_blocks_path,
+            "CMS_ARTICLES_PATH": cms_server.articles_path,
+        })
+        from src.utils.llm_utils import speculative_title_stats
+
+        corpus = make_corpus(args.requests)
+        baseline = await replay(corpus, speculative=False)
+        speculative = await replay(corpus, speculative=True)
+
+    stats = speculative_title_stats.stats()
+    print(f"{args.requests} requests, o1 {args.openai_latency}s, title model {args.title_latency}s\n")
+    print(f"{'category':<33} {'hit rate':>8} {'saved s':>8} {'title p50 s':>16} {'total p50 s':>16}")
+    for category in (FOCUSED_CATEGORY, NOISY_CATEGORY):
+        before, after = baseline[category], speculative[category]
+        print(f"{category:<33} {stats[category]['hit_rate']:>8.0%} {stats[category]['latency_saved']:>8.2f} "
+              f"{statistics.median(before['title_and_excerpt']):>7.3f} -> {statistics.median(after['title_and_excerpt']):<6.3f} "
+              f"{statistics.median(before['total']):>7.3f} -> {statistics.median(after['total']):<6.3f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure speculative title/excerpt generation.")
+    parser.add_argument("--requests", type=int, default=8, help="Requests per run, alternating the two categories.")
+    parser.add_argument("--xml-blocks", type=int, default=20)
+    parser.add_argument("--openai-latency", default="2.0", help="Time to first token of the content model.")
+    parser.add_argument("--title-latency", default="0.8", help="Time to first token of the title model.")
+    parser.add_argument("--token-interval", default="0.0005", help="Delay between generated chunks.")
+    parser.add_argument("--cms-latency", default="0.02")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ.setdefault("PROMPT_TEMPLATE_DIR", "prompt_templates")
+    os.environ.update({
+        "LLM_CACHE_BACKEND": "none",
+        "LLM_STREAM_CONTENT": "false",
+        "PIPELINE_CHECKPOINTS_ENABLED": "false",
+        # The fake drafts are a few hundred words, below the validator's truncation floor
+        "DRAFT_VALIDATION_MIN_WORDS": "0",
+        "JOB_STORE_PATH": os.path.join(tempfile.mkdtemp(prefix="bench-speculative-"), "jobs.sqlite3"),
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING"),
+    })
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+# -------------------------------------------------------------------------------- #
+# Candidate Draft Benchmark
+# -------------------------------------------------------------------------------- #
+# Generates N candidate drafts per request against the fake OpenAI server, with parallel
+# calls (and, for models that accept it, one completion in `n` mode), drops the invalid
+# ones and picks the best of the rest with the local scorer. The fake drafts vary in
+# length, so a larger N finds a better scoring draft more often.
+# Reports, per N, the latency and the token cost overhead over a single draft, the time
+# spent scoring and the mean score and word count of the selected draft.
+#
+# Usage: python -m benchmarks.bench_variants --counts 1 2 3 4 --requests 10 --modes parallel \
+#            --openai-latency lognormal:median=0.8,sigma=0.3 --token-interval 0.001
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+# Fake Servers
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.latency import LatencyDistribution
+
+# Fixtures
+from benchmarks.bench_e2e import make_xml_block_docs
+
+
+# -------------------------------------------------------------------------------- #
+# Main
+# -------------------------------------------------------------------------------- #
+
+def token_cost(counters: Dict[str, int], args: argparse.Namespace) -> float:
+    """
+    Dollar cost of the content stage's tokens, with cached prompt tokens at the cached price.
+    """
+    uncached = counters["prompt_tokens"] - counters["cached_tokens"]
+    return (uncached * args.input_price + counters["cached_tokens"] * args.cached_input_price
+            + counters["completion_tokens"] * args.output_price) / 1e6
+
+
+async def run(args: argparse.Namespace) -> None:
+    server = FakeOpenAIServer(default_latency=LatencyDistribution.parse(args.openai_latency),
+                              token_interval=LatencyDistribution.parse(args.token_interval),
+                              draft_sections=args.draft_sections,
+                              draft_sections_spread=args.draft_sections_spread,
+                              seed=args.seed)
+    async with server:
+        os.environ["OPENAI_BASE_URL"] = f"{server.base_url}/v1"
+
+        # Imported once the fake OpenAI URL is in the environment
+        from pydantic import TypeAdapter
+        from src.cms.types import CmsXmlBlock
+        from src.llm.calls import call_content_generation_agent, call_content_generation_candidates
+        from src.llm.scoring import select_best_draft
+        from src.utils.jinja_utils import get_xml_blocks_fragment
+        from src.utils.llm_utils import prompt_cache_stats
+
+        xml_blocks = TypeAdapter(List[CmsXmlBlock]).validate_python(
+            [doc["xmlBlock"] for doc in make_xml_block_docs(args.xml_blocks)])
+        kwargs = {"raw_content": "Raw notes about a topic. " * 200,
+                  "custom_xml_tags": get_xml_blocks_fragment("brand", xml_blocks)}
+
+        async def generate(mode: str, count: int) -> Dict[str, float]:
+            start_time = time.perf_counter()
+            if count == 1:
+                drafts = [await call_content_generation_agent("ai-prompt-engineering", kwargs, stream=False,
+                                                              bypass_cache=True, brand_id="brand")]
+            else:
+                drafts = await call_content_generation_candidates("ai-prompt-engineering", kwargs, count=count,
+                                                                  mode=mode, bypass_cache=True, brand_id="brand",
+                                                                  xml_blocks=xml_blocks)
+            generated_time = time.perf_counter()
+            _, scores = select_best_draft(drafts, xml_blocks)
+            best = max(scores, key=lambda draft_score: (draft_score.score, -draft_score.index))
+            return {"latency": time.perf_counter() - start_time,
+                    "scoring": time.perf_counter() - generated_time,
+                    "score": best.score,
+                    "words": best.word_count}
+
+        print(f"{args.requests} requests per row, {args.xml_blocks} XML blocks\n")
+        print(f"{'mode':<9} {'N':>2} {'p50 s':>7} {'latency':>9} {'cost $':>9} {'cost':>7} "
+              f"{'scoring us':>11} {'score':>6} {'words':>6}")
+        baseline: Dict[str, Any] = {}
+        for mode in args.modes:
+            for count in args.counts:
+                before = dict(prompt_cache_stats.stats().get("content", {"prompt_tokens": 0, "cached_tokens": 0,
+                                                                          "completion_tokens": 0}))
+                runs = [await generate(mode, count) for _ in range(args.requests)]
+                after = prompt_cache_stats.stats()["content"]
+                counters = {key: after[key] - before[key] for key in ("prompt_tokens", "cached_tokens", "completion_tokens")}
+
+                latency = statistics.median(run["latency"] for run in runs)
+                cost = token_cost(counters, args) / args.requests
+                baseline = baseline or {"latency": latency, "cost": cost}
+                print(f"{mode:<9} {count:>2} {latency:>7.3f} {latency / baseline['latency'] - 1:>+9.0%} "
+                      f"{cost:>9.4f} {cost / baseline['cost'] - 1:>+7.0%} "
+                      f"{statistics.median(run['scoring'] for run in runs) * 1e6:>11.0f} "
+                      f"{statistics.mean(run['score'] for run in runs):>6.3f} "
+                      f"{statistics.mean(run['words'] for run in runs):>6.0f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure the overhead of generating and scoring N candidate drafts.")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 2, 3, 4])
+    parser.add_argument("--modes", nargs="+", default=["parallel"], choices=["n", "parallel"],
+                        help="`n` falls back to `parallel` for o1 models.")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--xml-blocks", type=int, default=20)
+    parser.add_argument("--draft-sections", type=int, default=12, help="Mean sections of a fake draft, about 62 words each.")
+    parser.add_argument("--draft-sections-spread", type=int, default=8, help="Fake drafts have up to this many sections more or fewer.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--openai-latency", default="lognormal:median=0.5,sigma=0.3", help="Time to first token.")
+    parser.add_argument("--token-interval", default="0.0005", help="Delay between generated chunks.")
+    parser.add_argument("--input-price", type=float, default=15.0, help="Dollars per million prompt tokens.")
+    parser.add_argument("--cached-input-price", type=float, default=7.5, help="Dollars per million cached prompt tokens.")
+    parser.add_argument("--output-price", type=float, default=60.0, help="Dollars per million completion tokens.")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ.setdefault("PROMPT_TEMPLATE_DIR", "prompt_templates")
+    os.environ.update({
+        "LLM_CACHE_BACKEND": "none",
+        # The shortest fake drafts are below the validator's truncation floor
+        "DRAFT_VALIDATION_MIN_WORDS": "0",
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING"),
+    })
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
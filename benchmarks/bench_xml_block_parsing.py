@@ -0,0 +1,150 @@
+# -------------------------------------------------------------------------------- #
+# XML Block Parsing Benchmark
+# -------------------------------------------------------------------------------- #
+# Compares the old XML block parsing path (json.loads of the response, then one pydantic
+# model built field by field per parameter and per block) against `parse_xml_block_page`,
+# which validates the raw page bytes in one pass into frozen slotted dataclasses.
+# Reports the parse time and the memory the parsed catalog retains at 50/500/5000 blocks.
+#
+# Usage: PROMPT_TEMPLATE_DIR=prompt_templates python -m benchmarks.bench_xml_block_parsing
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import argparse
+import json
+import time
+import tracemalloc
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Optional
+
+# Pydantic
+from pydantic import BaseModel, Field
+
+# CMS Calls
+from src.cms.calls import parse_xml_block_page
+
+# Fixtures
+from benchmarks.bench_e2e import make_xml_block_docs
+
+
+# -------------------------------------------------------------------------------- #
+# Previous Models and Parsing Path
+# -------------------------------------------------------------------------------- #
+
+class LegacyXmlBlockParameter(BaseModel):
+    id: str = Field(..., description="The ID of the parameter")
+    name: str = Field(..., description="The name of the parameter")
+    ts_name: str = Field(..., description="The TypeScript name of the parameter")
+    required: bool = Field(..., description="Whether the parameter is required")
+    description: Optional[str] = Field(description="The description of the parameter", default="")
+    data_type: str = Field(..., description="The data type of the parameter")
+
+
+class LegacyXmlBlock(BaseModel):
+    id: str = Field(..., description="The ID of the XML block")
+    name: str = Field(..., description="The name of the XML block")
+    ts_name: str = Field(..., description="The TypeScript name of the XML block")
+    description: str = Field(..., description="The description of the XML block")
+    parameters: List[LegacyXmlBlockParameter] = Field(..., description="The parameters of the XML block")
+
+
+def parse_before(content: bytes) -> List[Any]:
+    """
+    The XML block parsing path before bulk validation, without its logging.
+    """
+    xml_blocks = []
+    for doc in json.loads(content).get("docs", []):
+        xml_block_data = doc.get("xmlBlock", {})
+        parameters = [
+            LegacyXmlBlockParameter(
+                id=param.get("id"),
+                name=param.get("name"),
+                ts_name=param.get("tsName"),
+                required=param.get("required"),
+                description=param.get("description") or "",
+                data_type=param.get("dataType"),
+            )
+            for param in xml_block_data.get("xmlBlockParameters", [])
+        ]
+        xml_blocks.append(LegacyXmlBlock(
+            id=xml_block_data.get("id"),
+            name=xml_block_data.get("name"),
+            ts_name=xml_block_data.get("tsName"),
+            description=xml_block_data.get("description"),
+            parameters=parameters,
+        ))
+    return xml_blocks
+
+
+def parse_after(content: bytes) -> List[Any]:
+    return [doc.xmlBlock for doc in parse_xml_block_page(content).docs]
+
+
+def legacy_fields(xml_block: Any) -> Dict[str, Any]:
+    """
+    The fields of a parsed block that the legacy models have, for the equivalence check.
+    """
+    parameters = [{field: value for field, value in asdict(parameter).items() if field in LegacyXmlBlockParameter.model_fields}
+                  for parameter in xml_block.parameters]
+    fields = {field: value for field, value in asdict(xml_block).items() if field in LegacyXmlBlock.model_fields}
+    return {**fields, "parameters": parameters}
+
+
+# -------------------------------------------------------------------------------- #
+# Main
+# -------------------------------------------------------------------------------- #
+
+def make_page(count: int) -> bytes:
+    docs = make_xml_block_docs(count)
+    return json.dumps({"docs": docs, "totalDocs": count, "limit": count, "totalPages": 1, "page": 1,
+                       "pagingCounter": 1, "hasPrevPage": False, "hasNextPage": False,
+                       "prevPage": None, "nextPage": None}).encode()
+
+
+def measure_time(parse: Callable[[bytes], List[Any]], content: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        parse(content)
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def measure_memory(parse: Callable[[bytes], List[Any]], content: bytes) -> int:
+    """
+    Bytes still allocated once the parsed blocks are kept and the intermediates are freed.
+    """
+    tracemalloc.start()
+    xml_blocks = parse(content)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del xml_blocks
+    return retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the old and bulk XML block parsing.")
+    parser.add_argument("--blocks", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'blocks':>8} {'before ms':>10} {'after ms':>10} {'speedup':>8} {'before KiB':>11} {'after KiB':>10}")
+    for count in args.blocks:
+        content = make_page(count)
+        before_blocks, after_blocks = parse_before(content), parse_after(content)
+        assert [block.model_dump() for block in before_blocks] == [legacy_fields(block) for block in after_blocks]
+
+        before = measure_time(parse_before, content, args.repeat)
+        after = measure_time(parse_after, content, args.repeat)
+        before_memory = measure_memory(parse_before, content)
+        after_memory = measure_memory(parse_after, content)
+        print(f"{count:>8} {before * 1e3:>10.2f} {after * 1e3:>10.2f} {before / after:>7.1f}x "
+              f"{before_memory / 1024:>11.0f} {after_memory / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# -------------------------------------------------------------------------------- #
+# XML Block Fragment Benchmark
+# -------------------------------------------------------------------------------- #
+# Compares rendering a category template with the <custom-xml-tags> loop on every
+# call against embedding the per-brand precomputed fragment.
+#
+# Usage: PROMPT_TEMPLATE_DIR=prompt_templates python -m benchmarks.bench_xml_fragment
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import argparse
+import timeit
+from typing import List
+
+# CMS Types
+from src.cms.types import CmsXmlBlock, CmsXmlBlockParameter
+
+# Jinja Utils
+from src.utils.jinja_utils import get_xml_blocks_fragment, load_prompt_template
+
+
+# -------------------------------------------------------------------------------- #
+# Helpers
+# -------------------------------------------------------------------------------- #
+
+def make_xml_blocks(count: int, parameters: int = 4) -> List[CmsXmlBlock]:
+    return [
+        CmsXmlBlock(
+            id=f"block-{i}",
+            name=f"Block {i}",
+            ts_name=f"Block{i}",
+            description=f"Use block {i} to highlight a specific kind of content.",
+            parameters=tuple(
+                CmsXmlBlockParameter(id=f"param-{i}-{j}", name=f"Param {j}", ts_name=f"param{j}",
+                                     required=j == 0, data_type="string", description=f"Parameter {j} of block {i}")
+                for j in range(parameters)
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+# -------------------------------------------------------------------------------- #
+# Main
+# -------------------------------------------------------------------------------- #
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--blocks", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--template", default="ai-prompt-engineering-template.jinja")
+    args = parser.parse_args()
+
+    xml_blocks = make_xml_blocks(args.blocks)
+    template = load_prompt_template(args.template)
+
+    def render_loop() -> str:
+        return template.render(raw_content="Some raw content.", xml_blocks=xml_blocks)
+
+    def render_fragment() -> str:
+        return template.render(raw_content="Some raw content.",
+                               custom_xml_tags=get_xml_blocks_fragment("benchmark-brand", xml_blocks))
+
+    assert render_loop() == render_fragment(), "Fragment render differs from the per-render loop"
+
+    loop_seconds = timeit.timeit(render_loop, number=args.iterations) / args.iterations
+    fragment_seconds = timeit.timeit(render_fragment, number=args.iterations) / args.iterations
+
+    print(f"Blocks: {args.blocks}, iterations: {args.iterations}")
+    print(f"Per-render loop:    {loop_seconds * 1000:.3f} ms/render")
+    print(f"Cached fragment:    {fragment_seconds * 1000:.3f} ms/render")
+    print(f"Speedup:            {loop_seconds / fragment_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
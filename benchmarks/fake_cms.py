@@ -0,0 +1,118 @@
+# -------------------------------------------------------------------------------- #
+# Fake CMS Server
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import hashlib
+import json
+import uuid
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+# Fake HTTP Server
+from benchmarks.fake_http import FakeHttpServer
+from benchmarks.latency import LatencyDistribution
+
+
+# -------------------------------------------------------------------------------- #
+# Fake CMS Server
+# -------------------------------------------------------------------------------- #
+
+class FakeCmsServer(FakeHttpServer):
+    """
+    Stand-in for the CMS `xml-blocks` and `articles` endpoints, and the bulk articles endpoint.
+
+    Creates answer 201. A create with an idempotency key the server has already seen answers
+    200 with the article created under it, without creating another one.
+    """
+
+    def __init__(self,
+                 xml_blocks_path: str = "/api/xml-blocks",
+                 articles_path: str = "/api/articles",
+                 articles_bulk_path: str = "/api/articles/bulk",
+                 xml_block_docs: Optional[List[Dict[str, Any]]] = None,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 latency: Optional[LatencyDistribution] = None,
+                 error_rate: float = 0.0,
+                 error_status: int = 500):
+        super().__init__(host=host, port=port, latency=latency, error_rate=error_rate, error_status=error_status)
+        self.xml_blocks_path = xml_blocks_path
+        self.articles_path = articles_path
+        self.articles_bulk_path = articles_bulk_path
+        self.xml_block_docs = xml_block_docs or []
+        self.created_articles: List[Dict[str, Any]] = []
+        self.articles_by_idempotency_key: Dict[str, Dict[str, Any]] = {}
+
+    def create_article(self, article: Dict[str, Any], idempotency_key: Optional[str]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Create an article, or return the one already created under the idempotency key.
+        """
+        if idempotency_key and idempotency_key in self.articles_by_idempotency_key:
+            return 200, self.articles_by_idempotency_key[idempotency_key]
+        article["id"] = str(uuid.uuid4())
+        self.created_articles.append(article)
+        if idempotency_key:
+            article["idempotencyKey"] = idempotency_key
+            self.articles_by_idempotency_key[idempotency_key] = article
+        return 201, article
+
+    # ---------------------------------------------------------------------------- #
+    # Request Handling
+    # ---------------------------------------------------------------------------- #
+
+    async def handle_request(self, method: str, target: str, headers: Dict[str, str],
+                             body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Route a single request. Subclasses can override this to add endpoints or inject latency.
+        """
+        path = urlsplit(target).path
+
+        if method == "GET" and path == self.xml_blocks_path:
+            query = parse_qs(urlsplit(target).query)
+            limit = int(query.get("limit", ["10"])[0])
+            page = int(query.get("page", ["1"])[0])
+            total_pages = max(1, -(-len(self.xml_block_docs) // limit))
+
+            etag = f'"{hashlib.sha1(f"{page}:{limit}:{json.dumps(self.xml_block_docs)}".encode()).hexdigest()}"'
+            if headers.get("if-none-match") == etag:
+                return 304, {"etag": etag}, b""
+
+            payload = {
+                "docs": self.xml_block_docs[(page - 1) * limit:page * limit],
+                "totalDocs": len(self.xml_block_docs),
+                "limit": limit,
+                "totalPages": total_pages,
+                "page": page,
+                "pagingCounter": (page - 1) * limit + 1,
+                "hasPrevPage": page > 1,
+                "hasNextPage": page < total_pages,
+                "prevPage": page - 1 if page > 1 else None,
+                "nextPage": page + 1 if page < total_pages else None,
+            }
+            return 200, {"etag": etag}, json.dumps(payload).encode()
+
+        if method == "GET" and path == self.articles_path:
+            filters = {key[len("where["):].split("]")[0]: values[0]
+                       for key, values in parse_qs(urlsplit(target).query).items()
+                       if key.startswith("where[") and key.endswith("[equals]")}
+            docs = [article for article in self.created_articles
+                    if all(str(article.get(field)) == value for field, value in filters.items())]
+            return 200, {}, json.dumps({"docs": docs, "totalDocs": len(docs)}).encode()
+
+        if method == "POST" and path == self.articles_path:
+            status, article = self.create_article(json.loads(body or b"{}"), headers.get("idempotency-key"))
+            return status, {}, json.dumps({"doc": article, "message": "Article created."}).encode()
+
+        if method == "POST" and path == self.articles_bulk_path:
+            docs = []
+            for doc in json.loads(body or b"{}").get("docs", []):
+                status, article = self.create_article(doc, doc.pop("idempotencyKey", None))
+                docs.append({**article, "status": status})
+            return 201, {}, json.dumps({"docs": docs}).encode()
+
+        return 404, {}, b'{"errors": [{"message": "Not Found"}]}'
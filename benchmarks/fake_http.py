@@ -0,0 +1,156 @@
+# -------------------------------------------------------------------------------- #
+# Fake HTTP Server
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import asyncio
+import random
+from typing import AsyncIterator, Dict, Optional, Tuple, Union
+
+# Latency Distributions
+from benchmarks.latency import LatencyDistribution, fixed
+
+
+# -------------------------------------------------------------------------------- #
+# Types
+# -------------------------------------------------------------------------------- #
+
+# A response body is either complete, or streamed with chunked transfer encoding
+ResponseBody = Union[bytes, AsyncIterator[bytes]]
+
+
+# -------------------------------------------------------------------------------- #
+# Fake HTTP Server
+# -------------------------------------------------------------------------------- #
+
+class FakeHttpServer:
+    """
+    Minimal HTTP/1.1 keep-alive server used as a base for local stand-ins of external APIs.
+
+    Counts the TCP connections opened against it so connection reuse can be asserted.
+    Every request waits for a sample of `latency`, and fails with `error_status` with
+    probability `error_rate`. Subclasses implement `handle_request`.
+    """
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 latency: Optional[LatencyDistribution] = None,
+                 error_rate: float = 0.0,
+                 error_status: int = 500):
+        self.host = host
+        self.port = port
+        self.latency = latency or fixed(0.0)
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+        # Counters
+        self.connections_opened = 0
+        self.requests_served = 0
+        self.errors_injected = 0
+
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> "FakeHttpServer":
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def counters(self) -> Dict[str, int]:
+        return {
+            "connections_opened": self.connections_opened,
+            "requests_served": self.requests_served,
+            "errors_injected": self.errors_injected,
+        }
+
+    # ---------------------------------------------------------------------------- #
+    # Request Handling
+    # ---------------------------------------------------------------------------- #
+
+    async def handle_request(self, method: str, target: str, headers: Dict[str, str],
+                             body: bytes) -> Tuple[int, Dict[str, str], ResponseBody]:
+        """
+        Route a single request and return the status code, headers and body.
+        """
+        return 404, {}, b'{"error": {"message": "Not Found"}}'
+
+    def injected_error(self, method: str, target: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """
+        Decide whether to fail a request. Subclasses can override the error body or headers.
+        """
+        if self.error_rate and random.random() < self.error_rate:
+            self.errors_injected += 1
+            return self.error_status, {}, b'{"error": {"message": "Injected error"}}'
+        return None
+
+    async def _respond(self, method: str, target: str, headers: Dict[str, str],
+                       body: bytes) -> Tuple[int, Dict[str, str], ResponseBody]:
+        await asyncio.sleep(self.latency.sample())
+        return self.injected_error(method, target) or await self.handle_request(method, target, headers, body)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections_opened += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+
+                # Read headers
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                status, response_headers, response_body = await self._respond(method, target, headers, body)
+                self.requests_served += 1
+
+                # Write the response, streaming it with chunked transfer encoding if it is not complete
+                response_headers = {"content-type": "application/json", **response_headers}
+                if isinstance(response_body, (bytes, bytearray)):
+                    response_headers["content-length"] = str(len(response_body))
+                else:
+                    response_headers["transfer-encoding"] = "chunked"
+                head = f"HTTP/1.1 {status} X\r\n" + "".join(f"{k}: {v}\r\n" for k, v in response_headers.items())
+                writer.write(head.encode("latin-1") + b"\r\n")
+
+                if isinstance(response_body, (bytes, bytearray)):
+                    writer.write(response_body)
+                else:
+                    async for chunk in response_body:
+                        writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                        await writer.drain()
+                    writer.write(b"0\r\n\r\n")
+                await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
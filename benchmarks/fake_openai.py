@@ -0,0 +1,290 @@
+# -------------------------------------------------------------------------------- #
+# Fake OpenAI Server
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import asyncio
+import json
+import random
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+from urllib.parse import urlsplit
+
+# Fake HTTP Server
+from benchmarks.fake_http import FakeHttpServer, ResponseBody
+from benchmarks.latency import LatencyDistribution, fixed
+
+
+# -------------------------------------------------------------------------------- #
+# Helpers
+# -------------------------------------------------------------------------------- #
+
+def _json(status: int, payload: Any) -> Tuple[int, Dict[str, str], bytes]:
+    return status, {}, json.dumps(payload).encode()
+
+
+def _parse_multipart_file(headers: Dict[str, str], body: bytes) -> bytes:
+    """
+    Extract the `file` part from a multipart/form-data upload.
+    """
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {headers['content-type']}\r\n\r\n".encode() + body
+    )
+    for part in message.iter_parts():
+        if part.get_param("name", header="content-disposition") == "file":
+            return part.get_payload(decode=True)
+    raise ValueError("No file part in upload")
+
+
+def _message_texts(body: Dict[str, Any]) -> List[str]:
+    """
+    Get every text part of every message in a chat completion request, in order.
+    """
+    texts = []
+    for message in body.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, list):
+            texts.extend(part.get("text", "") for part in content)
+        elif content:
+            texts.append(content)
+    return texts
+
+
+# -------------------------------------------------------------------------------- #
+# Fake OpenAI Server
+# -------------------------------------------------------------------------------- #
+
+class FakeOpenAIServer(FakeHttpServer):
+    """
+    Stand-in for the OpenAI `chat/completions`, `models`, `files` and `batches` endpoints.
+
+    Chat completions wait for a sample of the model's time to first token, then produce the
+    content in chunks of `chunk_chars`, each after a sample of `token_interval`. Streaming
+    requests get the chunks as server-sent events. Responses carry `x-ratelimit-*` headers,
+    injected errors are 429s with `retry-after-ms`, and `cached_tokens` counts the tokens of
+    a first text part that was already seen, like provider prompt caching.
+
+    Non-streaming requests with `n` get `n` choices, each one section longer than the last,
+    the second one with a forbidden h1, so candidate drafts differ in what they are scored on.
+
+    Batches complete on the second status poll. Each request line is answered by
+    `complete_chat`, which subclasses can override to control the generated content.
+    """
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 model_latency: Optional[Dict[str, LatencyDistribution]] = None,
+                 default_latency: Optional[LatencyDistribution] = None,
+                 token_interval: Optional[LatencyDistribution] = None,
+                 chunk_chars: int = 16,
+                 draft_sections: int = 5,
+                 draft_sections_spread: int = 0,
+                 seed: int = 0,
+                 error_rate: float = 0.0,
+                 error_status: int = 429):
+        super().__init__(host=host, port=port, error_rate=error_rate, error_status=error_status)
+        self.model_latency = model_latency or {}
+        self.default_latency = default_latency or fixed(0.0)
+        self.token_interval = token_interval or fixed(0.0)
+        self.chunk_chars = chunk_chars
+        self.draft_sections = draft_sections
+        self.draft_sections_spread = draft_sections_spread
+        self._random = random.Random(seed)
+
+        self.files: Dict[str, bytes] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self.chat_requests: List[Dict[str, Any]] = []
+        self._seen_prefixes: set = set()
+
+    # ---------------------------------------------------------------------------- #
+    # Chat Completions
+    # ---------------------------------------------------------------------------- #
+
+    def complete_chat(self, body: Dict[str, Any], choice_index: int = 0) -> str:
+        """
+        Produce the assistant message content of a choice for a chat completion request body.
+        """
+        if body.get("response_format"):
+            return json.dumps({"title": "A Fake Title", "excerpt": "A fake excerpt."})
+        # Drafts vary by up to `draft_sections_spread` sections, like independent completions do
+        spread = self._random.randint(-self.draft_sections_spread, self.draft_sections_spread)
+        sections = "".join(f"## Section {index + 1}\n\n{'Some generated content. ' * 20}\n\n"
+                           for index in range(max(1, self.draft_sections + spread + choice_index)))
+        heading = "# A Forbidden Title\n\n" if choice_index == 1 else ""
+        return f"{heading}Intro paragraph.\n\n{sections}"
+
+    def usage(self, body: Dict[str, Any], content: str) -> Dict[str, Any]:
+        texts = _message_texts(body)
+        prompt_tokens = sum(len(text) for text in texts) // 4
+        cached_tokens = 0
+        if len(texts) > 1:
+            if texts[0] in self._seen_prefixes:
+                cached_tokens = len(texts[0]) // 4
+            self._seen_prefixes.add(texts[0])
+        completion_tokens = len(content) // 4
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        }
+
+    def chat_completion(self, body: Dict[str, Any], contents: Optional[List[str]] = None) -> Dict[str, Any]:
+        contents = self._complete_choices(body) if contents is None else contents
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model"),
+            "choices": [{"index": index, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}
+                        for index, content in enumerate(contents)],
+            "usage": self.usage(body, "".join(contents)),
+        }
+
+    def _complete_choices(self, body: Dict[str, Any]) -> List[str]:
+        return [self.complete_chat(body, choice_index) for choice_index in range(body.get("n") or 1)]
+
+    def _chunks(self, content: str) -> List[str]:
+        return [content[i:i + self.chunk_chars] for i in range(0, len(content), self.chunk_chars)]
+
+    async def _generate(self, body: Dict[str, Any]) -> List[str]:
+        """
+        Wait out the time to first token and the generation of every chunk, then return the choices.
+
+        Choices generate side by side, so the wait is that of the longest one.
+        """
+        contents = self._complete_choices(body)
+        await asyncio.sleep(self.model_latency.get(body.get("model"), self.default_latency).sample())
+        await asyncio.sleep(sum(self.token_interval.sample() for _ in self._chunks(max(contents, key=len))))
+        return contents
+
+    async def _stream(self, body: Dict[str, Any]) -> AsyncIterator[bytes]:
+        """
+        Stream a chat completion as server-sent events.
+        """
+        content = self.complete_chat(body)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+        def event(choices: List[Dict[str, Any]], **extra: Any) -> bytes:
+            payload = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                       "model": body.get("model"), "choices": choices, **extra}
+            return f"data: {json.dumps(payload)}\n\n".encode()
+
+        await asyncio.sleep(self.model_latency.get(body.get("model"), self.default_latency).sample())
+        yield event([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+        for chunk in self._chunks(content):
+            yield event([{"index": 0, "delta": {"content": chunk}, "finish_reason": None}])
+            await asyncio.sleep(self.token_interval.sample())
+        yield event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if (body.get("stream_options") or {}).get("include_usage"):
+            yield event([], usage=self.usage(body, content))
+        yield b"data: [DONE]\n\n"
+
+    def _rate_limit_headers(self) -> Dict[str, str]:
+        return {
+            "x-ratelimit-limit-requests": "10000",
+            "x-ratelimit-remaining-requests": "9999",
+            "x-ratelimit-reset-requests": "6ms",
+            "x-ratelimit-limit-tokens": "30000000",
+            "x-ratelimit-remaining-tokens": "29990000",
+            "x-ratelimit-reset-tokens": "20ms",
+        }
+
+    def injected_error(self, method: str, target: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        if not urlsplit(target).path.endswith("/chat/completions") or random.random() >= self.error_rate:
+            return None
+        self.errors_injected += 1
+        return self.error_status, {"retry-after-ms": "50", **self._rate_limit_headers()}, json.dumps(
+            {"error": {"message": "Injected error", "type": "requests", "code": "rate_limit_exceeded"}}).encode()
+
+    # ---------------------------------------------------------------------------- #
+    # Batches
+    # ---------------------------------------------------------------------------- #
+
+    def _run_batch(self, batch: Dict[str, Any]) -> None:
+        output_lines: List[str] = []
+        for line in self.files[batch["input_file_id"]].decode().splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            output_lines.append(json.dumps({
+                "id": f"batch_req_{uuid.uuid4().hex}",
+                "custom_id": request["custom_id"],
+                "response": {"status_code": 200, "request_id": uuid.uuid4().hex,
+                             "body": self.chat_completion(request["body"])},
+                "error": None,
+            }))
+
+        output_file_id = f"file-{uuid.uuid4().hex}"
+        self.files[output_file_id] = ("\n".join(output_lines) + "\n").encode()
+        batch.update({"status": "completed", "output_file_id": output_file_id, "completed_at": int(time.time()),
+                      "request_counts": {"total": len(output_lines), "completed": len(output_lines), "failed": 0}})
+
+    # ---------------------------------------------------------------------------- #
+    # Request Handling
+    # ---------------------------------------------------------------------------- #
+
+    async def handle_request(self, method: str, target: str, headers: Dict[str, str],
+                             body: bytes) -> Tuple[int, Dict[str, str], ResponseBody]:
+        path = urlsplit(target).path.removeprefix("/v1")
+
+        # Chat completions (including structured output parses)
+        if method == "POST" and path == "/chat/completions":
+            request = json.loads(body)
+            self.chat_requests.append(request)
+            if request.get("stream"):
+                return 200, {"content-type": "text/event-stream", **self._rate_limit_headers()}, self._stream(request)
+            contents = await self._generate(request)
+            return 200, self._rate_limit_headers(), json.dumps(self.chat_completion(request, contents)).encode()
+
+        # Models
+        if method == "GET" and path.startswith("/models/"):
+            return _json(200, {"id": path.split("/")[2], "object": "model", "created": 0, "owned_by": "openai"})
+
+        # Files
+        if method == "POST" and path == "/files":
+            file_id = f"file-{uuid.uuid4().hex}"
+            self.files[file_id] = _parse_multipart_file(headers, body)
+            return _json(200, {"id": file_id, "object": "file", "bytes": len(self.files[file_id]),
+                               "created_at": int(time.time()), "filename": "input.jsonl",
+                               "purpose": "batch", "status": "processed"})
+
+        if method == "GET" and path.startswith("/files/") and path.endswith("/content"):
+            file_id = path.split("/")[2]
+            if file_id not in self.files:
+                return _json(404, {"error": {"message": f"No such file: {file_id}"}})
+            return 200, {"content-type": "application/octet-stream"}, self.files[file_id]
+
+        # Batches
+        if method == "POST" and path == "/batches":
+            request = json.loads(body)
+            batch_id = f"batch_{uuid.uuid4().hex}"
+            self.batches[batch_id] = {
+                "id": batch_id, "object": "batch", "endpoint": request["endpoint"],
+                "input_file_id": request["input_file_id"], "completion_window": request["completion_window"],
+                "status": "validating", "created_at": int(time.time()), "output_file_id": None,
+                "error_file_id": None, "polls": 0,
+            }
+            return _json(200, {k: v for k, v in self.batches[batch_id].items() if k != "polls"})
+
+        if method == "GET" and path.startswith("/batches/"):
+            batch = self.batches.get(path.split("/")[2])
+            if batch is None:
+                return _json(404, {"error": {"message": "No such batch"}})
+            batch["polls"] += 1
+            if batch["status"] == "validating":
+                batch["status"] = "in_progress"
+            elif batch["status"] == "in_progress":
+                self._run_batch(batch)
+            return _json(200, {k: v for k, v in batch.items() if k != "polls"})
+
+        return await super().handle_request(method, target, headers, body)
@@ -0,0 +1,69 @@
+# -------------------------------------------------------------------------------- #
+# Latency Distributions
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+# -------------------------------------------------------------------------------- #
+# Latency Distribution
+# -------------------------------------------------------------------------------- #
+
+@dataclass
+class LatencyDistribution:
+    """
+    A latency distribution in seconds that the fake servers sample per request.
+
+    Kinds and their parameters:
+    - `fixed`: `value`
+    - `uniform`: `low`, `high`
+    - `normal`: `mean`, `stddev`
+    - `lognormal`: `median`, `sigma` (a long right tail, like real API latencies)
+    """
+    kind: str = "fixed"
+    params: Dict[str, float] = field(default_factory=lambda: {"value": 0.0})
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            return self.params["value"]
+        if self.kind == "uniform":
+            return random.uniform(self.params["low"], self.params["high"])
+        if self.kind == "normal":
+            return max(0.0, random.gauss(self.params["mean"], self.params["stddev"]))
+        if self.kind == "lognormal":
+            return random.lognormvariate(math.log(self.params["median"]), self.params["sigma"])
+        raise ValueError(f"Unknown latency distribution: {self.kind}")
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """
+        Parse a spec such as `0.2`, `fixed:value=0.2`, `uniform:low=0.1,high=0.3` or `lognormal:median=1,sigma=0.4`.
+        """
+        kind, _, raw_params = spec.partition(":")
+        try:
+            return cls(kind="fixed", params={"value": float(kind)})
+        except ValueError:
+            pass
+
+        params = {}
+        for pair in filter(None, raw_params.split(",")):
+            name, _, value = pair.partition("=")
+            params[name.strip()] = float(value)
+        distribution = cls(kind=kind.strip(), params=params)
+        distribution.sample()
+        return distribution
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{','.join(f'{name}={value}' for name, value in self.params.items())}"
+
+
+def fixed(value: float = 0.0) -> LatencyDistribution:
+    return LatencyDistribution(kind="fixed", params={"value": value})
@@ -7,7 +7,7 @@
 # -------------------------------------------------------------------------------- #
 
 # Type imports
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 # Pydantic imports
 from pydantic import BaseModel, Field
@@ -24,6 +24,14 @@ class HandlerApiRequest(BaseModel):
     category_id: str = Field(description="The ID of the category which represents the type of the content for the brand.")
     category_slug: str = Field(description="The slug of the category which represents the type of the content for the brand.")
     brand_id: str = Field(description="The ID of the brand which the content belongs to.")
+    bypass_cache: bool = Field(description="Skip the LLM response cache and always generate fresh content.", default=False)
+    idempotency_key: Optional[str] = Field(description="Key under which the pipeline is checkpointed. Derived from the request when not set and `idempotent` is.", default=None)
+    idempotent: bool = Field(description="Derive an idempotency key from the request, so a replay resumes or returns the same article.", default=False)
+
+
+class HandlerBatchApiRequest(BaseModel):
+    """Request model for the batch handler API."""
+    items: List[HandlerApiRequest] = Field(description="The articles to generate.", min_length=1)
 
 
 # -------------------------------------------------------------------------------- #
@@ -40,6 +48,21 @@ class BaseApiBody(BaseModel):
     data: Optional[Dict[str, Any]] = Field(description="The response from the AI models", default=None)
 
 
+# -------------------------------------------------------------------------------- #
+
+class BatchItemResult(BaseModel):
+    """
+    Result for a single item of a batch request.
+    """
+    index: int = Field(description="The position of the item in the batch request")
+    status: str = Field(description="The status of the item", default="success")
+    message: str = Field(description="The message for the item", default="Article created in CMS.")
+    article_id: Optional[str] = Field(description="The ID of the created article", default=None)
+    latency: float = Field(description="Seconds spent on the item", default=0.0)
+    timings: Optional[Dict[str, float]] = Field(description="Seconds spent on each pipeline step", default=None)
+    tokens: Optional[Dict[str, int]] = Field(description="Raw content token accounting", default=None)
+
+
 # -------------------------------------------------------------------------------- #
 
 class LambdaApiResponse(BaseModel):
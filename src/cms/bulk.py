@@ -0,0 +1,271 @@
+# -------------------------------------------------------------------------------- #
+# CMS Bulk Article Writer
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import asyncio
+import hashlib
+import random
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+# HTTP
+import httpx
+
+# CMS Client
+from src.cms.client import get_cms_client
+
+# CMS Calls
+from src.cms.calls import article_id_from_response
+
+# Logging
+from src.utils.logger import logger, LogPayload
+
+# Tracing
+from src.utils.tracing import span
+
+# CMS Constants
+from src.cms.constants import (
+    CMS_BASE_URL,
+    CMS_ARTICLES_PATH,
+    CMS_ARTICLES_BULK_PATH,
+    CMS_BULK_WRITE_CONCURRENCY,
+    CMS_BULK_WRITE_BATCH_SIZE,
+    CMS_WRITE_MAX_RETRIES,
+    CMS_WRITE_RETRY_BASE_DELAY,
+    CMS_WRITE_RETRY_MAX_DELAY,
+)
+
+# CMS Types
+from src.cms.types import CmsBulkArticleItem, CmsBulkArticleResult
+
+
+# -------------------------------------------------------------------------------- #
+# Constants
+# -------------------------------------------------------------------------------- #
+
+SUCCESS_STATUS_CODES = frozenset({200, 201})
+
+# A new article was created under the idempotency key
+CREATED_STATUS_CODE = 201
+
+# The CMS already holds an article under the idempotency key: the idempotent upsert answers 200, a plain conflict 409
+EXISTING_STATUS_CODES = frozenset({200, 409})
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# A numbered article waiting to be written
+IndexedItem = Tuple[int, CmsBulkArticleItem]
+
+
+# -------------------------------------------------------------------------------- #
+# Helper Functions
+# -------------------------------------------------------------------------------- #
+
+def article_dedup_key(brand_id: str, source: str) -> str:
+    """
+    Hash the source content of an article and its brand into a dedup key.
+    """
+    return hashlib.sha256(f"{brand_id}\n{source}".encode()).hexdigest()
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+    """
+    Full-jitter exponential backoff, never shorter than the CMS's `retry-after` seconds.
+    """
+    delay = random.uniform(0, min(CMS_WRITE_RETRY_MAX_DELAY, CMS_WRITE_RETRY_BASE_DELAY * 2 ** attempt))
+    try:
+        retry_after = float(response.headers.get("retry-after", 0)) if response is not None else 0.0
+    except ValueError:
+        retry_after = 0.0
+    return max(delay, retry_after)
+
+
+async def _post_with_retries(request_url: str,
+                             body: Any,
+                             headers: Optional[Dict[str, str]] = None,
+                             max_retries: int = CMS_WRITE_MAX_RETRIES) -> Tuple[httpx.Response, int]:
+    """
+    POST to the CMS, retrying 429, 5xx and connection failures. Returns the last response and the attempts made.
+    """
+    client = get_cms_client()
+    attempt = 0
+    while True:
+        response: Optional[httpx.Response] = None
+        try:
+            response = await client.post(request_url, json=body, headers=headers)
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= max_retries:
+                return response, attempt + 1
+            failure = f"status code {response.status_code}"
+        except httpx.TransportError as e:
+            if attempt >= max_retries:
+                raise
+            failure = type(e).__name__
+
+        delay = _retry_delay(attempt, response)
+        attempt += 1
+        logger.warning("CMS write failed with %s. Retry %d/%d in %.2fs", failure, attempt, max_retries, delay)
+        await asyncio.sleep(delay)
+
+
+def _response_json(response: httpx.Response) -> Any:
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+def _article_result(index: int, item: CmsBulkArticleItem, status_code: int, body: Any,
+                    attempts: int) -> CmsBulkArticleResult:
+    """
+    Build the result of one article from the status and body the CMS answered it with.
+    """
+    article_id = article_id_from_response(body)
+    if status_code == CREATED_STATUS_CODE and article_id:
+        status, message = "created", "Article created in CMS."
+    elif status_code in EXISTING_STATUS_CODES and article_id:
+        status, message = "existing", "Article already in CMS."
+    else:
+        status, message = "error", f"Failed to create article in CMS. Status code: {status_code}. Response: {body}"
+    return CmsBulkArticleResult(index=index, dedup_key=item.dedup_key, status=status, article_id=article_id,
+                                status_code=status_code, attempts=attempts, message=message)
+
+
+# -------------------------------------------------------------------------------- #
+# Writers
+# -------------------------------------------------------------------------------- #
+
+async def _write_one(items: List[IndexedItem]) -> List[CmsBulkArticleResult]:
+    """
+    Create a single article with its dedup key as the `Idempotency-Key` header, also stored on the article.
+    """
+    [(index, item)] = items
+    response, attempts = await _post_with_retries(f"{CMS_BASE_URL}{CMS_ARTICLES_PATH}",
+                                                  {**item.request.model_dump(), "idempotencyKey": item.dedup_key},
+                                                  headers={"Idempotency-Key": item.dedup_key})
+    return [_article_result(index, item, response.status_code, _response_json(response), attempts)]
+
+
+async def _write_bulk(items: List[IndexedItem], bulk_path: str) -> List[CmsBulkArticleResult]:
+    """
+    Create a chunk of articles in one request to the bulk endpoint, each doc carrying its idempotency key.
+    """
+    docs = [{**item.request.model_dump(), "idempotencyKey": item.dedup_key} for _, item in items]
+    response, attempts = await _post_with_retries(f"{CMS_BASE_URL}{bulk_path}", {"docs": docs})
+    body = _response_json(response)
+
+    # The bulk endpoint answers with one doc (or error) per article, in order
+    response_docs = body.get("docs") if isinstance(body, dict) else None
+    if response.status_code not in SUCCESS_STATUS_CODES or not isinstance(response_docs, list) or len(response_docs) != len(items):
+        logger.error("Bulk create of %d articles failed. Status code: %d. Response: %s",
+                     len(items), response.status_code, LogPayload(response.text))
+        return [_article_result(index, item, response.status_code, body, attempts) for index, item in items]
+
+    return [
+        _article_result(index, item, doc.get("status", response.status_code) if isinstance(doc, dict) else response.status_code,
+                        doc, attempts)
+        for (index, item), doc in zip(items, response_docs)
+    ]
+
+
+async def _enumerate(items: Union[Iterable[CmsBulkArticleItem], AsyncIterable[CmsBulkArticleItem]]) -> AsyncIterator[IndexedItem]:
+    if isinstance(items, AsyncIterable):
+        index = 0
+        async for item in items:
+            yield index, item
+            index += 1
+    else:
+        for index, item in enumerate(items):
+            yield index, item
+
+
+# -------------------------------------------------------------------------------- #
+# Functions
+# -------------------------------------------------------------------------------- #
+
+async def create_articles_in_cms(items: Union[Iterable[CmsBulkArticleItem], AsyncIterable[CmsBulkArticleItem]],
+                                 concurrency: int = CMS_BULK_WRITE_CONCURRENCY,
+                                 batch_size: int = CMS_BULK_WRITE_BATCH_SIZE,
+                                 bulk_path: Optional[str] = CMS_ARTICLES_BULK_PATH,
+                                 on_result: Optional[Callable[[CmsBulkArticleResult], None]] = None,
+                                 ) -> List[CmsBulkArticleResult]:
+    """
+    Create a stream of articles in the CMS, returning one result per article in input order.
+
+    At most `concurrency` requests are in flight over the shared CMS client, and the stream is
+    only read as fast as they complete. With a `bulk_path`, articles are sent `batch_size` at a
+    time to the bulk endpoint, otherwise one request each. Failures are reported per article
+    instead of raised.
+
+    Each dedup key is only sent once per stream. Later articles with the same key get the
+    first one's article with the `duplicate` status. Across runs, the CMS deduplicates on the
+    idempotency key, so a replayed stream upserts instead of creating the articles again.
+
+    `on_result` is called with each result as soon as it is known, e.g. to checkpoint it.
+    """
+    chunk_size = max(1, batch_size) if bulk_path else 1
+    semaphore = asyncio.Semaphore(concurrency)
+    results: Dict[int, CmsBulkArticleResult] = {}
+    first_index: Dict[str, int] = {}
+    duplicates: List[IndexedItem] = []
+    tasks: List[asyncio.Task] = []
+
+    async def write(chunk: List[IndexedItem]) -> None:
+        try:
+            written = await (_write_bulk(chunk, bulk_path) if bulk_path else _write_one(chunk))
+        except Exception as e:
+            logger.error("Failed to create %d articles in CMS. Error: %s", len(chunk), e)
+            written = [CmsBulkArticleResult(index=index, dedup_key=item.dedup_key, status="error", message=str(e))
+                       for index, item in chunk]
+        finally:
+            semaphore.release()
+        for result in written:
+            results[result.index] = result
+            if on_result is not None:
+                on_result(result)
+
+    async def submit(chunk: List[IndexedItem]) -> None:
+        await semaphore.acquire()
+        tasks.append(asyncio.create_task(write(chunk)))
+
+    with span("cms.bulk_create_articles", bulk=bool(bulk_path)) as bulk_span:
+        chunk: List[IndexedItem] = []
+        try:
+            async for index, item in _enumerate(items):
+                if item.dedup_key in first_index:
+                    duplicates.append((index, item))
+                    continue
+                first_index[item.dedup_key] = index
+                chunk.append((index, item))
+                if len(chunk) >= chunk_size:
+                    await submit(chunk)
+                    chunk = []
+            if chunk:
+                await submit(chunk)
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        for index, item in duplicates:
+            first = results[first_index[item.dedup_key]]
+            results[index] = first.model_copy(update={
+                "index": index,
+                "status": "duplicate" if first.article_id else first.status,
+                "attempts": 0,
+                "message": f"Same dedup key as article {first.index}. {first.message}",
+            })
+            if on_result is not None:
+                on_result(results[index])
+
+        ordered = [results[index] for index in range(len(results))]
+        failed = sum(1 for result in ordered if result.status == "error")
+        bulk_span.add("articles", len(ordered))
+        bulk_span.add("error", failed)
+
+    logger.info("Bulk create finished. Articles: %d. Failed: %d. Duplicates: %d", len(ordered), failed, len(duplicates))
+    return ordered
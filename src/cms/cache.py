@@ -0,0 +1,176 @@
+# -------------------------------------------------------------------------------- #
+# CMS XML Block Catalog Cache
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Callable, Awaitable
+
+# Logging
+from src.utils.logger import logger
+
+# CMS Types
+from src.cms.types import CmsXmlBlock
+
+
+# -------------------------------------------------------------------------------- #
+# Cache Entry
+# -------------------------------------------------------------------------------- #
+
+@dataclass
+class XmlBlockCatalog:
+    """
+    A parsed XML block catalog for a brand, plus the validators used to revalidate it.
+    """
+    xml_blocks: List[CmsXmlBlock]
+    etag: Optional[str] = None
+    version: Optional[str] = None
+    fetched_at: float = field(default_factory=time.monotonic)
+
+
+# Loads a catalog for a brand. Receives the cached catalog (if any) for conditional
+# revalidation and returns None when the CMS reports it has not changed.
+CatalogLoader = Callable[[str, Optional[XmlBlockCatalog]], Awaitable[Optional[XmlBlockCatalog]]]
+
+
+# -------------------------------------------------------------------------------- #
+# Cache
+# -------------------------------------------------------------------------------- #
+
+class XmlBlockCatalogCache:
+    """
+    Brand-keyed LRU cache of parsed XML block catalogs with a TTL and stale-while-revalidate.
+
+    - Fresh entries (younger than `ttl`) are served directly.
+    - Stale entries (younger than `ttl + stale_ttl`) are served immediately while a single
+      background task revalidates them.
+    - Missing or expired entries are loaded inline. Concurrent misses for the same brand
+      share one load.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[str, XmlBlockCatalog]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        # Counters
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.not_modified = 0
+
+    # ---------------------------------------------------------------------------- #
+    # Public API
+    # ---------------------------------------------------------------------------- #
+
+    async def get(self, brand_id: str, loader: CatalogLoader) -> List[CmsXmlBlock]:
+        """
+        Get the XML blocks for a brand, loading or revalidating them through `loader` as needed.
+        """
+        entry = self._entries.get(brand_id)
+        now = time.monotonic()
+
+        if entry is not None:
+            age = now - entry.fetched_at
+
+            # Fresh hit
+            if age < self.ttl:
+                self._entries.move_to_end(brand_id)
+                self.hits += 1
+                self._log("hit", brand_id)
+                return list(entry.xml_blocks)
+
+            # Stale hit: serve now, revalidate in the background
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(brand_id)
+                self.stale_hits += 1
+                self._log("stale hit", brand_id)
+                if brand_id not in self._in_flight:
+                    self._start_load(brand_id, loader, entry)
+                return list(entry.xml_blocks)
+
+        # Miss (or expired beyond the stale window): load inline
+        self.misses += 1
+        self._log("miss", brand_id)
+        in_flight = self._in_flight.get(brand_id) or self._start_load(brand_id, loader, entry)
+        catalog = await asyncio.shield(in_flight)
+        return list(catalog.xml_blocks)
+
+    def invalidate(self, brand_id: Optional[str] = None) -> None:
+        """
+        Drop the cached catalog for a brand, or every brand when no brand ID is given.
+        """
+        if brand_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(brand_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+        """
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+        }
+
+    # ---------------------------------------------------------------------------- #
+    # Helpers
+    # ---------------------------------------------------------------------------- #
+
+    def _start_load(self, brand_id: str, loader: CatalogLoader,
+                    previous: Optional[XmlBlockCatalog]) -> asyncio.Future:
+        task = asyncio.ensure_future(self._load(brand_id, loader, previous))
+        self._in_flight[brand_id] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(brand_id, None))
+        # Background revalidations may never be awaited; consume their errors here
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def _load(self, brand_id: str, loader: CatalogLoader,
+                    previous: Optional[XmlBlockCatalog]) -> XmlBlockCatalog:
+        if previous is not None:
+            self.revalidations += 1
+
+        try:
+            catalog = await loader(brand_id, previous)
+        except Exception as e:
+            logger.error(f"Failed to load XML block catalog for brand ID: {brand_id}. Error: {e}")
+            raise
+
+        # Not modified: keep the cached blocks and restart the TTL
+        if catalog is None:
+            if previous is None:
+                raise ValueError(f"XML block loader returned no catalog for uncached brand ID: {brand_id}")
+            self.not_modified += 1
+            previous.fetched_at = time.monotonic()
+            catalog = previous
+
+        self._store(brand_id, catalog)
+        return catalog
+
+    def _store(self, brand_id: str, catalog: XmlBlockCatalog) -> None:
+        self._entries[brand_id] = catalog
+        self._entries.move_to_end(brand_id)
+        while len(self._entries) > self.max_entries:
+            evicted_brand_id, _ = self._entries.popitem(last=False)
+            logger.debug(f"Evicted XML block catalog for brand ID: {evicted_brand_id}")
+
+    def _log(self, outcome: str, brand_id: str) -> None:
+        logger.info(f"XML block cache {outcome} for brand ID: {brand_id}. "
+                    f"Hits: {self.hits}. Stale hits: {self.stale_hits}. Misses: {self.misses}.")
@@ -7,29 +7,82 @@
 # -------------------------------------------------------------------------------- #
 
 # Standard Library
-from typing import List, Any
+import asyncio
+import json
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 
-# Requests
-import requests
+# HTTP
 import httpx
 
+# Pydantic
+from pydantic import TypeAdapter, ValidationError
+
+# CMS Client
+from src.cms.client import get_cms_client
+
 # Logging
-from src.utils.logger import logger
+from src.utils.logger import logger, LogPayload
+
+# Tracing
+from src.utils.tracing import span, current_span
 
 # CMS Constants
-from src.cms.constants import CMS_BASE_URL, CMS_XML_BLOCKS_PATH, CMS_ARTICLES_PATH
+from src.cms.constants import (
+    CMS_BASE_URL,
+    CMS_XML_BLOCKS_PATH,
+    CMS_ARTICLES_PATH,
+    CMS_XML_BLOCKS_CACHE_ENABLED,
+    CMS_XML_BLOCKS_CACHE_TTL,
+    CMS_XML_BLOCKS_CACHE_STALE_TTL,
+    CMS_XML_BLOCKS_CACHE_MAX_BRANDS,
+    CMS_XML_BLOCKS_PROBE_PATHS,
+    CMS_XML_BLOCKS_PAGE_LIMIT,
+    CMS_XML_BLOCKS_DEPTH,
+    CMS_XML_BLOCKS_SELECT,
+    CMS_XML_BLOCKS_FETCH_CONCURRENCY,
+)
+
+# CMS Cache
+from src.cms.cache import XmlBlockCatalog, XmlBlockCatalogCache
 
 # CMS Types
-from src.cms.types import CmsXmlBlock, CmsXmlBlockParameter, CmsCreateArticleRequest
+from src.cms.types import (
+    CmsXmlBlock,
+    CmsXmlBlockParameter,
+    CmsXmlBlockDoc,
+    CmsXmlBlockPage,
+    CmsCreateArticleRequest,
+    CmsResourceBaseResponse,
+)
+
+
+# -------------------------------------------------------------------------------- #
+# XML Block Catalog Cache
+# -------------------------------------------------------------------------------- #
+
+xml_block_catalog_cache = XmlBlockCatalogCache(
+    ttl=CMS_XML_BLOCKS_CACHE_TTL,
+    stale_ttl=CMS_XML_BLOCKS_CACHE_STALE_TTL,
+    max_entries=CMS_XML_BLOCKS_CACHE_MAX_BRANDS,
+)
 
 
 # -------------------------------------------------------------------------------- #
 # Helper Functions
 # -------------------------------------------------------------------------------- #
 
-def _extract_xml_blocks(xml_blocks_response: Any) -> List[CmsXmlBlock]:
+# Validators for whole pages, and for single documents when a page fails validation
+_xml_block_page_adapter = TypeAdapter(CmsXmlBlockPage)
+_xml_block_adapter = TypeAdapter(CmsXmlBlock)
+_xml_block_parameter_adapter = TypeAdapter(CmsXmlBlockParameter)
+
+
+def _extract_xml_block_docs(xml_blocks_response: Any) -> List[CmsXmlBlockDoc]:
     """
-    Extract and parse the XML blocks from the API response.
+    Extract and parse the XML block documents from the API response one by one.
+
+    Invalid documents and parameters are logged and skipped, so one bad entry does not
+    drop the rest of the page.
     """
     logger.info("Starting XML blocks extraction")
 
@@ -39,54 +92,64 @@ def _extract_xml_blocks(xml_blocks_response: Any) -> List[CmsXmlBlock]:
             logger.warning("No documents found in XML blocks response")
             return []
 
-        xml_blocks = []
+        xml_block_docs = []
         for doc in docs:
             try:
                 # Parse parameters for each xmlBlock
                 xml_block_data = doc.get("xmlBlock", {})
                 if not xml_block_data:
-                    logger.warning(f"Missing xmlBlock data in document: {doc}")
+                    logger.warning("Missing xmlBlock data in document: %s", LogPayload(doc))
                     continue
 
                 parameters = []
                 for param in xml_block_data.get("xmlBlockParameters", []):
                     try:
-                        parameter = CmsXmlBlockParameter(
-                            id=param.get("id"),
-                            name=param.get("name"),
-                            ts_name=param.get("tsName"),
-                            required=param.get("required"),
-                            description=param.get("description") or "",  # Default to empty string if None
-                            data_type=param.get("dataType"),
-                        )
-                        parameters.append(parameter)
+                        parameters.append(_xml_block_parameter_adapter.validate_python(param))
                     except Exception as e:
-                        logger.error(f"Failed to parse parameter {param}: {str(e)}")
+                        logger.error("Failed to parse parameter %s: %s", LogPayload(param), e)
                         continue
 
                 # Parse the xmlBlock
-                xml_block = CmsXmlBlock(
-                    id=xml_block_data.get("id"),
-                    name=xml_block_data.get("name"),
-                    ts_name=xml_block_data.get("tsName"),
-                    description=xml_block_data.get("description"),
-                    parameters=parameters,
-                )
-                xml_blocks.append(xml_block)
-                logger.debug(f"Successfully parsed XML block: {xml_block.name}")
+                xml_block = _xml_block_adapter.validate_python({**xml_block_data, "xmlBlockParameters": parameters})
+                xml_block_docs.append(CmsXmlBlockDoc(xmlBlock=xml_block, updatedAt=doc.get("updatedAt")))
 
             except Exception as e:
-                logger.error(f"Failed to parse document {doc}: {str(e)}")
+                logger.error("Failed to parse document %s: %s", LogPayload(doc), e)
                 continue
 
-        logger.info(f"Successfully extracted {len(xml_blocks)} XML blocks")
-        return xml_blocks
+        logger.info(f"Successfully extracted {len(xml_block_docs)} XML blocks")
+        return xml_block_docs
 
     except Exception as e:
         logger.error(f"Failed to extract XML blocks: {str(e)}")
         raise ValueError(f"Failed to extract XML blocks: {str(e)}")
 
 
+def parse_xml_block_page(content: bytes) -> CmsXmlBlockPage:
+    """
+    Parse a raw page of XML block documents.
+
+    The whole page is validated from the response bytes in one pass. Only if that fails is
+    it parsed document by document, skipping the invalid ones.
+    """
+    try:
+        page = _xml_block_page_adapter.validate_json(content)
+        if not page.docs:
+            logger.warning("No documents found in XML blocks response")
+        return page
+    except ValidationError as e:
+        logger.warning("XML block page failed bulk validation with %d errors. Parsing documents one by one.",
+                       e.error_count())
+
+    xml_blocks_response = json.loads(content)
+    pagination = CmsResourceBaseResponse.model_validate({**xml_blocks_response, "docs": []})
+    return CmsXmlBlockPage(docs=tuple(_extract_xml_block_docs(xml_blocks_response)),
+                           totalDocs=pagination.totalDocs,
+                           totalPages=pagination.totalPages,
+                           page=pagination.page,
+                           hasNextPage=pagination.hasNextPage)
+
+
 # -------------------------------------------------------------------------------- #
 # Functions
 # -------------------------------------------------------------------------------- #
@@ -150,64 +213,310 @@ def _extract_xml_blocks(xml_blocks_response: Any) -> List[CmsXmlBlock]:
 
 
 
-async def fetch_xml_blocks(brand_id: str) -> List[CmsXmlBlock]:
+def _latest_updated_at(docs: List[Any]) -> Optional[str]:
     """
-    Fetch tags from the CMS for a given brand ID.
+    Get the newest `updatedAt` timestamp from a list of CMS documents.
     """
-    # Construct the request URL
-    logger.info(f"Fetching XML blocks for brand ID: {brand_id}")
-    request_url = f"{CMS_BASE_URL}{CMS_XML_BLOCKS_PATH}?where[brandId][equals]={brand_id}"
+    updated_ats = [doc.get("updatedAt") for doc in docs if doc.get("updatedAt")]
+    return max(updated_ats) if updated_ats else None
 
-    # Make the request
-    logger.debug(f"Request URL: {request_url}")
-    async with httpx.AsyncClient() as client:
-        response = await client.get(request_url)
+
+def _xml_block_catalog_version(total_docs: int, latest_updated_at: Optional[str]) -> Optional[str]:
+    """
+    Derive a catalog version from the document count and newest `updatedAt`.
+    """
+    if not latest_updated_at:
+        return None
+    return f"{total_docs}:{latest_updated_at}"
+
+
+def _xml_block_query_params(brand_id: str,
+                            page: int,
+                            limit: Optional[int] = None,
+                            depth: Optional[int] = None,
+                            select: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Build the query parameters for a page of XML blocks, including the optional projection.
+    """
+    params: Dict[str, Any] = {"where[brandId][equals]": brand_id, "page": page}
+    if limit is not None:
+        params["limit"] = limit
+    if depth is not None:
+        params["depth"] = depth
+    for field_path in select or []:
+        params[f"select[{field_path}]"] = "true"
+    return params
+
+
+async def _probe_latest_updated_at(request_url: str, params: Dict[str, Any]) -> Tuple[int, Optional[str]]:
+    """
+    Fetch only the most recently updated document of a collection. Returns the total count and its `updatedAt`.
+    """
+    logger.debug("Probing latest updatedAt. Request URL: %s. Params: %s", request_url, params)
+
+    client = get_cms_client()
+    response = await client.get(request_url, params={**params, "sort": "-updatedAt", "limit": 1, "depth": 0})
+    response.raise_for_status()
+
+    probe_response = response.json()
+    return probe_response.get("totalDocs", 0), _latest_updated_at(probe_response.get("docs", []))
+
+
+async def _probe_xml_block_catalog_version(brand_id: str) -> Optional[str]:
+    """
+    Get the brand's catalog version from the latest `updatedAt` of the XML block documents and of
+    their related collections, one single-document request each.
+
+    Edits to a related XML block or parameter do not change the parent document's `updatedAt`, so
+    the related collections are probed too. They are not filtered by brand, so an edit for another
+    brand costs a needless reload rather than a stale catalog.
+    """
+    probes = [_probe_latest_updated_at(f"{CMS_BASE_URL}{CMS_XML_BLOCKS_PATH}", {"where[brandId][equals]": brand_id})]
+    probes.extend(_probe_latest_updated_at(f"{CMS_BASE_URL}{path}", {}) for path in CMS_XML_BLOCKS_PROBE_PATHS)
+
+    try:
+        results = await asyncio.gather(*probes)
+    except httpx.HTTPError as e:
+        logger.warning(f"Failed to probe XML block catalog version. Error: {e}")
+        return None
+
+    (total_docs, _), *_ = results
+    updated_ats = [updated_at for _, updated_at in results]
+    if not all(updated_ats):
+        return None
+    return _xml_block_catalog_version(total_docs, max(updated_ats))
+
+
+async def _fetch_xml_block_page(brand_id: str,
+                                page: int,
+                                headers: Optional[Dict[str, str]] = None,
+                                **projection: Any) -> httpx.Response:
+    """
+    Fetch a single page of XML blocks for a brand.
+    """
+    request_url = f"{CMS_BASE_URL}{CMS_XML_BLOCKS_PATH}"
+    params = _xml_block_query_params(brand_id, page, **projection)
+    logger.debug("Fetching XML blocks page %d. Request URL: %s. Params: %s", page, request_url, params)
+
+    client = get_cms_client()
+    response = await client.get(request_url, params=params, headers=headers)
+    current_span().add("bytes", len(response.content))
+
+    if response.status_code == 304:
+        return response
 
     response.raise_for_status()
 
-    logger.debug(f"Response: {response.json()}")
     # Check if the response is successful
     if response.status_code != 200:
-        logger.error(f"Failed to fetch XML blocks from CMS. Status code: {response.status_code}. Response: {response.text}")
+        logger.error("Failed to fetch XML blocks from CMS. Status code: %d. Response: %s", response.status_code, LogPayload(response.text))
         raise ValueError(f"Failed to fetch XML blocks from CMS. Status code: {response.status_code}. Response: {response.text}")
 
-    # Parse the response
+    return response
+
+
+async def _iter_xml_block_pages(brand_id: str,
+                                first_page: Optional[CmsXmlBlockPage] = None,
+                                limit: Optional[int] = CMS_XML_BLOCKS_PAGE_LIMIT,
+                                depth: Optional[int] = CMS_XML_BLOCKS_DEPTH,
+                                select: Optional[List[str]] = CMS_XML_BLOCKS_SELECT,
+                                concurrency: int = CMS_XML_BLOCKS_FETCH_CONCURRENCY) -> AsyncIterator[CmsXmlBlockPage]:
+    """
+    Yield every parsed page of XML blocks for a brand in page order.
+
+    Once the first page reports `totalPages`, the remaining pages are requested concurrently
+    (at most `concurrency` at a time) while earlier pages are being consumed.
+    """
+    projection = {"limit": limit, "depth": depth, "select": select}
+
+    # The first page tells us how many pages there are
+    if first_page is None:
+        response = await _fetch_xml_block_page(brand_id, page=1, **projection)
+        first_page = parse_xml_block_page(response.content)
+
+    yield first_page
+
+    if first_page.totalPages <= 1:
+        return
+
+    logger.info(f"Fetching {first_page.totalPages - 1} more XML block pages for brand ID: {brand_id}")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_page(page: int) -> CmsXmlBlockPage:
+        async with semaphore:
+            response = await _fetch_xml_block_page(brand_id, page=page, **projection)
+            return parse_xml_block_page(response.content)
+
+    tasks = [asyncio.ensure_future(fetch_page(page)) for page in range(first_page.page + 1, first_page.totalPages + 1)]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def iter_xml_blocks(brand_id: str,
+                          limit: Optional[int] = CMS_XML_BLOCKS_PAGE_LIMIT,
+                          depth: Optional[int] = CMS_XML_BLOCKS_DEPTH,
+                          select: Optional[List[str]] = CMS_XML_BLOCKS_SELECT) -> AsyncIterator[CmsXmlBlock]:
+    """
+    Stream the parsed XML blocks for a brand across every page of the CMS response.
+    """
+    async for xml_blocks_page in _iter_xml_block_pages(brand_id, limit=limit, depth=depth, select=select):
+        for doc in xml_blocks_page.docs:
+            yield doc.xmlBlock
+
+
+async def _load_xml_block_catalog(brand_id: str, previous: Optional[XmlBlockCatalog] = None) -> Optional[XmlBlockCatalog]:
+    """
+    Fetch and parse the full XML block catalog for a brand.
+
+    When a previous catalog is given, revalidate it with `If-None-Match` (or, with probe paths
+    configured, an `updatedAt` probe if the CMS did not send an ETag) and return None if it has
+    not changed.
+    """
+    logger.info(f"Fetching XML blocks for brand ID: {brand_id}")
+
+    # Cheap revalidation when the CMS does not support ETags. The version is taken before the fetch,
+    # so an edit made during it is picked up by the next probe.
+    version: Optional[str] = None
+    if CMS_XML_BLOCKS_PROBE_PATHS and (previous is None or not previous.etag):
+        version = await _probe_xml_block_catalog_version(brand_id)
+        if previous is not None and version is not None and version == previous.version:
+            logger.info(f"XML block catalog unchanged for brand ID: {brand_id}")
+            return None
+
+    # Conditional request for the first page when the CMS sent an ETag
+    headers = {}
+    if previous is not None and previous.etag:
+        headers["If-None-Match"] = previous.etag
+
+    response = await _fetch_xml_block_page(brand_id, page=1, headers=headers, limit=CMS_XML_BLOCKS_PAGE_LIMIT,
+                                           depth=CMS_XML_BLOCKS_DEPTH, select=CMS_XML_BLOCKS_SELECT)
+    if response.status_code == 304:
+        logger.info(f"XML block catalog not modified for brand ID: {brand_id}")
+        return None
+
+    first_page = parse_xml_block_page(response.content)
     logger.info(f"XML blocks successfully fetched from CMS")
-    # Extract the XML blocks
-    xml_blocks = _extract_xml_blocks(response.json())
-    logger.info(f"XML blocks successfully extracted.")
-    # Return the XML blocks
-    return xml_blocks
 
+    # Parse each page as it arrives while later pages are still in flight
+    xml_blocks: List[CmsXmlBlock] = []
+    async for xml_blocks_page in _iter_xml_block_pages(brand_id, first_page=first_page):
+        xml_blocks.extend(doc.xmlBlock for doc in xml_blocks_page.docs)
+    logger.info(f"Successfully extracted {len(xml_blocks)} XML blocks")
+
+    # The first page's ETag only describes the whole catalog when there is a single page
+    single_page = not first_page.hasNextPage
+
+    # Return the XML blocks with their validators
+    return XmlBlockCatalog(
+        xml_blocks=xml_blocks,
+        etag=response.headers.get("etag") if single_page else None,
+        version=version,
+    )
 
-async def create_article_in_cms(cms_create_article_request: CmsCreateArticleRequest) -> str:
+
+async def fetch_xml_blocks(brand_id: str) -> List[CmsXmlBlock]:
     """
-    Create an article in the CMS.
+    Fetch tags from the CMS for a given brand ID.
     """
+    with span("cms.fetch_xml_blocks", brand_id=brand_id) as fetch_span:
+        if not CMS_XML_BLOCKS_CACHE_ENABLED:
+            catalog = await _load_xml_block_catalog(brand_id)
+            return catalog.xml_blocks
 
-    # Make the request
-    request_url = f"{CMS_BASE_URL}{CMS_ARTICLES_PATH}"
-    logger.info(f"\n\nCreating article in CMS. Request URL: {request_url}. With body: {cms_create_article_request.model_dump()}\n\n")
+        # The catalog cache only calls the loader on a miss
+        loaded = False
 
-    # Use async client to make the request
-    async with httpx.AsyncClient() as client:
-        response = await client.post(request_url, json=cms_create_article_request.model_dump())
+        async def loader(brand_id: str, previous: Optional[XmlBlockCatalog] = None) -> Optional[XmlBlockCatalog]:
+            nonlocal loaded
+            loaded = True
+            return await _load_xml_block_catalog(brand_id, previous)
 
-    # Check if the response is successful
+        xml_blocks = await xml_block_catalog_cache.get(brand_id, loader=loader)
+        fetch_span.add("cache_hit", 0 if loaded else 1)
+        return xml_blocks
+
+
+async def find_article_in_cms(brand_id: str, idempotency_key: str) -> Optional[str]:
+    """
+    Find the ID of an existing article of a brand by the idempotency key it was created with.
+
+    A failed lookup is logged and treated as not found.
+    """
+    request_url = f"{CMS_BASE_URL}{CMS_ARTICLES_PATH}"
+    params = {"where[brandId][equals]": brand_id, "where[idempotencyKey][equals]": idempotency_key,
+              "limit": 1, "depth": 0}
+
+    client = get_cms_client()
+    with span("cms.find_article", brand_id=brand_id) as find_span:
+        try:
+            response = await client.get(request_url, params=params)
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to look up article in CMS. Treating it as not found. Error: {e}")
+            return None
+        find_span.add("bytes", len(response.content))
+
+    # E.g. a CMS without an `idempotencyKey` field rejects the query
     if response.status_code != 200:
-        logger.error(f"Failed to create article in CMS. Status code: {response.status_code}. Response: {response.text}")
+        logger.warning("Failed to look up article in CMS. Treating it as not found. Status code: %d. Response: %s",
+                       response.status_code, LogPayload(response.text))
+        return None
+
+    docs = response.json().get("docs") or []
+    return docs[0].get("id") if docs else None
+
+
+def article_id_from_response(body: Any) -> Optional[str]:
+    """
+    Get the article ID from a create response, either the article itself or `{"doc": article}`.
+    """
+    if not isinstance(body, dict):
+        return None
+    return body.get("id") or (body.get("doc") or {}).get("id")
+
+
+async def create_article_in_cms(cms_create_article_request: CmsCreateArticleRequest,
+                                idempotency_key: Optional[str] = None) -> str:
+    """
+    Create an article in the CMS.
+
+    The `idempotency_key`, if given, is sent as the `Idempotency-Key` header and stored on the
+    article as `idempotencyKey`, so `find_article_in_cms` can find it again.
+    """
+
+    # Make the request
+    request_url = f"{CMS_BASE_URL}{CMS_ARTICLES_PATH}"
+    logger.info("Creating article in CMS. Request URL: %s. Title: %s", request_url, cms_create_article_request.title)
+    logger.debug("Article create request body: %s", LogPayload(cms_create_article_request))
+
+    # Use the shared pooled client to make the request
+    client = get_cms_client()
+    headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+    with span("cms.create_article", brand_id=cms_create_article_request.brandId) as create_span:
+        body = cms_create_article_request.model_dump()
+        if idempotency_key:
+            body["idempotencyKey"] = idempotency_key
+        response = await client.post(request_url, json=body, headers=headers)
+        create_span.add("bytes", len(response.request.content) + len(response.content))
+
+    # Check if the response is successful (the CMS answers a create with 201)
+    if response.status_code not in (200, 201):
+        logger.error("Failed to create article in CMS. Status code: %d. Response: %s", response.status_code, LogPayload(response.text))
         raise ValueError(f"Failed to create article in CMS. Status code: {response.status_code}. Response: {response.text}")
 
     # Log the response
     logger.info(f"Article created in CMS.")
-    logger.debug(f"Article created in CMS. Response: {response.json()}")
+    logger.debug("Article created in CMS. Response: %s", LogPayload(response.text))
 
     # Parse the response into the article ID
-    article_id = response.json().get("id")
+    article_id = article_id_from_response(response.json())
 
     # Check if the article ID is present. If not, raise an error
     if not article_id:
-        logger.error(f"Something went wrong when parsing the response. Response: {response.json()}")
+        logger.error("Something went wrong when parsing the response. Response: %s", LogPayload(response.text))
         raise ValueError(f"Something went wrong when parsing the response. Response: {response.json()}")
 
     # Return the response
@@ -0,0 +1,110 @@
+# -------------------------------------------------------------------------------- #
+# CMS HTTP Client
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Standard Library
+import asyncio
+from typing import Optional
+
+# HTTP
+import httpx
+
+# Logging
+from src.utils.logger import logger
+
+# CMS Constants
+from src.cms.constants import (
+    CMS_HTTP_MAX_CONNECTIONS,
+    CMS_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    CMS_HTTP_KEEPALIVE_EXPIRY,
+    CMS_HTTP2,
+    CMS_HTTP_CONNECT_TIMEOUT,
+    CMS_HTTP_READ_TIMEOUT,
+    CMS_HTTP_WRITE_TIMEOUT,
+    CMS_HTTP_POOL_TIMEOUT,
+)
+
+
+# -------------------------------------------------------------------------------- #
+# Client State
+# -------------------------------------------------------------------------------- #
+
+# One pooled client per container. Pooled connections are bound to the event loop
+# they were opened on, so the loop is tracked alongside the client.
+_cms_client: Optional[httpx.AsyncClient] = None
+_cms_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+# -------------------------------------------------------------------------------- #
+# Helper Functions
+# -------------------------------------------------------------------------------- #
+
+def _http2_available() -> bool:
+    """
+    Check whether the optional `h2` package needed for HTTP/2 is installed.
+    """
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def create_cms_client() -> httpx.AsyncClient:
+    """
+    Create a pooled HTTP client for the CMS API.
+    """
+    http2 = CMS_HTTP2 and _http2_available()
+    if CMS_HTTP2 and not http2:
+        logger.warning("CMS_HTTP2 is enabled but the h2 package is not installed. Falling back to HTTP/1.1.")
+
+    limits = httpx.Limits(
+        max_connections=CMS_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=CMS_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=CMS_HTTP_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        connect=CMS_HTTP_CONNECT_TIMEOUT,
+        read=CMS_HTTP_READ_TIMEOUT,
+        write=CMS_HTTP_WRITE_TIMEOUT,
+        pool=CMS_HTTP_POOL_TIMEOUT,
+    )
+
+    logger.info(f"Creating CMS HTTP client. HTTP/2: {http2}. Max connections: {CMS_HTTP_MAX_CONNECTIONS}.")
+    return httpx.AsyncClient(http2=http2, limits=limits, timeout=timeout)
+
+
+# -------------------------------------------------------------------------------- #
+# Functions
+# -------------------------------------------------------------------------------- #
+
+def get_cms_client() -> httpx.AsyncClient:
+    """
+    Get the shared CMS client, creating it on first use or when the event loop has changed.
+    """
+    global _cms_client, _cms_client_loop
+
+    loop = asyncio.get_running_loop()
+    if _cms_client is None or _cms_client.is_closed or _cms_client_loop is not loop:
+        _cms_client = create_cms_client()
+        _cms_client_loop = loop
+
+    return _cms_client
+
+
+async def close_cms_client() -> None:
+    """
+    Close the shared CMS client and release its pooled connections.
+    """
+    global _cms_client, _cms_client_loop
+
+    if _cms_client is not None and not _cms_client.is_closed:
+        await _cms_client.aclose()
+        logger.info("CMS HTTP client closed")
+
+    _cms_client = None
+    _cms_client_loop = None
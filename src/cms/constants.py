@@ -5,14 +5,14 @@
 # -------------------------------------------------------------------------------- #
 
 import os
-from dotenv import load_dotenv
+from src.utils.env_utils import load_environment
 
 
 # -------------------------------------------------------------------------------- #
 # Load Environment Variables
 # -------------------------------------------------------------------------------- #
 
-load_dotenv()
+load_environment()
 
 
 # -------------------------------------------------------------------------------- #
@@ -29,3 +29,79 @@ CMS_BASE_URL = os.getenv("CMS_BASE_URL")
 CMS_ARTICLES_PATH = os.getenv("CMS_ARTICLES_PATH")
 CMS_TAGS_PATH = os.getenv("CMS_TAGS_PATH")
 CMS_XML_BLOCKS_PATH = os.getenv("CMS_XML_BLOCKS_PATH")
+
+
+# -------------------------------------------------------------------------------- #
+# CMS HTTP Client
+# -------------------------------------------------------------------------------- #
+
+# Connection pool limits
+CMS_HTTP_MAX_CONNECTIONS = int(os.getenv("CMS_HTTP_MAX_CONNECTIONS", "20"))
+CMS_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("CMS_HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+CMS_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("CMS_HTTP_KEEPALIVE_EXPIRY", "60"))
+
+# Protocol
+CMS_HTTP2 = os.getenv("CMS_HTTP2", "true").lower() == "true"
+
+# Per-phase timeouts (seconds)
+CMS_HTTP_CONNECT_TIMEOUT = float(os.getenv("CMS_HTTP_CONNECT_TIMEOUT", "5"))
+CMS_HTTP_READ_TIMEOUT = float(os.getenv("CMS_HTTP_READ_TIMEOUT", "30"))
+CMS_HTTP_WRITE_TIMEOUT = float(os.getenv("CMS_HTTP_WRITE_TIMEOUT", "30"))
+CMS_HTTP_POOL_TIMEOUT = float(os.getenv("CMS_HTTP_POOL_TIMEOUT", "5"))
+
+
+# -------------------------------------------------------------------------------- #
+# CMS XML Block Cache
+# -------------------------------------------------------------------------------- #
+
+CMS_XML_BLOCKS_CACHE_ENABLED = os.getenv("CMS_XML_BLOCKS_CACHE_ENABLED", "true").lower() == "true"
+
+# Seconds a catalog is served without revalidation
+CMS_XML_BLOCKS_CACHE_TTL = float(os.getenv("CMS_XML_BLOCKS_CACHE_TTL", "300"))
+
+# Seconds past the TTL a stale catalog is still served while revalidating in the background
+CMS_XML_BLOCKS_CACHE_STALE_TTL = float(os.getenv("CMS_XML_BLOCKS_CACHE_STALE_TTL", "3600"))
+
+# Maximum number of brands held in the cache
+CMS_XML_BLOCKS_CACHE_MAX_BRANDS = int(os.getenv("CMS_XML_BLOCKS_CACHE_MAX_BRANDS", "32"))
+
+# Comma-separated paths of the collections related to XML blocks (e.g. the block and parameter
+# collections). When set, catalogs without an ETag are revalidated with one `updatedAt` probe per
+# collection instead of a full fetch.
+CMS_XML_BLOCKS_PROBE_PATHS = [path for path in os.getenv("CMS_XML_BLOCKS_PROBE_PATHS", "").split(",") if path]
+
+
+# -------------------------------------------------------------------------------- #
+# CMS XML Block Pagination
+# -------------------------------------------------------------------------------- #
+
+# Documents requested per page
+CMS_XML_BLOCKS_PAGE_LIMIT = int(os.getenv("CMS_XML_BLOCKS_PAGE_LIMIT", "100"))
+
+# Relationship depth to populate (the xmlBlock relation needs depth >= 1)
+CMS_XML_BLOCKS_DEPTH = int(os.getenv("CMS_XML_BLOCKS_DEPTH", "1"))
+
+# Optional comma-separated field projection, e.g. "xmlBlock,updatedAt"
+CMS_XML_BLOCKS_SELECT = [field for field in os.getenv("CMS_XML_BLOCKS_SELECT", "").split(",") if field] or None
+
+# Maximum number of pages fetched concurrently
+CMS_XML_BLOCKS_FETCH_CONCURRENCY = int(os.getenv("CMS_XML_BLOCKS_FETCH_CONCURRENCY", "4"))
+
+
+# -------------------------------------------------------------------------------- #
+# CMS Bulk Article Writes
+# -------------------------------------------------------------------------------- #
+
+# Optional bulk create endpoint taking `{"docs": [...]}` and answering with one doc per item in order
+CMS_ARTICLES_BULK_PATH = os.getenv("CMS_ARTICLES_BULK_PATH") or None
+
+# Maximum number of create requests in flight at once
+CMS_BULK_WRITE_CONCURRENCY = int(os.getenv("CMS_BULK_WRITE_CONCURRENCY", "8"))
+
+# Articles sent per request to the bulk endpoint
+CMS_BULK_WRITE_BATCH_SIZE = int(os.getenv("CMS_BULK_WRITE_BATCH_SIZE", "25"))
+
+# Retries for rate limited (429) and server (5xx) failures, with full-jitter exponential backoff (seconds)
+CMS_WRITE_MAX_RETRIES = int(os.getenv("CMS_WRITE_MAX_RETRIES", "4"))
+CMS_WRITE_RETRY_BASE_DELAY = float(os.getenv("CMS_WRITE_RETRY_BASE_DELAY", "0.5"))
+CMS_WRITE_RETRY_MAX_DELAY = float(os.getenv("CMS_WRITE_RETRY_MAX_DELAY", "10"))
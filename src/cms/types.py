@@ -7,17 +7,18 @@
 # -------------------------------------------------------------------------------- #
 
 # Type imports
-from typing import Optional, List
+from dataclasses import dataclass
+from typing import Annotated, Any, Optional, List, Tuple
 import os
 
 # Environment imports
-from dotenv import load_dotenv
+from src.utils.env_utils import load_environment
 
 # Pydantic imports
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, BeforeValidator, Field
 
 # Load environment variables
-load_dotenv()
+load_environment()
 
 
 # -------------------------------------------------------------------------------- #
@@ -37,6 +38,31 @@ class CmsCreateArticleRequest(BaseModel):
     # TODO: Make this default for now...edit later
     authorId: Optional[str] = Field(description="The ID of the author which the content belongs to.", default=os.getenv("CMS_AUTHOR_ID"))
 
+# -------------------------------------------------------------------------------- #
+# CMS Bulk Article Writes
+# -------------------------------------------------------------------------------- #
+
+class CmsBulkArticleItem(BaseModel):
+    """
+    An article to create in a bulk write, with the key that deduplicates it across replays.
+    """
+    request: CmsCreateArticleRequest = Field(description="The article to create")
+    dedup_key: str = Field(description="Client-supplied key, e.g. the source hash plus brand, sent as the idempotency key")
+
+
+class CmsBulkArticleResult(BaseModel):
+    """
+    Result for a single article of a bulk write.
+    """
+    index: int = Field(description="The position of the article in the input stream")
+    dedup_key: str = Field(description="The dedup key of the article")
+    status: str = Field(description="One of: created, existing, duplicate, error")
+    article_id: Optional[str] = Field(description="The ID of the created or existing article", default=None)
+    status_code: Optional[int] = Field(description="The HTTP status of the last attempt", default=None)
+    attempts: int = Field(description="Requests made for the article, including retries", default=0)
+    message: str = Field(description="The message for the article", default="")
+
+
 # -------------------------------------------------------------------------------- #
 # CMS Resource Base Response
 # -------------------------------------------------------------------------------- #
@@ -59,26 +85,54 @@ class CmsResourceBaseResponse(BaseModel):
 # -------------------------------------------------------------------------------- #
 # XML Blocks Models
 # -------------------------------------------------------------------------------- #
-# TODO: Simplify this
 
-class CmsXmlBlockParameter(BaseModel):
+def _empty_if_none(value: Any) -> Any:
+    return value if value is not None else ""
+
+
+# Frozen slotted dataclasses, since cached catalogs are shared read-only across requests
+@dataclass(frozen=True, slots=True)
+class CmsXmlBlockParameter:
+    """
+    XML block parameter in the CMS API.
+    """
+    id: str
+    name: str
+    ts_name: Annotated[str, Field(validation_alias=AliasChoices("tsName", "ts_name"))]
+    required: bool
+    data_type: Annotated[str, Field(validation_alias=AliasChoices("dataType", "data_type"))]
+    description: Annotated[str, BeforeValidator(_empty_if_none)] = ""
+
+
+@dataclass(frozen=True, slots=True)
+class CmsXmlBlock:
     """
-    Model for XML block parameters in the CMS API.
+    XML block in the CMS API.
     """
-    id: str = Field(..., description="The ID of the parameter")
-    name: str = Field(..., description="The name of the parameter") 
-    ts_name: str = Field(..., description="The TypeScript name of the parameter")
-    required: bool = Field(..., description="Whether the parameter is required")
-    description: Optional[str] = Field(description="The description of the parameter", default="")
-    data_type: str = Field(..., description="The data type of the parameter")
+    id: str
+    name: str
+    ts_name: Annotated[str, Field(validation_alias=AliasChoices("tsName", "ts_name"))]
+    description: str
+    parameters: Annotated[Tuple[CmsXmlBlockParameter, ...],
+                          Field(validation_alias=AliasChoices("xmlBlockParameters", "parameters"))] = ()
+
 
-class CmsXmlBlock(BaseModel):
+@dataclass(frozen=True, slots=True)
+class CmsXmlBlockDoc:
     """
-    Model for XML blocks in the CMS API.
+    XML block document in a CMS API page.
     """
-    id: str = Field(..., description="The ID of the XML block")
-    name: str = Field(..., description="The name of the XML block")
-    ts_name: str = Field(..., description="The TypeScript name of the XML block")
-    description: str = Field(..., description="The description of the XML block")
-    parameters: List[CmsXmlBlockParameter] = Field(..., description="The parameters of the XML block")
+    xmlBlock: CmsXmlBlock
+    updatedAt: Optional[str] = None
+
 
+@dataclass(frozen=True, slots=True)
+class CmsXmlBlockPage:
+    """
+    Page of XML block documents in the CMS API, with the pagination fields the client uses.
+    """
+    docs: Tuple[CmsXmlBlockDoc, ...]
+    totalDocs: int
+    totalPages: int
+    page: int
+    hasNextPage: bool
@@ -7,35 +7,70 @@
 # -------------------------------------------------------------------------------- #
 
 # Built-in imports
-from typing import Dict, Any, Tuple
-from dotenv import load_dotenv
+from typing import Dict, Any, Tuple, List, Optional, Callable, Awaitable
+import contextlib
 import json
+import time
 
 # Async imports
 import asyncio
 
-# Requests Imports
-import requests
-
 # Pydantic Imports
-from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIModel
+from pydantic import TypeAdapter
 
 # Logger
-from src.utils.logger import logger
+from src.utils.logger import logger, LogPayload
+
+# Environment
+from src.utils.env_utils import load_environment
 
 # Type Imports
-from src.api.types import HandlerApiRequest, LambdaApiResponse, BaseApiBody
+from src.api.types import HandlerApiRequest, HandlerBatchApiRequest, LambdaApiResponse, BaseApiBody, BatchItemResult
 
 # Handler Utils Imports
-from src.utils.handler_utils import parse_request_body, validate_request_body
+from src.utils.handler_utils import parse_and_validate_request
 
 # CMS Imports
-from src.cms.calls import fetch_xml_blocks, create_article_in_cms
-from src.cms.types import CmsCreateArticleRequest
+from src.cms.calls import fetch_xml_blocks, create_article_in_cms, find_article_in_cms
+from src.cms.client import close_cms_client
+from src.cms.types import CmsCreateArticleRequest, CmsXmlBlock
 
 # LLM Imports
-from src.llm.calls import call_content_generation_agent, call_title_and_excerpt_generation_agent
+from src.llm.calls import (
+    call_content_generation_agent,
+    call_content_generation_candidates,
+    call_title_and_excerpt_generation_agent,
+    get_content_template_name,
+    prepare_raw_content,
+    warm_up_llm_client,
+)
+from src.llm.constants import (
+    LLM_BATCH_CONCURRENCY,
+    LLM_SPECULATIVE_TITLE_CATEGORIES,
+    LLM_SPECULATIVE_TITLE_MIN_OVERLAP,
+    LLM_VARIANT_CATEGORIES,
+    LLM_VARIANT_COUNT,
+)
+from src.llm.scoring import keyword_overlap, select_best_draft
+from src.llm.types import TitleExcerptResponse, PreparedRawContent
+from src.llm.validation import DraftValidationError
+
+# LLM Utils Imports
+from src.utils.llm_utils import speculative_title_stats
+
+# Template Imports
+from src.utils.jinja_utils import load_prompt_template, get_xml_blocks_fragment
+
+# Pipeline Imports
+from src.utils.pipeline_utils import PipelineStep, run_pipeline
+
+# Tracing Imports
+from src.utils.tracing import span, traced
+
+# Job Imports (the store, queue and checkpoint backends are created on first use)
+from src.jobs.types import JOB_STATUS_RUNNING, JOB_STATUS_SUCCEEDED, JOB_STATUS_FAILED, JOB_FINISHED_STATUSES
+from src.jobs.checkpoints import PipelineCheckpoint, idempotency_key
+from src.jobs.constants import PIPELINE_CHECKPOINTS_ENABLED
 
 # -------------------------------------------------------------------------------- #
 # Configuration
@@ -43,7 +78,7 @@ from src.llm.calls import call_content_generation_agent, call_title_and_excerpt_
 
 
 # Load environment variables
-load_dotenv()
+load_environment()
 logger.info("Loaded environment variables")
 
 
@@ -53,51 +88,259 @@ logger.info("Loaded environment variables")
 # -------------------------------------------------------------------------------- #
 
 
-async def write_long_form_article_async(event: Dict[str, Any], context: Dict[str, Any]) -> LambdaApiResponse:
-    logger.info(f"Received event: {event}")
+# -------------------------------------------------------------------------------- #
+# Article Pipeline
+# -------------------------------------------------------------------------------- #
 
-    try:
-        # Step One: Parse the request body
-        parsed_request = parse_request_body(event=event, request_model=HandlerApiRequest)
+# Stage outputs are checkpointed per request so retries resume where they stopped (store created on first use)
+_checkpoint_store = None
+
+
+def get_checkpoint_store():
+    """
+    Get the checkpoint store, creating it on first use. None when checkpoints are disabled.
+    """
+    global _checkpoint_store
+    if _checkpoint_store is None and PIPELINE_CHECKPOINTS_ENABLED:
+        from src.jobs.checkpoints import create_checkpoint_store
+        _checkpoint_store = create_checkpoint_store()
+    return _checkpoint_store
+
+# Serializes the XML blocks stage output
+xml_blocks_adapter = TypeAdapter(List[CmsXmlBlock])
+
+# Marks that a CMS create was attempted, so a replay looks for the article before creating another
+ARTICLE_CREATE_STARTED = "article_create_started"
+
+
+def get_request_idempotency_key(handler_api_request: HandlerApiRequest) -> Optional[str]:
+    """
+    Get the client's idempotency key, or derive one from the request content if the client opted in.
+
+    Without a key a request neither resumes nor returns the article of an earlier run of the same
+    request. A `bypass_cache` request never gets a derived key.
+    """
+    if handler_api_request.idempotency_key:
+        return handler_api_request.idempotency_key
+    if not handler_api_request.idempotent or handler_api_request.bypass_cache:
+        return None
+    return idempotency_key(handler_api_request.model_dump(exclude={"bypass_cache", "idempotency_key", "idempotent"}))
+
+
+async def generate_article(handler_api_request: HandlerApiRequest,
+                           xml_blocks: Optional[List[CmsXmlBlock]] = None,
+                           content_semaphore: Optional[asyncio.Semaphore] = None,
+                           on_progress: Optional[Callable[[str, float], Awaitable[None]]] = None,
+                           ) -> Tuple[str, Dict[str, float], Dict[str, int]]:
+    """
+    Generate an article for a request and create it in the CMS.
+
+    Returns the article ID, per-step timings and the raw content token accounting.
+    `on_progress` is awaited with the name and duration of each step as it finishes.
+
+    Every stage output is checkpointed under the request's idempotency key, so a retry of
+    the same request resumes from the last completed stage and never creates a second article.
+    """
+    template_name = get_content_template_name(handler_api_request.category_slug)
+    variant_count = LLM_VARIANT_COUNT if handler_api_request.category_slug in LLM_VARIANT_CATEGORIES else 1
+    speculative_title = handler_api_request.category_slug in LLM_SPECULATIVE_TITLE_CATEGORIES
+    request_key = get_request_idempotency_key(handler_api_request)
+    checkpoint_store = get_checkpoint_store() if request_key else None
+    checkpoint = await PipelineCheckpoint.load(checkpoint_store, request_key) if checkpoint_store else None
+
+    # Fetch the XML blocks from the CMS (unless they were already fetched for the brand)
+    async def fetch_xml_blocks_step(results: Dict[str, Any]):
+        if xml_blocks is not None:
+            return xml_blocks
+        return await fetch_xml_blocks(brand_id=handler_api_request.brand_id)
+
+    # Load (and compile) the content generation template
+    async def load_template_step(results: Dict[str, Any]):
+        return load_prompt_template(template_name)
+
+    # Open a connection to the LLM API
+    async def warm_up_llm_step(results: Dict[str, Any]):
+        await warm_up_llm_client()
+
+    # Check the raw content against the token budget, condensing it if it is over
+    async def prepare_raw_content_step(results: Dict[str, Any]):
+        return await prepare_raw_content(handler_api_request.content, bypass_cache=handler_api_request.bypass_cache)
+
+    # Configure and run the agent. When streaming with a prefix size configured,
+    # the title and excerpt call starts on the first sections while the draft is still streaming.
+    title_and_excerpt_tasks: List[asyncio.Task] = []
+
+    # A rejected draft's title and excerpt must not ship with the regenerated draft
+    def discard_title_and_excerpt_tasks() -> None:
+        for task in title_and_excerpt_tasks:
+            task.cancel()
+        title_and_excerpt_tasks.clear()
+
+    def start_title_and_excerpt_on_prefix(prefix: str) -> None:
+        discard_title_and_excerpt_tasks()
+        title_and_excerpt_tasks.append(asyncio.create_task(
+            call_title_and_excerpt_generation_agent(content=prefix, bypass_cache=handler_api_request.bypass_cache)
+        ))
+
+    # In speculative categories, the title and excerpt call also starts on the raw content with the draft
+    speculative_title_tasks: List[asyncio.Task] = []
+
+    async def speculate_title_and_excerpt(raw_content: str) -> Tuple[TitleExcerptResponse, float]:
+        start_time = time.monotonic()
+        title_and_excerpt = await call_title_and_excerpt_generation_agent(content=raw_content,
+                                                                          bypass_cache=handler_api_request.bypass_cache)
+        return title_and_excerpt, time.monotonic() - start_time
+
+    async def generate_content_step(results: Dict[str, Any]):
+        content_generation_kwargs = {
+            "raw_content": results["raw_content"].content,
+            "custom_xml_tags": get_xml_blocks_fragment(handler_api_request.brand_id, results["xml_blocks"]),
+        }
+        try:
+            # Bound concurrent draft generations when a semaphore is given (batch runs)
+            async with content_semaphore or contextlib.nullcontext():
+                if speculative_title:
+                    speculative_title_tasks.append(asyncio.create_task(
+                        speculate_title_and_excerpt(results["raw_content"].content)
+                    ))
+
+                # Variant categories generate candidate drafts and keep the best scoring one
+                if variant_count > 1:
+                    candidates = await call_content_generation_candidates(category_slug=handler_api_request.category_slug,
+                                                                          developer_prompt_kwargs=content_generation_kwargs,
+                                                                          count=variant_count,
+                                                                          bypass_cache=handler_api_request.bypass_cache,
+                                                                          brand_id=handler_api_request.brand_id,
+                                                                          xml_blocks=results["xml_blocks"])
+                    if candidates:
+                        content, scores = select_best_draft(candidates, results["xml_blocks"])
+                        logger.info("Candidate draft scores: %s", [(score.index, score.score) for score in scores])
+                        return content
+                    logger.warning("Every candidate draft failed validation. Generating a single draft instead.")
+
+                return await call_content_generation_agent(category_slug=handler_api_request.category_slug,
+                                                           developer_prompt_kwargs=content_generation_kwargs,
+                                                           on_prefix=start_title_and_excerpt_on_prefix,
+                                                           bypass_cache=handler_api_request.bypass_cache,
+                                                           brand_id=handler_api_request.brand_id,
+                                                           xml_blocks=results["xml_blocks"],
+                                                           on_regenerate=discard_title_and_excerpt_tasks)
+        except BaseException:
+            for task in title_and_excerpt_tasks + speculative_title_tasks:
+                task.cancel()
+            raise
+
+    # Keep the speculative title and excerpt when the draft covers its keywords
+    async def collect_speculative_title_and_excerpt(content: str) -> Optional[TitleExcerptResponse]:
+        wait_start_time = time.monotonic()
+        try:
+            title_and_excerpt, duration = await speculative_title_tasks[0]
+        except Exception as e:
+            logger.warning(f"Speculative title and excerpt call failed. Error: {e}")
+            speculative_title_stats.record(handler_api_request.category_slug, hit=False)
+            return None
+
+        overlap = keyword_overlap(f"{title_and_excerpt.title} {title_and_excerpt.excerpt}", content)
+        if overlap < LLM_SPECULATIVE_TITLE_MIN_OVERLAP:
+            speculative_title_stats.record(handler_api_request.category_slug, hit=False, overlap=overlap)
+            return None
+
+        # A hit saves the call on the draft, less the time still spent waiting on the speculative one
+        speculative_title_stats.record(handler_api_request.category_slug, hit=True, overlap=overlap,
+                                       latency_saved=max(0.0, duration - (time.monotonic() - wait_start_time)))
+        return title_and_excerpt
+
+    # Call the title and excerpt generation agent (or collect the early or speculative one)
+    async def generate_title_and_excerpt_step(results: Dict[str, Any]):
+        if title_and_excerpt_tasks:
+            for task in speculative_title_tasks:
+                task.cancel()
+            return await title_and_excerpt_tasks[0]
+        if speculative_title_tasks:
+            title_and_excerpt = await collect_speculative_title_and_excerpt(results["content"])
+            if title_and_excerpt is not None:
+                return title_and_excerpt
+        return await call_title_and_excerpt_generation_agent(content=results["content"],
+                                                             bypass_cache=handler_api_request.bypass_cache)
+
+    # Prepare the body and create the article in the CMS
+    async def create_article_step(results: Dict[str, Any]):
+        cms_create_article_request = CmsCreateArticleRequest(
+            title=results["title_and_excerpt"].title,
+            excerpt=results["title_and_excerpt"].excerpt,
+            content=results["content"],
+            brandId=handler_api_request.brand_id,
+            tagIds=[handler_api_request.category_id],
+        )
 
-        # Step Two: Validate the request body
-        validate_request_body(body=parsed_request, request_model=HandlerApiRequest)
+        # A previous attempt may have created the article without checkpointing its ID
+        if checkpoint is not None:
+            if checkpoint.get(ARTICLE_CREATE_STARTED):
+                existing_article_id = await find_article_in_cms(brand_id=handler_api_request.brand_id,
+                                                                idempotency_key=request_key)
+                if existing_article_id:
+                    logger.info(f"Found article {existing_article_id} from a previous attempt. Skipping create.")
+                    return existing_article_id
+            await checkpoint.save(ARTICLE_CREATE_STARTED, str(time.time()))
+
+        return await create_article_in_cms(cms_create_article_request, idempotency_key=request_key)
+
+    # Run the steps as a dependency graph, so independent steps overlap
+    pipeline_start_time = time.monotonic()
+    results, timings = await run_pipeline([
+        PipelineStep(name="xml_blocks", run=fetch_xml_blocks_step,
+                     dump=lambda blocks: xml_blocks_adapter.dump_json(blocks).decode(),
+                     load=xml_blocks_adapter.validate_json),
+        PipelineStep(name="template", run=load_template_step),
+        PipelineStep(name="llm_warm_up", run=warm_up_llm_step),
+        PipelineStep(name="raw_content", run=prepare_raw_content_step,
+                     dump=PreparedRawContent.model_dump_json, load=PreparedRawContent.model_validate_json),
+        PipelineStep(name="content", run=generate_content_step,
+                     depends_on=("xml_blocks", "template", "llm_warm_up", "raw_content"),
+                     dump=str, load=str),
+        PipelineStep(name="title_and_excerpt", run=generate_title_and_excerpt_step, depends_on=("content",),
+                     dump=TitleExcerptResponse.model_dump_json, load=TitleExcerptResponse.model_validate_json),
+        PipelineStep(name="article_id", run=create_article_step, depends_on=("content", "title_and_excerpt"),
+                     dump=str, load=str),
+    ], on_step_complete=on_progress, checkpoint=checkpoint)
+    timings["total"] = time.monotonic() - pipeline_start_time
+    logger.info(f"Pipeline timings (s): {', '.join(f'{name}={duration:.2f}' for name, duration in timings.items())}")
+
+    tokens = {
+        "raw_content_tokens": results["raw_content"].source_tokens,
+        "prompt_raw_content_tokens": results["raw_content"].prompt_tokens,
+        "input_tokens_avoided": results["raw_content"].input_tokens_avoided,
+    }
 
-        # Step Three: Extract Body into  HandlerApiRequest
-        handler_api_request = HandlerApiRequest(**parsed_request)
+    return results["article_id"], timings, tokens
 
-        # Step Four: Fetch the XML blocks from the CMS
-        xml_blocks = await fetch_xml_blocks(brand_id=handler_api_request.brand_id)
 
-        # Step Five: Configure the content generation kwargs
-        content_generation_kwargs = {
-            "raw_content": handler_api_request.content,
-            "xml_blocks": xml_blocks,
-        }
+# -------------------------------------------------------------------------------- #
+# Handlers
+# -------------------------------------------------------------------------------- #
 
-        # Step Six: Configure and run the agent
-        content = await call_content_generation_agent(category_slug=handler_api_request.category_slug, developer_prompt_kwargs=content_generation_kwargs)
 
-        # Step Seven: Call the title and excerpt generation agent
-        title_and_excerpt = await call_title_and_excerpt_generation_agent(content=content)
+@traced("handler.write_long_form_article")
+async def write_long_form_article_async(event: Dict[str, Any],
+                                        context: Dict[str, Any],
+                                        on_progress: Optional[Callable[[str, float], Awaitable[None]]] = None,
+                                        ) -> LambdaApiResponse:
+    logger.info("Received event. Body: %d chars", len(event.get("body") or ""))
+    logger.debug("Event: %s", LogPayload(event))
 
-        # Step Eight: Prepare Body
-        cms_create_article_request = CmsCreateArticleRequest(
-            title=title_and_excerpt.title,
-            excerpt=title_and_excerpt.excerpt,
-            content=content,
-            brandId=handler_api_request.brand_id,
-            tagIds=[handler_api_request.category_id],
-        )
+    try:
+        # Steps One to Three: Parse and validate the request body into a HandlerApiRequest in one pass
+        with span("handler.parse_request"):
+            handler_api_request = parse_and_validate_request(event=event, request_model=HandlerApiRequest)
 
-        # Step Nine: Create the article in the CMS
-        cms_create_article_response = await create_article_in_cms(cms_create_article_request)
+        # Step Four: Generate the article and create it in the CMS
+        article_id, timings, tokens = await generate_article(handler_api_request, on_progress=on_progress)
 
-        # Step Ten: Prepare the response
+        # Step Five: Prepare the response
         body = BaseApiBody(
             status="success",
             message="Article created in CMS.",
-            data={"article_id": cms_create_article_response},
+            data={"article_id": article_id, "timings": timings, "tokens": tokens},
         )
 
         # Prepare the response
@@ -107,6 +350,23 @@ async def write_long_form_article_async(event: Dict[str, Any], context: Dict[str
 
         return handler_response
 
+    except DraftValidationError as e:
+        logger.error(f"Model output failed validation: {e}")
+
+        # Prepare the response (the model, not the client, produced the invalid draft)
+        body = BaseApiBody(
+            status="error",
+            message=str(e),
+            data=None,
+        )
+
+        # Prepare the response
+        handler_response = LambdaApiResponse(
+            statusCode=502,
+            body=body,
+        )
+
+        return handler_response
     except ValueError as e:
         logger.error(f"Error occurred: {e}")
 
@@ -119,9 +379,11 @@ async def write_long_form_article_async(event: Dict[str, Any], context: Dict[str
 
         # Prepare the response
         handler_response = LambdaApiResponse(
-            status_code=400,
+            statusCode=400,
             body=body,
         )
+
+        return handler_response
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
 
@@ -134,7 +396,7 @@ async def write_long_form_article_async(event: Dict[str, Any], context: Dict[str
 
         # Prepare the response
         handler_response = LambdaApiResponse(
-            status_code=500,
+            statusCode=500,
             body=body,
         )
 
@@ -146,6 +408,209 @@ def write_long_form_article(event, context):
     return loop.run_until_complete(write_long_form_article_async(event, context))
 
 
+# -------------------------------------------------------------------------------- #
+# Batch Handler
+# -------------------------------------------------------------------------------- #
+
+
+async def _generate_batch_item(index: int,
+                               handler_api_request: HandlerApiRequest,
+                               xml_blocks_task: "asyncio.Future[List[CmsXmlBlock]]",
+                               content_semaphore: asyncio.Semaphore) -> BatchItemResult:
+    """
+    Generate a single batch item, capturing any failure in its result instead of raising.
+    """
+    start_time = time.monotonic()
+    try:
+        xml_blocks = await xml_blocks_task
+        article_id, timings, tokens = await generate_article(handler_api_request,
+                                                             xml_blocks=xml_blocks,
+                                                             content_semaphore=content_semaphore)
+        return BatchItemResult(index=index, article_id=article_id, latency=time.monotonic() - start_time,
+                               timings=timings, tokens=tokens)
+    except Exception as e:
+        logger.error(f"Batch item {index} failed. Error: {e}")
+        return BatchItemResult(index=index, status="error", message=str(e), latency=time.monotonic() - start_time)
+
+
+@traced("handler.write_long_form_articles_batch")
+async def write_long_form_articles_batch_async(event: Dict[str, Any], context: Dict[str, Any]) -> LambdaApiResponse:
+    logger.info(f"Received batch event")
+    start_time = time.monotonic()
+
+    try:
+        # Step One: Parse, validate and extract the request body
+        batch_request = parse_and_validate_request(event=event, request_model=HandlerBatchApiRequest)
+    except ValueError as e:
+        logger.error(f"Error occurred: {e}")
+        return LambdaApiResponse(statusCode=400, body=BaseApiBody(status="error", message=str(e), data=None))
+
+    # Step Two: Fetch the XML blocks once per brand
+    brand_ids = {item.brand_id for item in batch_request.items}
+    xml_blocks_tasks = {brand_id: asyncio.ensure_future(fetch_xml_blocks(brand_id=brand_id)) for brand_id in brand_ids}
+    logger.info(f"Generating {len(batch_request.items)} articles for {len(brand_ids)} brands. Concurrency: {LLM_BATCH_CONCURRENCY}")
+
+    # Step Three: Generate every item under the draft generation concurrency budget
+    content_semaphore = asyncio.Semaphore(LLM_BATCH_CONCURRENCY)
+    results = await asyncio.gather(*[
+        _generate_batch_item(index, item, xml_blocks_tasks[item.brand_id], content_semaphore)
+        for index, item in enumerate(batch_request.items)
+    ])
+
+    # Step Four: Prepare the response, reporting partial failures per item
+    succeeded = sum(1 for result in results if result.status == "success")
+    failed = len(results) - succeeded
+    total_latency = time.monotonic() - start_time
+    logger.info(f"Batch finished. Succeeded: {succeeded}. Failed: {failed}. Took: {total_latency:.2f}s")
+
+    if not failed:
+        status_code, status, message = 200, "success", "All articles created in CMS."
+    elif succeeded:
+        status_code, status, message = 207, "partial", f"{failed} of {len(results)} articles failed."
+    else:
+        status_code, status, message = 500, "error", "All articles failed."
+
+    body = BaseApiBody(
+        status=status,
+        message=message,
+        data={
+            "results": [result.model_dump() for result in results],
+            "succeeded": succeeded,
+            "failed": failed,
+            "total_latency": total_latency,
+        },
+    )
+
+    return LambdaApiResponse(statusCode=status_code, body=body)
+
+
+def write_long_form_articles_batch(event, context):
+    loop = asyncio.get_event_loop()
+    return loop.run_until_complete(write_long_form_articles_batch_async(event, context))
+
+
+# -------------------------------------------------------------------------------- #
+# Job Handlers
+# -------------------------------------------------------------------------------- #
+
+
+@traced("jobs.run_article_job")
+async def run_article_job(job_id: str) -> None:
+    """
+    Run a queued article job, recording each finished pipeline step and the final response in the job store.
+    """
+    job_store = get_job_store()
+    job = await job_store.get(job_id)
+    if job is None:
+        logger.error(f"Job {job_id} not found. Skipping.")
+        return
+    if job.status in JOB_FINISHED_STATUSES:
+        logger.info(f"Job {job_id} already {job.status}. Skipping redelivery.")
+        return
+
+    await job_store.update(job_id, status=JOB_STATUS_RUNNING)
+    logger.info(f"Running job {job_id}")
+
+    # Progress updates are best effort and never fail the job
+    async def record_progress(step: str, duration: float) -> None:
+        try:
+            await job_store.record_step(job_id, step, duration)
+        except Exception as e:
+            logger.warning(f"Failed to record step {step} for job {job_id}. Error: {e}")
+
+    response = await write_long_form_article_async({"body": json.dumps(job.request)}, None, on_progress=record_progress)
+
+    if response.statusCode == 200:
+        await job_store.update(job_id, status=JOB_STATUS_SUCCEEDED, result=response.body.model_dump())
+    else:
+        await job_store.update(job_id, status=JOB_STATUS_FAILED, result=response.body.model_dump(),
+                               error=response.body.message)
+    logger.info(f"Job {job_id} finished with status code {response.statusCode}")
+
+
+# Job store and queue (the local queue runs jobs in this process with `run_article_job`), created on first use
+_job_store = None
+_job_queue = None
+
+
+def get_job_store():
+    """
+    Get the job store, creating it on first use.
+    """
+    global _job_store
+    if _job_store is None:
+        from src.jobs.store import create_job_store
+        _job_store = create_job_store()
+    return _job_store
+
+
+def get_job_queue():
+    """
+    Get the job queue, creating it on first use.
+    """
+    global _job_queue
+    if _job_queue is None:
+        from src.jobs.queue import create_job_queue
+        _job_queue = create_job_queue(worker=run_article_job)
+    return _job_queue
+
+
+async def submit_article_job_async(event: Dict[str, Any], context: Dict[str, Any]) -> LambdaApiResponse:
+    logger.info(f"Received job submission")
+
+    try:
+        # Step One: Parse, validate and extract the request body
+        handler_api_request = parse_and_validate_request(event=event, request_model=HandlerApiRequest)
+    except ValueError as e:
+        logger.error(f"Error occurred: {e}")
+        return LambdaApiResponse(statusCode=400, body=BaseApiBody(status="error", message=str(e), data=None))
+
+    # Step Two: Store the job and queue it for a worker
+    job = await get_job_store().create(handler_api_request.model_dump())
+    await get_job_queue().enqueue(job.job_id)
+    logger.info(f"Queued job {job.job_id}")
+
+    # Step Three: Respond right away with where to poll
+    body = BaseApiBody(
+        status=job.status,
+        message="Article job queued.",
+        data={"job_id": job.job_id, "status_url": f"/jobs/{job.job_id}"},
+    )
+    return LambdaApiResponse(statusCode=202, body=body)
+
+
+async def get_article_job_async(event: Dict[str, Any], context: Dict[str, Any]) -> LambdaApiResponse:
+    job_id = (event.get("pathParameters") or {}).get("job_id")
+    job = await get_job_store().get(job_id) if job_id else None
+    if job is None:
+        return LambdaApiResponse(statusCode=404, body=BaseApiBody(status="error", message=f"No such job: {job_id}"))
+
+    return LambdaApiResponse(body=BaseApiBody(status=job.status, message=f"Job is {job.status}.", data=job.model_dump()))
+
+
+async def process_article_jobs_async(event: Dict[str, Any], context: Dict[str, Any]) -> None:
+    """
+    Worker entry point for SQS events. Each record carries a job ID.
+    """
+    for record in event.get("Records", []):
+        await run_article_job(json.loads(record["body"])["job_id"])
+
+
+def submit_article_job(event, context):
+    loop = asyncio.get_event_loop()
+    return loop.run_until_complete(submit_article_job_async(event, context))
+
+
+def get_article_job(event, context):
+    loop = asyncio.get_event_loop()
+    return loop.run_until_complete(get_article_job_async(event, context))
+
+
+def process_article_jobs(event, context):
+    loop = asyncio.get_event_loop()
+    return loop.run_until_complete(process_article_jobs_async(event, context))
+
+
 if __name__ == "__main__":
     event = {
         "body": json.dumps({
@@ -158,4 +623,7 @@ if __name__ == "__main__":
 
     # Run the handler
     response = write_long_form_article(event, None)
-    logger.info(f"Finished running handler. Response: {response}")
+    logger.info("Finished running handler. Response: %s", LogPayload(response))
+
+    # Release pooled CMS connections
+    asyncio.get_event_loop().run_until_complete(close_cms_client())
@@ -0,0 +1,165 @@
+# -------------------------------------------------------------------------------- #
+# Pipeline Checkpoints
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Built-in imports
+import asyncio
+import hashlib
+import json
+import time
+from typing import Optional, Dict, Any, TYPE_CHECKING
+
+# sqlite3 is imported when the sqlite store first connects, off the handler's cold start
+if TYPE_CHECKING:
+    import sqlite3
+
+# Job Constants
+from src.jobs.constants import (
+    JOB_STORE_BACKEND,
+    JOB_STORE_PATH,
+    JOB_STORE_TABLE,
+    PIPELINE_CHECKPOINT_TTL,
+)
+
+# Logger imports
+from src.utils.logger import logger
+
+
+# -------------------------------------------------------------------------------- #
+# Idempotency Keys
+# -------------------------------------------------------------------------------- #
+
+def idempotency_key(payload: Dict[str, Any]) -> str:
+    """
+    Hash a request payload into a stable idempotency key.
+    """
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+# -------------------------------------------------------------------------------- #
+# Backends
+# -------------------------------------------------------------------------------- #
+
+class SqliteCheckpointStore:
+    """
+    Local file-backed checkpoint store. Shares the database file with the sqlite job store.
+    """
+
+    def __init__(self, path: str, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints (key TEXT NOT NULL, stage TEXT NOT NULL, "
+                "value TEXT NOT NULL, expires_at REAL NOT NULL, PRIMARY KEY (key, stage))"
+            )
+
+    def _connect(self) -> "sqlite3.Connection":
+        import sqlite3
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _load(self, key: str) -> Dict[str, str]:
+        with self._connect() as connection:
+            rows = connection.execute("SELECT stage, value FROM checkpoints WHERE key = ? AND expires_at > ?",
+                                      (key, time.time())).fetchall()
+        return dict(rows)
+
+    def _save(self, key: str, stage: str, value: str) -> None:
+        with self._connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO checkpoints (key, stage, value, expires_at) VALUES (?, ?, ?, ?)",
+                               (key, stage, value, time.time() + self.ttl))
+
+    async def load(self, key: str) -> Dict[str, str]:
+        return await asyncio.to_thread(self._load, key)
+
+    async def save(self, key: str, stage: str, value: str) -> None:
+        await asyncio.to_thread(self._save, key, stage, value)
+
+
+class DynamoDbCheckpointStore:
+    """
+    Shared checkpoint store. Each key is one item in the job table, with one attribute per stage.
+
+    Set `expires_at` as the table's TTL attribute to have DynamoDB delete expired checkpoints.
+    """
+
+    def __init__(self, table_name: str, ttl: float, prefix: str = "checkpoint:"):
+        try:
+            import boto3
+        except ImportError as e:
+            raise ValueError("The boto3 package must be installed to use the dynamodb checkpoint store") from e
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self._table = boto3.resource("dynamodb").Table(table_name)
+
+    async def load(self, key: str) -> Dict[str, str]:
+        response = await asyncio.to_thread(self._table.get_item, Key={"job_id": self.prefix + key})
+        item = response.get("Item") or {}
+        if int(item.get("expires_at", 0)) <= time.time():
+            return {}
+        return {name.removeprefix("stage_"): value for name, value in item.items() if name.startswith("stage_")}
+
+    async def save(self, key: str, stage: str, value: str) -> None:
+        await asyncio.to_thread(
+            self._table.update_item,
+            Key={"job_id": self.prefix + key},
+            UpdateExpression="SET #stage = :value, expires_at = :expires_at",
+            ExpressionAttributeNames={"#stage": f"stage_{stage}"},
+            ExpressionAttributeValues={":value": value, ":expires_at": int(time.time() + self.ttl)},
+        )
+
+
+def create_checkpoint_store():
+    """
+    Create the checkpoint store for the configured job store backend.
+    """
+    if JOB_STORE_BACKEND == "sqlite":
+        return SqliteCheckpointStore(path=JOB_STORE_PATH, ttl=PIPELINE_CHECKPOINT_TTL)
+    if JOB_STORE_BACKEND == "dynamodb":
+        if not JOB_STORE_TABLE:
+            raise ValueError("JOB_STORE_TABLE environment variable must be set to use the dynamodb checkpoint store")
+        return DynamoDbCheckpointStore(table_name=JOB_STORE_TABLE, ttl=PIPELINE_CHECKPOINT_TTL)
+    raise ValueError(f"Unknown JOB_STORE_BACKEND: {JOB_STORE_BACKEND}")
+
+
+# -------------------------------------------------------------------------------- #
+# Checkpoint
+# -------------------------------------------------------------------------------- #
+
+class PipelineCheckpoint:
+    """
+    The saved stage outputs of one pipeline run, keyed by its idempotency key.
+
+    Store errors are logged and treated as a missing checkpoint, so checkpointing can never fail a request.
+    """
+
+    def __init__(self, store: Any, key: str, stages: Optional[Dict[str, str]] = None):
+        self.store = store
+        self.key = key
+        self.stages: Dict[str, str] = stages or {}
+
+    @classmethod
+    async def load(cls, store: Any, key: str) -> "PipelineCheckpoint":
+        try:
+            stages = await store.load(key)
+        except Exception as e:
+            logger.warning(f"Failed to load pipeline checkpoint {key[:12]}. Error: {e}")
+            stages = {}
+        if stages:
+            logger.info(f"Loaded pipeline checkpoint {key[:12]} with stages: {sorted(stages)}")
+        return cls(store, key, stages)
+
+    def get(self, name: str) -> Optional[str]:
+        return self.stages.get(name)
+
+    async def save(self, name: str, value: str) -> None:
+        self.stages[name] = value
+        try:
+            await self.store.save(self.key, name, value)
+        except Exception as e:
+            logger.warning(f"Failed to save stage {name} of pipeline checkpoint {self.key[:12]}. Error: {e}")
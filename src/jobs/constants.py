@@ -0,0 +1,56 @@
+# -------------------------------------------------------------------------------- #
+# Job Constants
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+import os
+from src.utils.env_utils import load_environment
+
+
+# -------------------------------------------------------------------------------- #
+# Load Environment Variables
+# -------------------------------------------------------------------------------- #
+
+load_environment()
+
+
+# -------------------------------------------------------------------------------- #
+# Job Store
+# -------------------------------------------------------------------------------- #
+
+# One of: sqlite, dynamodb
+JOB_STORE_BACKEND = os.getenv("JOB_STORE_BACKEND", "sqlite").lower()
+
+# Database file for the sqlite backend
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", "/tmp/article-jobs.sqlite3")
+
+# Table name for the dynamodb backend
+JOB_STORE_TABLE = os.getenv("JOB_STORE_TABLE")
+
+
+# -------------------------------------------------------------------------------- #
+# Job Queue
+# -------------------------------------------------------------------------------- #
+
+# One of: local, sqs
+JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND", "local").lower()
+
+# Queue URL for the sqs backend
+JOB_QUEUE_URL = os.getenv("JOB_QUEUE_URL")
+
+# Number of jobs the local queue runs at once
+JOB_LOCAL_WORKERS = int(os.getenv("JOB_LOCAL_WORKERS", "2"))
+
+
+# -------------------------------------------------------------------------------- #
+# Pipeline Checkpoints
+# -------------------------------------------------------------------------------- #
+
+# Checkpoint each stage of the article pipeline so a retried request resumes where it stopped
+PIPELINE_CHECKPOINTS_ENABLED = os.getenv("PIPELINE_CHECKPOINTS_ENABLED", "true").lower() == "true"
+
+# Seconds a checkpoint is kept, and so how long a replayed request returns the same article
+PIPELINE_CHECKPOINT_TTL = float(os.getenv("PIPELINE_CHECKPOINT_TTL", str(7 * 24 * 3600)))
@@ -0,0 +1,60 @@
+# -------------------------------------------------------------------------------- #
+# Local Job Runner
+# -------------------------------------------------------------------------------- #
+# Submits article requests through the job endpoint and polls their status, with the
+# in-process queue and the sqlite store, so job mode runs without AWS.
+#
+# Usage: python -m src.jobs.local request.json [request.json ...]
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Built-in imports
+import argparse
+import asyncio
+import json
+from pathlib import Path
+from typing import List
+
+# Handler imports
+from src.handler import submit_article_job_async, get_article_job_async
+from src.jobs.types import JOB_FINISHED_STATUSES
+
+# Logger imports
+from src.utils.logger import logger
+
+
+# -------------------------------------------------------------------------------- #
+# Functions
+# -------------------------------------------------------------------------------- #
+
+async def run_local_jobs(request_paths: List[str], poll_interval: float = 1.0) -> None:
+    """
+    Submit every request, then poll each job until it finishes.
+    """
+    job_ids = []
+    for path in request_paths:
+        response = await submit_article_job_async({"body": Path(path).read_text()}, None)
+        logger.info(f"Submitted {path}. Response: {response.statusCode} {response.body.model_dump()}")
+        if response.statusCode == 202:
+            job_ids.append(response.body.data["job_id"])
+
+    while job_ids:
+        await asyncio.sleep(poll_interval)
+        for job_id in list(job_ids):
+            response = await get_article_job_async({"pathParameters": {"job_id": job_id}}, None)
+            logger.info(f"Job {job_id} is {response.body.status}. Finished steps: {list(response.body.data['steps'])}")
+            if response.body.status in JOB_FINISHED_STATUSES:
+                print(json.dumps(response.body.data, indent=2))
+                job_ids.remove(job_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run article jobs locally with the in-process queue.")
+    parser.add_argument("request_paths", nargs="+", help="JSON files with one HandlerApiRequest each")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    asyncio.run(run_local_jobs(args.request_paths, poll_interval=args.poll_interval))
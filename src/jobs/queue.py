@@ -0,0 +1,111 @@
+# -------------------------------------------------------------------------------- #
+# Job Queue
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Built-in imports
+import asyncio
+import json
+from typing import Optional, List, Callable, Awaitable
+
+# Job Constants
+from src.jobs.constants import JOB_QUEUE_BACKEND, JOB_QUEUE_URL, JOB_LOCAL_WORKERS
+
+# Logger imports
+from src.utils.logger import logger
+
+
+# -------------------------------------------------------------------------------- #
+# Types
+# -------------------------------------------------------------------------------- #
+
+JobWorker = Callable[[str], Awaitable[None]]
+
+
+# -------------------------------------------------------------------------------- #
+# In-process Queue
+# -------------------------------------------------------------------------------- #
+
+class InProcessJobQueue:
+    """
+    asyncio queue drained by worker tasks in the same process, for running job mode without AWS.
+
+    Workers start on the first enqueue, in the running event loop.
+    """
+
+    def __init__(self, worker: JobWorker, concurrency: int = JOB_LOCAL_WORKERS):
+        self.worker = worker
+        self.concurrency = concurrency
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _start(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._tasks = [asyncio.create_task(self._work(), name=f"job-worker-{index}") for index in range(self.concurrency)]
+        return self._queue
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.worker(job_id)
+            except Exception as e:
+                logger.error(f"Job {job_id} worker crashed. Error: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def enqueue(self, job_id: str) -> None:
+        await self._start().put(job_id)
+
+    async def join(self) -> None:
+        """
+        Wait until every enqueued job has been processed.
+        """
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._queue, self._tasks = None, []
+
+
+# -------------------------------------------------------------------------------- #
+# SQS Queue
+# -------------------------------------------------------------------------------- #
+
+class SqsJobQueue:
+    """
+    Sends job IDs to an SQS queue that triggers the worker Lambda.
+    """
+
+    def __init__(self, queue_url: str):
+        try:
+            import boto3
+        except ImportError as e:
+            raise ValueError("The boto3 package must be installed to use the sqs job queue") from e
+
+        self.queue_url = queue_url
+        self._sqs = boto3.client("sqs")
+
+    async def enqueue(self, job_id: str) -> None:
+        await asyncio.to_thread(self._sqs.send_message, QueueUrl=self.queue_url, MessageBody=json.dumps({"job_id": job_id}))
+
+
+def create_job_queue(worker: JobWorker):
+    """
+    Create the job queue for the configured backend. `worker` runs jobs for the local queue.
+    """
+    logger.info(f"Using job queue backend: {JOB_QUEUE_BACKEND}")
+    if JOB_QUEUE_BACKEND == "local":
+        return InProcessJobQueue(worker=worker)
+    if JOB_QUEUE_BACKEND == "sqs":
+        if not JOB_QUEUE_URL:
+            raise ValueError("JOB_QUEUE_URL environment variable must be set to use the sqs job queue")
+        return SqsJobQueue(queue_url=JOB_QUEUE_URL)
+    raise ValueError(f"Unknown JOB_QUEUE_BACKEND: {JOB_QUEUE_BACKEND}")
@@ -0,0 +1,158 @@
+# -------------------------------------------------------------------------------- #
+# Job Store
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Built-in imports
+import asyncio
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any
+
+# Job Types
+from src.jobs.types import ArticleJob
+
+# Job Constants
+from src.jobs.constants import JOB_STORE_BACKEND, JOB_STORE_PATH, JOB_STORE_TABLE
+
+# Logger imports
+from src.utils.logger import logger
+
+
+# -------------------------------------------------------------------------------- #
+# Base Store
+# -------------------------------------------------------------------------------- #
+
+class JobStore(ABC):
+    """
+    Persists article jobs. Backends implement `get` and `_put`.
+
+    Each job is written by a single worker at a time, so updates read, modify and
+    write back the whole job document.
+    """
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[ArticleJob]:
+        """
+        Get a job by ID, or None if there is no such job.
+        """
+
+    @abstractmethod
+    async def _put(self, job: ArticleJob) -> None:
+        """
+        Write a whole job document, replacing any earlier version.
+        """
+
+    async def create(self, request: Dict[str, Any]) -> ArticleJob:
+        now = time.time()
+        job = ArticleJob(job_id=str(uuid.uuid4()), request=request, created_at=now, updated_at=now)
+        await self._put(job)
+        return job
+
+    async def update(self, job_id: str, **fields: Any) -> ArticleJob:
+        """
+        Set fields of a job, e.g. `status`, `result` or `error`.
+        """
+        job = await self.get(job_id)
+        if job is None:
+            raise KeyError(f"No such job: {job_id}")
+        job = job.model_copy(update={**fields, "updated_at": time.time()})
+        await self._put(job)
+        return job
+
+    async def record_step(self, job_id: str, step: str, duration: float) -> ArticleJob:
+        """
+        Record that a pipeline step of a job has finished.
+        """
+        job = await self.get(job_id)
+        if job is None:
+            raise KeyError(f"No such job: {job_id}")
+        return await self.update(job_id, steps={**job.steps, step: duration})
+
+
+# -------------------------------------------------------------------------------- #
+# SQLite Store
+# -------------------------------------------------------------------------------- #
+
+class SqliteJobStore(JobStore):
+    """
+    Local file-backed store, for running and testing job mode without AWS.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+                "document TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _get(self, job_id: str) -> Optional[ArticleJob]:
+        with self._connect() as connection:
+            row = connection.execute("SELECT document FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return ArticleJob.model_validate_json(row[0]) if row else None
+
+    def _write(self, job: ArticleJob) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status, document, updated_at) VALUES (?, ?, ?, ?)",
+                (job.job_id, job.status, job.model_dump_json(), job.updated_at),
+            )
+
+    async def get(self, job_id: str) -> Optional[ArticleJob]:
+        return await asyncio.to_thread(self._get, job_id)
+
+    async def _put(self, job: ArticleJob) -> None:
+        await asyncio.to_thread(self._write, job)
+
+
+# -------------------------------------------------------------------------------- #
+# DynamoDB Store
+# -------------------------------------------------------------------------------- #
+
+class DynamoDbJobStore(JobStore):
+    """
+    Shared store for deployed job mode, so the status endpoint sees the worker's progress.
+    """
+
+    def __init__(self, table_name: str):
+        try:
+            import boto3
+        except ImportError as e:
+            raise ValueError("The boto3 package must be installed to use the dynamodb job store") from e
+
+        self._table = boto3.resource("dynamodb").Table(table_name)
+
+    async def get(self, job_id: str) -> Optional[ArticleJob]:
+        response = await asyncio.to_thread(self._table.get_item, Key={"job_id": job_id})
+        item = response.get("Item")
+        return ArticleJob.model_validate_json(item["document"]) if item else None
+
+    async def _put(self, job: ArticleJob) -> None:
+        await asyncio.to_thread(self._table.put_item, Item={
+            "job_id": job.job_id,
+            "status": job.status,
+            "document": job.model_dump_json(),
+        })
+
+
+def create_job_store() -> JobStore:
+    """
+    Create the job store for the configured backend.
+    """
+    logger.info(f"Using job store backend: {JOB_STORE_BACKEND}")
+    if JOB_STORE_BACKEND == "sqlite":
+        return SqliteJobStore(path=JOB_STORE_PATH)
+    if JOB_STORE_BACKEND == "dynamodb":
+        if not JOB_STORE_TABLE:
+            raise ValueError("JOB_STORE_TABLE environment variable must be set to use the dynamodb job store")
+        return DynamoDbJobStore(table_name=JOB_STORE_TABLE)
+    raise ValueError(f"Unknown JOB_STORE_BACKEND: {JOB_STORE_BACKEND}")
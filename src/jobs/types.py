@@ -0,0 +1,43 @@
+# -------------------------------------------------------------------------------- #
+# Job Types
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Type imports
+from typing import Optional, Dict, Any
+
+# Pydantic imports
+from pydantic import BaseModel, Field
+
+
+# -------------------------------------------------------------------------------- #
+# Job Statuses
+# -------------------------------------------------------------------------------- #
+
+JOB_STATUS_QUEUED = "queued"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_SUCCEEDED = "succeeded"
+JOB_STATUS_FAILED = "failed"
+
+# Statuses a job never leaves
+JOB_FINISHED_STATUSES = {JOB_STATUS_SUCCEEDED, JOB_STATUS_FAILED}
+
+
+# -------------------------------------------------------------------------------- #
+# Job Types
+# -------------------------------------------------------------------------------- #
+
+
+class ArticleJob(BaseModel):
+    """Model for an article generation job and its progress."""
+    job_id: str = Field(description="The ID of the job")
+    status: str = Field(description="The status of the job", default=JOB_STATUS_QUEUED)
+    request: Dict[str, Any] = Field(description="The article request the job runs")
+    steps: Dict[str, float] = Field(description="Seconds spent on each finished pipeline step", default_factory=dict)
+    result: Optional[Dict[str, Any]] = Field(description="The response body once the job has finished", default=None)
+    error: Optional[str] = Field(description="The error message if the job failed", default=None)
+    created_at: float = Field(description="Unix time the job was submitted")
+    updated_at: float = Field(description="Unix time the job was last updated")
@@ -0,0 +1,376 @@
+# -------------------------------------------------------------------------------- #
+# OpenAI Batch Mode
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Built-in imports
+import argparse
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterator, Tuple
+
+# Types
+from src.api.types import HandlerApiRequest
+from src.llm.types import TitleExcerptResponse
+from src.cms.types import CmsCreateArticleRequest, CmsBulkArticleItem, CmsBulkArticleResult
+
+# CMS Calls
+from src.cms.calls import fetch_xml_blocks
+from src.cms.bulk import create_articles_in_cms
+
+# Checkpoint imports
+from src.jobs.checkpoints import idempotency_key
+
+# LLM Calls
+from src.llm.calls import get_openai_client, get_content_template_name, prepare_raw_content
+
+# Jinja imports
+from src.utils.jinja_utils import render_prompt_template_with_kwargs, get_xml_blocks_fragment
+
+# LLM Utils
+from src.utils.llm_utils import cached_o1_messages_format, cached_base_model_messages_format, prompt_cache_stats
+
+# LLM Constants
+from src.llm.constants import O1_MODEL, BASE_MODEL, LLM_BATCH_POLL_INTERVAL
+
+# Logger imports
+from src.utils.logger import logger
+
+
+# -------------------------------------------------------------------------------- #
+# Constants
+# -------------------------------------------------------------------------------- #
+
+CHAT_COMPLETIONS_ENDPOINT = "/v1/chat/completions"
+
+# Terminal batch statuses
+BATCH_FINISHED_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Checkpoint files inside the work directory
+STATE_FILE = "state.json"
+ARTICLES_FILE = "articles.jsonl"
+
+
+# -------------------------------------------------------------------------------- #
+# Helper Functions
+# -------------------------------------------------------------------------------- #
+
+def _read_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Yield each JSON object in a JSONL file.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _append_jsonl(path: Path, record: Dict[str, Any]) -> None:
+    """
+    Append a single JSON object to a JSONL file.
+    """
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def _title_excerpt_response_format() -> Dict[str, Any]:
+    """
+    Build the structured output `response_format` for the title and excerpt stage.
+    """
+    schema = TitleExcerptResponse.model_json_schema()
+    schema["additionalProperties"] = False
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": TitleExcerptResponse.__name__, "strict": True, "schema": schema},
+    }
+
+
+def _article_key(request: HandlerApiRequest, work_dir: Path) -> str:
+    """
+    Get the idempotency key of a request's article.
+
+    Unless the request sets or opts into one, the key is scoped to the job's work directory, so
+    a resumed run upserts its articles but a new job with the same requests creates new ones.
+    """
+    if request.idempotency_key:
+        return request.idempotency_key
+    payload = request.model_dump(exclude={"bypass_cache", "idempotency_key", "idempotent"})
+    if not request.idempotent:
+        payload["work_dir"] = str(work_dir.resolve())
+    return idempotency_key(payload)
+
+
+def _batch_request_line(custom_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a single line of a Batch API input file.
+    """
+    return {"custom_id": custom_id, "method": "POST", "url": CHAT_COMPLETIONS_ENDPOINT, "body": body}
+
+
+def _parse_batch_output(path: Path, stage: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Split a Batch API output file into message contents and errors, keyed by custom ID.
+
+    The prompt cache usage of every successful response is recorded under `stage`.
+    """
+    contents, errors = {}, {}
+    for line in _read_jsonl(path):
+        custom_id = line["custom_id"]
+        response = line.get("response") or {}
+        if line.get("error") or response.get("status_code") != 200:
+            errors[custom_id] = json.dumps(line.get("error") or response.get("body"))
+            continue
+        contents[custom_id] = response["body"]["choices"][0]["message"]["content"]
+        prompt_cache_stats.record(stage, response["body"].get("usage"))
+    return contents, errors
+
+
+# -------------------------------------------------------------------------------- #
+# Batch Job
+# -------------------------------------------------------------------------------- #
+
+class ArticleBatchJob:
+    """
+    Generate articles in bulk through the OpenAI Batch API.
+
+    The job runs three stages: the draft content batch, the title and excerpt batch, and
+    the CMS article creation. Every stage is checkpointed in `work_dir` (the JSONL input
+    and output files, the submitted batch IDs and the created article IDs), so re-running
+    the job with the same work directory resumes where it stopped.
+    """
+
+    def __init__(self, requests_path: str, work_dir: str, poll_interval: float = LLM_BATCH_POLL_INTERVAL):
+        self.requests_path = Path(requests_path)
+        self.work_dir = Path(work_dir)
+        self.poll_interval = poll_interval
+
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.requests: Dict[str, HandlerApiRequest] = {
+            str(index): HandlerApiRequest(**record) for index, record in enumerate(_read_jsonl(self.requests_path))
+        }
+        self.state: Dict[str, Any] = self._load_state()
+
+    # ---------------------------------------------------------------------------- #
+    # State
+    # ---------------------------------------------------------------------------- #
+
+    def _load_state(self) -> Dict[str, Any]:
+        state_path = self.work_dir / STATE_FILE
+        if state_path.exists():
+            logger.info(f"Resuming batch job from {state_path}")
+            return json.loads(state_path.read_text())
+        return {}
+
+    def _save_state(self) -> None:
+        (self.work_dir / STATE_FILE).write_text(json.dumps(self.state, indent=2))
+
+    # ---------------------------------------------------------------------------- #
+    # Batch API
+    # ---------------------------------------------------------------------------- #
+
+    async def _run_batch(self, stage: str, input_path: Path) -> Path:
+        """
+        Submit (or resume) the batch for a stage, wait for it, and download its output file.
+        """
+        output_path = self.work_dir / f"{stage}_batch_output.jsonl"
+        if output_path.exists():
+            logger.info(f"Batch output for stage {stage} already downloaded. Skipping.")
+            return output_path
+
+        # Submit the batch unless it was already submitted
+        stage_state = self.state.setdefault(stage, {})
+        client = get_openai_client()
+        if not stage_state.get("batch_id"):
+            input_file = await client.files.create(file=input_path, purpose="batch")
+            batch = await client.batches.create(input_file_id=input_file.id,
+                                                endpoint=CHAT_COMPLETIONS_ENDPOINT,
+                                                completion_window="24h")
+            stage_state.update({"input_file_id": input_file.id, "batch_id": batch.id})
+            self._save_state()
+            logger.info(f"Submitted batch {batch.id} for stage {stage}")
+
+        # Poll until the batch finishes
+        start_time = time.monotonic()
+        while True:
+            batch = await client.batches.retrieve(stage_state["batch_id"])
+            if batch.status in BATCH_FINISHED_STATUSES:
+                break
+            logger.info(f"Batch {batch.id} for stage {stage} is {batch.status}. Polling again in {self.poll_interval}s")
+            await asyncio.sleep(self.poll_interval)
+
+        stage_state["status"] = batch.status
+        self._save_state()
+        if batch.status != "completed" or not batch.output_file_id:
+            raise ValueError(f"Batch {batch.id} for stage {stage} finished with status: {batch.status}")
+        logger.info(f"Batch {batch.id} for stage {stage} completed. Took: {time.monotonic() - start_time:.2f}s")
+
+        # Stream the output file to disk, then rename so a partial download is never reused
+        partial_path = output_path.with_suffix(".partial")
+        async with client.files.with_streaming_response.content(batch.output_file_id) as response:
+            await response.stream_to_file(partial_path)
+        os.replace(partial_path, output_path)
+
+        return output_path
+
+    # ---------------------------------------------------------------------------- #
+    # Stages
+    # ---------------------------------------------------------------------------- #
+
+    async def _write_content_input(self) -> Path:
+        """
+        Render the draft prompt for every request into the content batch input file.
+        """
+        input_path = self.work_dir / "content_batch_input.jsonl"
+        if input_path.exists():
+            return input_path
+
+        # Fetch the XML blocks once per brand
+        brand_ids = sorted({request.brand_id for request in self.requests.values()})
+        xml_blocks_by_brand = dict(zip(brand_ids, await asyncio.gather(*[fetch_xml_blocks(brand_id) for brand_id in brand_ids])))
+
+        # Condense any raw content that is over the token budget
+        prepared = dict(zip(self.requests, await asyncio.gather(*[
+            prepare_raw_content(request.content, bypass_cache=request.bypass_cache) for request in self.requests.values()
+        ])))
+        logger.info(f"Input tokens avoided: {sum(item.input_tokens_avoided for item in prepared.values())}")
+
+        partial_path = input_path.with_suffix(".partial")
+        with open(partial_path, "w", encoding="utf-8") as f:
+            for custom_id, request in self.requests.items():
+                developer_prompt = render_prompt_template_with_kwargs(
+                    template_name=get_content_template_name(request.category_slug),
+                    raw_content=prepared[custom_id].content,
+                    custom_xml_tags=get_xml_blocks_fragment(request.brand_id, xml_blocks_by_brand[request.brand_id]),
+                )
+                body = {"model": O1_MODEL,
+                        "messages": cached_o1_messages_format((request.category_slug, request.brand_id), developer_prompt)}
+                f.write(json.dumps(_batch_request_line(custom_id, body)) + "\n")
+        os.replace(partial_path, input_path)
+
+        logger.info(f"Wrote {len(self.requests)} requests to {input_path}")
+        return input_path
+
+    def _write_title_input(self, contents: Dict[str, str]) -> Path:
+        """
+        Render the title and excerpt prompt for every generated draft into the title batch input file.
+        """
+        input_path = self.work_dir / "title_batch_input.jsonl"
+        if input_path.exists():
+            return input_path
+
+        developer_prompt = render_prompt_template_with_kwargs(template_name="title-and-expert-developer.jinja")
+        response_format = _title_excerpt_response_format()
+
+        partial_path = input_path.with_suffix(".partial")
+        with open(partial_path, "w", encoding="utf-8") as f:
+            for custom_id, content in contents.items():
+                execution_prompt = render_prompt_template_with_kwargs(template_name="title-and-expert-execution.jinja",
+                                                                      content=content)
+                body = {
+                    "model": BASE_MODEL,
+                    "messages": cached_base_model_messages_format("title-and-excerpt", developer_prompt, execution_prompt),
+                    "response_format": response_format,
+                }
+                f.write(json.dumps(_batch_request_line(custom_id, body)) + "\n")
+        os.replace(partial_path, input_path)
+
+        logger.info(f"Wrote {len(contents)} requests to {input_path}")
+        return input_path
+
+    async def _create_articles(self, contents: Dict[str, str],
+                               titles: Dict[str, TitleExcerptResponse]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Create an article in the CMS for every item with a draft and a title, skipping items already created.
+
+        Articles go through the bulk writer with each request's idempotency key, and each one is
+        checkpointed as soon as it is written. A resumed run skips the recorded articles and
+        upserts any written but not yet recorded, instead of duplicating them.
+        """
+        articles_path = self.work_dir / ARTICLES_FILE
+        article_ids = {record["custom_id"]: record["article_id"] for record in _read_jsonl(articles_path)} if articles_path.exists() else {}
+
+        pending = [custom_id for custom_id in titles if custom_id not in article_ids]
+        items = (
+            CmsBulkArticleItem(
+                request=CmsCreateArticleRequest(
+                    title=titles[custom_id].title,
+                    excerpt=titles[custom_id].excerpt,
+                    content=contents[custom_id],
+                    brandId=self.requests[custom_id].brand_id,
+                    tagIds=[self.requests[custom_id].category_id],
+                ),
+                dedup_key=_article_key(self.requests[custom_id], self.work_dir),
+            )
+            for custom_id in pending
+        )
+
+        # Checkpoint each article as soon as it exists so a resume skips it
+        def record(result: CmsBulkArticleResult) -> None:
+            if result.article_id is not None:
+                custom_id = pending[result.index]
+                article_ids[custom_id] = result.article_id
+                _append_jsonl(articles_path, {"custom_id": custom_id, "article_id": result.article_id,
+                                              "idempotency_key": result.dedup_key})
+
+        results = await create_articles_in_cms(items, on_result=record)
+
+        errors = {}
+        for custom_id, result in zip(pending, results):
+            if result.article_id is None:
+                logger.error(f"Failed to create article for item {custom_id}. Error: {result.message}")
+                errors[custom_id] = result.message or f"Article create failed with status {result.status_code}"
+
+        return article_ids, errors
+
+    # ---------------------------------------------------------------------------- #
+    # Run
+    # ---------------------------------------------------------------------------- #
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run (or resume) every stage and return the created article IDs and per-item errors.
+        """
+        start_time = time.monotonic()
+
+        # Stage One: Draft content
+        content_output = await self._run_batch("content", await self._write_content_input())
+        contents, errors = _parse_batch_output(content_output, "content")
+        errors.update({custom_id: "Missing from content batch output" for custom_id in self.requests
+                       if custom_id not in contents and custom_id not in errors})
+
+        # Stage Two: Title and excerpt
+        title_output = await self._run_batch("title", self._write_title_input(contents))
+        raw_titles, title_errors = _parse_batch_output(title_output, "title_and_excerpt")
+        errors.update(title_errors)
+        errors.update({custom_id: "Missing from title batch output" for custom_id in contents
+                       if custom_id not in raw_titles and custom_id not in errors})
+        titles = {custom_id: TitleExcerptResponse.model_validate_json(raw) for custom_id, raw in raw_titles.items()}
+
+        # Stage Three: Create the articles in the CMS
+        article_ids, create_errors = await self._create_articles(contents, titles)
+        errors.update(create_errors)
+
+        logger.info(f"Batch job finished. Created: {len(article_ids)}. Failed: {len(errors)}. "
+                    f"Took: {time.monotonic() - start_time:.2f}s")
+        return {"article_ids": article_ids, "errors": errors}
+
+
+# -------------------------------------------------------------------------------- #
+# CLI
+# -------------------------------------------------------------------------------- #
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate articles in bulk through the OpenAI Batch API.")
+    parser.add_argument("requests_path", help="JSONL file with one HandlerApiRequest per line")
+    parser.add_argument("work_dir", help="Directory for the batch checkpoints. Re-use it to resume a job.")
+    parser.add_argument("--poll-interval", type=float, default=LLM_BATCH_POLL_INTERVAL)
+    args = parser.parse_args()
+
+    result = asyncio.run(ArticleBatchJob(args.requests_path, args.work_dir, poll_interval=args.poll_interval).run())
+    print(json.dumps(result, indent=2))
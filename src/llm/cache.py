@@ -0,0 +1,266 @@
+# -------------------------------------------------------------------------------- #
+# LLM Response Cache
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Built-in imports
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
+
+# Pydantic imports
+from pydantic import BaseModel
+
+# LLM Constants
+from src.llm.constants import (
+    LLM_CACHE_BACKEND,
+    LLM_CACHE_TTL,
+    LLM_CACHE_MAX_BYTES,
+    LLM_CACHE_DIR,
+    LLM_CACHE_REDIS_URL,
+)
+
+# Logger imports
+from src.utils.logger import logger
+
+
+# -------------------------------------------------------------------------------- #
+# Cache Keys
+# -------------------------------------------------------------------------------- #
+
+def response_cache_key(model: str,
+                       messages: List[Dict[str, Any]],
+                       response_format: Optional[type[BaseModel]] = None) -> str:
+    """
+    Hash the model, rendered messages and response format into a content address.
+    """
+    payload = {
+        "model": model,
+        "messages": messages,
+        "response_format": response_format.model_json_schema() if response_format else None,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+# -------------------------------------------------------------------------------- #
+# Backends
+# -------------------------------------------------------------------------------- #
+
+class MemoryCacheBackend:
+    """
+    In-process LRU backend bounded by the total size of the cached values.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._size = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.time():
+            await self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.delete(key)
+        if len(value) > self.max_bytes:
+            return
+        self._entries[key] = (time.time() + ttl, value)
+        self._size += len(value)
+        while self._size > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    async def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+
+class DiskCacheBackend:
+    """
+    Local disk backend (e.g. under /tmp, which survives across warm Lambda invocations).
+
+    Each value is stored in its own file, prefixed by its expiry time. The least recently
+    written files are evicted once the directory exceeds `max_bytes`.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        # Track sizes in memory, seeded from whatever a previous invocation left behind
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        entries = sorted(os.scandir(directory), key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            self._sizes[entry.name] = entry.stat().st_size
+        self._size = sum(self._sizes.values())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                expires_at, _, value = f.read().partition(b"\n")
+        except FileNotFoundError:
+            return None
+        if float(expires_at) < time.time():
+            await self.delete(key)
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        data = f"{time.time() + ttl}\n".encode() + value
+        if len(data) > self.max_bytes:
+            return
+
+        # Write to a temporary file, then rename, so readers never see a partial value
+        temporary_path = f"{self._path(key)}.tmp"
+        with open(temporary_path, "wb") as f:
+            f.write(data)
+        os.replace(temporary_path, self._path(key))
+
+        self._size += len(data) - self._sizes.pop(key, 0)
+        self._sizes[key] = len(data)
+        while self._size > self.max_bytes:
+            evicted_key, evicted_size = self._sizes.popitem(last=False)
+            self._size -= evicted_size
+            self._remove(evicted_key)
+
+    async def delete(self, key: str) -> None:
+        self._size -= self._sizes.pop(key, 0)
+        self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class RedisCacheBackend:
+    """
+    Shared key-value backend, so every container sees every cached response.
+
+    Size-based eviction is left to the server's `maxmemory` policy.
+    """
+
+    def __init__(self, url: str, prefix: str = "llm-response:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise ValueError("The redis package must be installed to use the redis LLM cache backend") from e
+
+        self.prefix = prefix
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._redis.set(self.prefix + key, value, ex=max(1, int(ttl)))
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(self.prefix + key)
+
+
+# -------------------------------------------------------------------------------- #
+# Cache
+# -------------------------------------------------------------------------------- #
+
+class LlmResponseCache:
+    """
+    Content-addressed cache of LLM responses with hit rate and bytes-saved accounting.
+
+    Backend errors are logged and treated as misses, so the cache can never fail a call.
+    """
+
+    def __init__(self, backend: Optional[Any], ttl: float = LLM_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"LLM response cache read failed. Error: {e}")
+            value = None
+
+        if value is None:
+            self.misses += 1
+            self._log("miss", key)
+            return None
+
+        self.hits += 1
+        self.bytes_saved += len(value)
+        self._log("hit", key)
+        return value.decode("utf-8")
+
+    async def set(self, key: str, value: str) -> None:
+        if not self.enabled:
+            return
+
+        try:
+            await self.backend.set(key, value.encode("utf-8"), self.ttl)
+        except Exception as e:
+            logger.warning(f"LLM response cache write failed. Error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def _log(self, outcome: str, key: str) -> None:
+        stats = self.stats()
+        logger.info(f"LLM response cache {outcome} for key {key[:12]}. "
+                    f"Hit rate: {stats['hit_rate']:.0%}. Bytes saved: {stats['bytes_saved']}.")
+
+
+def create_llm_response_cache() -> LlmResponseCache:
+    """
+    Create the response cache for the configured backend.
+    """
+    backend = None
+    if LLM_CACHE_BACKEND == "memory":
+        backend = MemoryCacheBackend(max_bytes=LLM_CACHE_MAX_BYTES)
+    elif LLM_CACHE_BACKEND == "disk":
+        backend = DiskCacheBackend(directory=LLM_CACHE_DIR, max_bytes=LLM_CACHE_MAX_BYTES)
+    elif LLM_CACHE_BACKEND == "redis":
+        if not LLM_CACHE_REDIS_URL:
+            raise ValueError("LLM_CACHE_REDIS_URL environment variable must be set to use the redis LLM cache backend")
+        backend = RedisCacheBackend(url=LLM_CACHE_REDIS_URL)
+    elif LLM_CACHE_BACKEND != "none":
+        raise ValueError(f"Unknown LLM_CACHE_BACKEND: {LLM_CACHE_BACKEND}")
+
+    logger.info(f"Using LLM response cache backend: {LLM_CACHE_BACKEND}")
+    return LlmResponseCache(backend=backend)
@@ -7,11 +7,15 @@
 # -------------------------------------------------------------------------------- #
 
 # Built-in imports
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Callable, Sequence, TYPE_CHECKING
+import asyncio
+import json
+import logging
 import time
 
-# OpenAI imports
-from openai import OpenAI, AsyncOpenAI
+# OpenAI imports (deferred until the first call, since the SDK is slow to import)
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
 # Pydantic imports
 from pydantic import BaseModel
@@ -21,63 +25,366 @@ from pydantic import BaseModel
 from src.utils.jinja_utils import render_prompt_template_with_kwargs
 
 # Types
-from src.llm.types import TitleExcerptResponse
+from src.llm.types import TitleExcerptResponse, PreparedRawContent
+from src.cms.types import CmsXmlBlock
+
+# Draft Validation
+from src.llm.validation import (
+    FATAL_ISSUES,
+    DraftValidationError,
+    MdxDraftValidator,
+    build_xml_block_index,
+    get_xml_block_index,
+    validate_draft,
+)
 
 # LLM Utils
-from src.utils.llm_utils import o1_messages_format, base_model_messages_format
+from src.utils.llm_utils import (
+    cached_o1_messages_format,
+    cached_base_model_messages_format,
+    prompt_cache_stats,
+    split_into_chunks,
+    MdxSectionPrefixTracker,
+)
 
 # LLM Constants
-from src.llm.constants import O1_MODEL, BASE_MODEL
+from src.llm.constants import (
+    O1_MODEL,
+    BASE_MODEL,
+    LLM_STREAM_CONTENT,
+    LLM_TITLE_PREFIX_SECTIONS,
+    O1_EXPECTED_OUTPUT_TOKENS,
+    BASE_EXPECTED_OUTPUT_TOKENS,
+    LLM_CONTENT_TOKEN_BUDGET,
+    LLM_CHUNK_TOKENS,
+    LLM_CHUNK_CONCURRENCY,
+    LLM_VARIANT_MODE,
+    LLM_VALIDATE_DRAFTS,
+    LLM_DRAFT_MAX_REGENERATIONS,
+)
+
+# Rate Limiter
+from src.llm.rate_limiter import RateLimiter, estimate_message_tokens
+
+# Response Cache
+from src.llm.cache import create_llm_response_cache, response_cache_key
+
+# Token Counting
+from src.llm.tokens import count_tokens, count_tokens_for_budget
 
 # Logger imports
-from src.utils.logger import logger
+from src.utils.logger import logger, LogPayload
+
+# Tracing
+from src.utils.tracing import traced, current_span
 
 # -------------------------------------------------------------------------------- #
 # Client
 # -------------------------------------------------------------------------------- #
 
-# TODO: Make this a singleton
-client = AsyncOpenAI()
+# Adaptive per-model rate limiter, fed by the rate limit headers of every response
+rate_limiter = RateLimiter()
+
+# OpenAI clients, created on first use
+_client: Optional["AsyncOpenAI"] = None
+_generation_client: Optional["AsyncOpenAI"] = None
+
+# Set once the OpenAI client has been warmed up in this container
+_llm_client_warmed = False
+
+# Content-addressed cache of generation responses
+response_cache = create_llm_response_cache()
+
+
+def get_openai_client() -> "AsyncOpenAI":
+    """
+    Get the shared OpenAI client, importing the SDK and creating the client on first use.
+    """
+    global _client
+    if _client is None:
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+        _client = AsyncOpenAI(http_client=DefaultAsyncHttpxClient(event_hooks={"response": [rate_limiter.on_response]}))
+    return _client
+
+
+def get_generation_client() -> "AsyncOpenAI":
+    """
+    Get the client for generation calls, which retry through the rate limiter instead of the SDK.
+    """
+    global _generation_client
+    if _generation_client is None:
+        _generation_client = get_openai_client().with_options(max_retries=0)
+    return _generation_client
+
+
+# -------------------------------------------------------------------------------- #
+# Helpers
+# -------------------------------------------------------------------------------- #
+
+def get_content_template_name(category_slug: str) -> str:
+    """
+    Get the name of the content generation template for a category.
+    """
+    return f"{category_slug}-template.jinja"
+
+
+async def warm_up_llm_client() -> None:
+    """
+    Open a pooled connection to the OpenAI API ahead of the first completion call, once per container.
+
+    Failures are logged and ignored, since the completion call will simply connect itself.
+    """
+    global _llm_client_warmed
+    if _llm_client_warmed:
+        return
+    _llm_client_warmed = True
+
+    start_time = time.monotonic()
+    try:
+        await get_openai_client().with_options(timeout=5, max_retries=0).models.retrieve(O1_MODEL)
+        logger.info(f"Warmed up OpenAI client. Took: {time.monotonic() - start_time:.2f}s")
+    except Exception as e:
+        logger.warning(f"Failed to warm up OpenAI client. Error: {e}")
 
 
 # -------------------------------------------------------------------------------- #
 # o1 Call
 # -------------------------------------------------------------------------------- #
 
-async def call_content_generation_agent(category_slug: str, developer_prompt_kwargs: Dict[str, Any]) -> str:
+@traced("llm.content")
+async def call_content_generation_agent(category_slug: str,
+                                        developer_prompt_kwargs: Dict[str, Any],
+                                        stream: bool = LLM_STREAM_CONTENT,
+                                        on_prefix: Optional[Callable[[str], None]] = None,
+                                        prefix_sections: int = LLM_TITLE_PREFIX_SECTIONS,
+                                        bypass_cache: bool = False,
+                                        brand_id: Optional[str] = None,
+                                        xml_blocks: Optional[Sequence[CmsXmlBlock]] = None,
+                                        on_regenerate: Optional[Callable[[], None]] = None) -> str:
     """
     Call the LLM to generate a v1 draft of given source content.
+
+    When streaming, `on_prefix` is called once with the draft's first `prefix_sections`
+    sections as soon as they have streamed, while the rest of the draft is still generating.
+    Responses are cached by prompt unless `bypass_cache` is set. The static prompt prefix is
+    sent as its own text part, and a change to it per (category, brand) is logged.
+
+    When the brand's `xml_blocks` are given, the draft is validated against them as it is
+    generated. A streamed draft is aborted at its first fatal issue, and invalid drafts are
+    regenerated up to `LLM_DRAFT_MAX_REGENERATIONS` times before `DraftValidationError` is raised.
+    `on_regenerate` is called before each regeneration, to discard work started from the rejected
+    draft, like a title call on its prefix.
     """
 
-    template_name = f"{category_slug}-template.jinja"
+    template_name = get_content_template_name(category_slug)
 
     # Get the start time
     start_time = time.monotonic()
-    logger.debug(f"Calling content generation agent with template name: {template_name} and kwargs: {developer_prompt_kwargs}")
+    logger.debug("Calling content generation agent with template name: %s and kwargs: %s",
+                 template_name, LogPayload(developer_prompt_kwargs))
 
     # Render the developer prompt
     developer_prompt = render_prompt_template_with_kwargs(template_name=template_name,
                                                           **developer_prompt_kwargs)
 
-    # Format the messages
-    messages = o1_messages_format(developer_prompt)
+    # Format the messages, keeping the static prefix stable per category and brand
+    messages = cached_o1_messages_format((category_slug, brand_id), developer_prompt)
+
+    # Serve identical prompts from the cache
+    cache_key = response_cache_key(O1_MODEL, messages)
+    if not bypass_cache:
+        cached_content = await response_cache.get(cache_key)
+        if cached_content is not None:
+            current_span().add("cache_hit", 1)
+            return cached_content
 
     # Log initial call with model name
     logger.info(f"Calling {O1_MODEL} now to generate draft article content...")
 
-    # Call the LLM
-    response = await client.chat.completions.create(
-        model=O1_MODEL,
-        messages=messages
-    )
-
-    logger.debug(f"The response is: {response.choices[0].message.content}")
+    # Tag lookup for validating the draft, precomputed per brand
+    xml_block_index = None
+    if LLM_VALIDATE_DRAFTS and xml_blocks is not None:
+        xml_block_index = get_xml_block_index(brand_id, xml_blocks) if brand_id else build_xml_block_index(xml_blocks)
+
+    regenerations = 0
+    while True:
+        validator = MdxDraftValidator(xml_block_index) if xml_block_index is not None else None
+        try:
+            if stream:
+                content = await _stream_content_generation(messages, start_time, on_prefix, prefix_sections, validator)
+            else:
+                # Call the LLM
+                response = await rate_limiter.run(
+                    O1_MODEL,
+                    estimate_message_tokens(messages) + O1_EXPECTED_OUTPUT_TOKENS,
+                    lambda: get_generation_client().chat.completions.create(
+                        model=O1_MODEL,
+                        messages=messages
+                    ),
+                )
+                prompt_cache_stats.record("content", response.usage)
+                content = response.choices[0].message.content
+                if validator is not None:
+                    validator.feed(content)
+
+            if validator is not None:
+                validator.finish()
+                if validator.error is not None:
+                    raise DraftValidationError([issue for issue in validator.issues if issue.kind in FATAL_ISSUES])
+            break
+        except DraftValidationError as e:
+            if regenerations >= LLM_DRAFT_MAX_REGENERATIONS:
+                logger.error("%s. Giving up after %d regenerations.", e, regenerations)
+                raise
+            regenerations += 1
+            current_span().add("regenerations", 1)
+            logger.warning("%s. Regenerating draft %d/%d.", e, regenerations, LLM_DRAFT_MAX_REGENERATIONS)
+            if on_regenerate is not None:
+                on_regenerate()
+
+    logger.debug("The response is: %s", LogPayload(content))
 
     # Get the call latency
     latency = time.monotonic() - start_time
     # Log finish call with latency
     logger.info(f"Finished calling {O1_MODEL} model. Took: {latency:.2f}s to generate draft article content from source.")
-    return response.choices[0].message.content
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Rate limiter state for %s: %s", O1_MODEL, rate_limiter.for_model(O1_MODEL).metrics())
+    current_span().add("bytes", len(content))
+
+    await response_cache.set(cache_key, content)
+    return content
+
+
+@traced("llm.content_candidates")
+async def call_content_generation_candidates(category_slug: str,
+                                             developer_prompt_kwargs: Dict[str, Any],
+                                             count: int,
+                                             mode: str = LLM_VARIANT_MODE,
+                                             bypass_cache: bool = False,
+                                             brand_id: Optional[str] = None,
+                                             xml_blocks: Optional[Sequence[CmsXmlBlock]] = None) -> List[str]:
+    """
+    Call the LLM to generate `count` candidate v1 drafts of given source content concurrently.
+
+    In `n` mode the candidates are the choices of a single completion, so the prompt is only
+    sent and billed once. In `parallel` mode each candidate is its own call. The candidates are
+    cached together by prompt and count unless `bypass_cache` is set.
+
+    When the brand's `xml_blocks` are given, candidates with fatal validation issues are dropped,
+    so the result may hold fewer than `count` drafts, or none.
+    """
+    template_name = get_content_template_name(category_slug)
+    start_time = time.monotonic()
+    developer_prompt = render_prompt_template_with_kwargs(template_name=template_name, **developer_prompt_kwargs)
+    messages = cached_o1_messages_format((category_slug, brand_id), developer_prompt)
+
+    cache_key = response_cache_key(O1_MODEL, messages) + f":candidates={count}"
+    if not bypass_cache:
+        cached_candidates = await response_cache.get(cache_key)
+        if cached_candidates is not None:
+            current_span().add("cache_hit", 1)
+            return json.loads(cached_candidates)
+
+    # o1 models reject `n` > 1
+    if mode == "n" and O1_MODEL.startswith("o1"):
+        logger.warning(f"{O1_MODEL} does not accept n > 1. Generating candidate drafts in parallel instead.")
+        mode = "parallel"
+
+    logger.info(f"Calling {O1_MODEL} now to generate {count} candidate drafts ({mode})...")
+    estimated_prompt_tokens = estimate_message_tokens(messages)
+
+    if mode == "n":
+        response = await rate_limiter.run(
+            O1_MODEL,
+            estimated_prompt_tokens + O1_EXPECTED_OUTPUT_TOKENS * count,
+            lambda: get_generation_client().chat.completions.create(model=O1_MODEL, messages=messages, n=count),
+        )
+        prompt_cache_stats.record("content", response.usage)
+        candidates = [choice.message.content for choice in sorted(response.choices, key=lambda choice: choice.index)]
+    else:
+        async def generate_candidate() -> str:
+            response = await rate_limiter.run(
+                O1_MODEL,
+                estimated_prompt_tokens + O1_EXPECTED_OUTPUT_TOKENS,
+                lambda: get_generation_client().chat.completions.create(model=O1_MODEL, messages=messages),
+            )
+            prompt_cache_stats.record("content", response.usage)
+            return response.choices[0].message.content
+
+        candidates = list(await asyncio.gather(*[generate_candidate() for _ in range(count)]))
+
+    logger.info(f"Finished calling {O1_MODEL} model. Took: {time.monotonic() - start_time:.2f}s to generate {count} candidate drafts.")
+    current_span().add("bytes", sum(len(candidate) for candidate in candidates))
+
+    # Drop the candidates the single draft path would have rejected
+    if LLM_VALIDATE_DRAFTS and xml_blocks is not None:
+        xml_block_index = get_xml_block_index(brand_id, xml_blocks) if brand_id else build_xml_block_index(xml_blocks)
+        valid_candidates = [candidate for candidate in candidates
+                            if validate_draft(candidate, xml_block_index).error is None]
+        if len(valid_candidates) < len(candidates):
+            current_span().add("invalid_candidates", len(candidates) - len(valid_candidates))
+            logger.warning(f"Dropped {len(candidates) - len(valid_candidates)} of {len(candidates)} candidate drafts "
+                           f"with fatal validation issues.")
+        candidates = valid_candidates
+
+    if candidates:
+        await response_cache.set(cache_key, json.dumps(candidates))
+    return candidates
+
+
+async def _stream_content_generation(messages: List[Dict[str, Any]],
+                                     start_time: float,
+                                     on_prefix: Optional[Callable[[str], None]],
+                                     prefix_sections: int,
+                                     validator: Optional[MdxDraftValidator] = None) -> str:
+    """
+    Stream the content generation call into an incremental buffer.
+
+    With a validator, the stream is closed and `DraftValidationError` raised at the first fatal issue.
+    """
+    tracker = MdxSectionPrefixTracker(sections=prefix_sections if on_prefix else 0)
+    first_token_time: Optional[float] = None
+
+    response_stream = await rate_limiter.run(
+        O1_MODEL,
+        estimate_message_tokens(messages) + O1_EXPECTED_OUTPUT_TOKENS,
+        lambda: get_generation_client().chat.completions.create(
+            model=O1_MODEL,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+        ),
+    )
+
+    async for chunk in response_stream:
+        # The final chunk carries the usage and no choices
+        if chunk.usage:
+            prompt_cache_stats.record("content", chunk.usage)
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+
+        # Time to first token
+        if first_token_time is None:
+            first_token_time = time.monotonic()
+            logger.info(f"First token from {O1_MODEL} after {first_token_time - start_time:.2f}s")
+
+        # Stop generating a draft that is already invalid
+        prefix = tracker.feed(delta)
+        if validator is not None and validator.feed(delta) is not None:
+            await response_stream.close()
+            logger.warning(f"Aborted draft after {time.monotonic() - start_time:.2f}s at line {validator.error.line}")
+            raise DraftValidationError([validator.error])
+
+        # Hand off the prefix as soon as the first sections are complete
+        if prefix is not None:
+            logger.info(f"Draft prefix with {prefix_sections} sections ready after {time.monotonic() - start_time:.2f}s")
+            on_prefix(prefix)
+
+    return tracker.text()
 
 
 # -------------------------------------------------------------------------------- #
@@ -85,7 +392,8 @@ async def call_content_generation_agent(category_slug: str, developer_prompt_kwa
 # -------------------------------------------------------------------------------- #
 
 
-async def call_title_and_excerpt_generation_agent(content: str) -> TitleExcerptResponse:
+@traced("llm.title_and_excerpt")
+async def call_title_and_excerpt_generation_agent(content: str, bypass_cache: bool = False) -> TitleExcerptResponse:
     """
     Call the LLM to generate a title and excerpt from the given content source.
     """
@@ -93,7 +401,6 @@ async def call_title_and_excerpt_generation_agent(content: str) -> TitleExcerptR
     # Get the start time
     start_time = time.monotonic()
 
-
     # TODO: Improve this
     developer_prompt_name = "title-and-expert-developer.jinja"
     execution_prompt_name = "title-and-expert-execution.jinja"
@@ -105,23 +412,121 @@ async def call_title_and_excerpt_generation_agent(content: str) -> TitleExcerptR
     execution_prompt = render_prompt_template_with_kwargs(template_name=execution_prompt_name,
                                                           content=content)
 
-    # Format the messages
-    messages = base_model_messages_format(developer_prompt, execution_prompt)
+    # Format the messages, keeping the constant system prompt as the static prefix
+    messages = cached_base_model_messages_format("title-and-excerpt", developer_prompt, execution_prompt)
+
+    # Serve identical prompts from the cache
+    cache_key = response_cache_key(BASE_MODEL, messages, response_format=TitleExcerptResponse)
+    if not bypass_cache:
+        cached_response = await response_cache.get(cache_key)
+        if cached_response is not None:
+            current_span().add("cache_hit", 1)
+            return TitleExcerptResponse.model_validate_json(cached_response)
 
     # Log initial call with model name
     logger.info(f"Calling {BASE_MODEL} now to generate an article title and excerpt...")
 
-    # Start the timer
-    start_time = time.monotonic()
-
     # Call the LLM
-    response = await client.beta.chat.completions.parse(
-        model=BASE_MODEL, response_format=TitleExcerptResponse, messages=messages)
+    response = await rate_limiter.run(
+        BASE_MODEL,
+        estimate_message_tokens(messages) + BASE_EXPECTED_OUTPUT_TOKENS,
+        lambda: get_generation_client().beta.chat.completions.parse(
+            model=BASE_MODEL, response_format=TitleExcerptResponse, messages=messages),
+    )
+    prompt_cache_stats.record("title_and_excerpt", response.usage)
     
-    logger.debug(f"The response is: {response.choices[0].message.parsed}")
+    logger.debug("The response is: %s", LogPayload(response.choices[0].message.parsed))
 
     # Get the call latency
     latency = time.monotonic() - start_time
     # Log finish call with latency
     logger.info(f"Finished calling {BASE_MODEL} model. Took: {latency:.2f}s to generate an article title and excerpt.")
-    return response.choices[0].message.parsed
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Rate limiter state for %s: %s", BASE_MODEL, rate_limiter.for_model(BASE_MODEL).metrics())
+
+    title_and_excerpt = response.choices[0].message.parsed
+    await response_cache.set(cache_key, title_and_excerpt.model_dump_json())
+    return title_and_excerpt
+
+
+# -------------------------------------------------------------------------------- #
+# Raw Content Budgeting
+# -------------------------------------------------------------------------------- #
+
+
+@traced("llm.raw_content_chunk")
+async def call_chunk_summary_agent(chunk: str, index: int, total: int, bypass_cache: bool = False) -> str:
+    """
+    Call the LLM to condense one chunk of oversized raw content into notes.
+    """
+
+    # Render the prompts
+    developer_prompt = render_prompt_template_with_kwargs(template_name="raw-content-chunk-developer.jinja")
+    execution_prompt = render_prompt_template_with_kwargs(template_name="raw-content-chunk-execution.jinja",
+                                                          content=chunk, index=index + 1, total=total)
+
+    # Format the messages, keeping the constant system prompt as the static prefix
+    messages = cached_base_model_messages_format("raw-content-chunk", developer_prompt, execution_prompt)
+
+    # Serve identical prompts from the cache
+    cache_key = response_cache_key(BASE_MODEL, messages)
+    if not bypass_cache:
+        cached_notes = await response_cache.get(cache_key)
+        if cached_notes is not None:
+            current_span().add("cache_hit", 1)
+            return cached_notes
+
+    response = await rate_limiter.run(
+        BASE_MODEL,
+        estimate_message_tokens(messages) + LLM_CHUNK_TOKENS // 4,
+        lambda: get_generation_client().chat.completions.create(model=BASE_MODEL, messages=messages),
+    )
+    prompt_cache_stats.record("raw_content_chunk", response.usage)
+
+    notes = response.choices[0].message.content
+    await response_cache.set(cache_key, notes)
+    return notes
+
+
+async def prepare_raw_content(content: str,
+                              budget: int = LLM_CONTENT_TOKEN_BUDGET,
+                              bypass_cache: bool = False) -> PreparedRawContent:
+    """
+    Check raw content against the token budget, condensing it with a map-reduce pass when it is over.
+
+    The content is split along its paragraph and heading structure, every chunk is summarized
+    concurrently on the base model, and the notes are joined in order in place of the content.
+    """
+    source_tokens = count_tokens_for_budget(content, O1_MODEL, budget)
+    if source_tokens <= budget:
+        return PreparedRawContent(content=content, source_tokens=source_tokens, prompt_tokens=source_tokens)
+
+    # Get the start time
+    start_time = time.monotonic()
+
+    chunks = split_into_chunks(content, LLM_CHUNK_TOKENS, lambda text: count_tokens(text, BASE_MODEL))
+    logger.info(f"Raw content has {source_tokens} tokens, over the budget of {budget}. "
+                f"Condensing it in {len(chunks)} chunks with {BASE_MODEL}...")
+
+    # Map: summarize the chunks concurrently
+    semaphore = asyncio.Semaphore(LLM_CHUNK_CONCURRENCY)
+
+    async def summarize(index: int, chunk: str) -> str:
+        async with semaphore:
+            return await call_chunk_summary_agent(chunk, index, len(chunks), bypass_cache=bypass_cache)
+
+    notes = await asyncio.gather(*[summarize(index, chunk) for index, chunk in enumerate(chunks)])
+
+    # Reduce: join the notes in source order
+    condensed = "\n\n".join(note.strip() for note in notes)
+    prepared = PreparedRawContent(content=condensed,
+                                  source_tokens=source_tokens,
+                                  prompt_tokens=count_tokens(condensed, O1_MODEL),
+                                  chunks=len(chunks))
+
+    logger.info(f"Condensed raw content from {prepared.source_tokens} to {prepared.prompt_tokens} tokens. "
+                f"Input tokens avoided: {prepared.input_tokens_avoided}. Took: {time.monotonic() - start_time:.2f}s")
+    if prepared.prompt_tokens > budget:
+        logger.warning(f"Condensed raw content is still over the budget of {budget} tokens")
+
+    return prepared
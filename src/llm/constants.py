@@ -2,6 +2,11 @@
 # Model Constants
 # -------------------------------------------------------------------------------- #
 
+import os
+from src.utils.env_utils import load_environment
+
+load_environment()
+
 
 # Reasoning Models
 # -------------------------------------------------------------------------------- #
@@ -12,3 +17,117 @@ O1_MODEL = "o1-preview-2024-09-12"
 # -------------------------------------------------------------------------------- #
 
 BASE_MODEL = "gpt-4o-2024-11-20"
+
+
+# Streaming
+# -------------------------------------------------------------------------------- #
+
+# Stream the content generation call instead of waiting for the whole completion
+LLM_STREAM_CONTENT = os.getenv("LLM_STREAM_CONTENT", "false").lower() == "true"
+
+# When streaming, start the title/excerpt call once this many sections have streamed (0 = wait for the full draft)
+LLM_TITLE_PREFIX_SECTIONS = int(os.getenv("LLM_TITLE_PREFIX_SECTIONS", "0"))
+
+
+# Variants
+# -------------------------------------------------------------------------------- #
+
+# Candidate drafts generated for the variant categories, of which the best scoring one is kept (1 = a single draft)
+LLM_VARIANT_COUNT = int(os.getenv("LLM_VARIANT_COUNT", "1"))
+
+# Comma-separated category slugs that get candidate drafts, e.g. the flagship categories
+LLM_VARIANT_CATEGORIES = frozenset(slug for slug in os.getenv("LLM_VARIANT_CATEGORIES", "").split(",") if slug)
+
+# `parallel` makes one call per candidate. `n` requests every candidate in one completion, so the prompt is only
+# billed once, on models that accept `n` > 1 (o1 models do not, and fall back to `parallel`).
+LLM_VARIANT_MODE = os.getenv("LLM_VARIANT_MODE", "parallel").lower()
+
+# Word count range the content templates ask for, used to score candidate drafts
+DRAFT_MIN_WORDS = int(os.getenv("DRAFT_MIN_WORDS", "1000"))
+DRAFT_MAX_WORDS = int(os.getenv("DRAFT_MAX_WORDS", "1500"))
+
+# Range of `##` sections candidate drafts are scored against
+DRAFT_MIN_SECTIONS = int(os.getenv("DRAFT_MIN_SECTIONS", "4"))
+DRAFT_MAX_SECTIONS = int(os.getenv("DRAFT_MAX_SECTIONS", "10"))
+
+
+# Draft Validation
+# -------------------------------------------------------------------------------- #
+
+# Validate drafts against MDX rules and the brand's custom XML tags before the title and CMS calls
+LLM_VALIDATE_DRAFTS = os.getenv("LLM_VALIDATE_DRAFTS", "true").lower() == "true"
+
+# Times an invalid draft is regenerated before the request fails. Streamed drafts are aborted at the first fatal issue.
+LLM_DRAFT_MAX_REGENERATIONS = int(os.getenv("LLM_DRAFT_MAX_REGENERATIONS", "1"))
+
+# Drafts with fewer words are rejected as truncated, well below the templates' 1000 word target
+DRAFT_VALIDATION_MIN_WORDS = int(os.getenv("DRAFT_VALIDATION_MIN_WORDS", "500"))
+
+
+# Speculative Title
+# -------------------------------------------------------------------------------- #
+
+# Comma-separated category slugs whose title/excerpt call starts on the raw content alongside the draft
+LLM_SPECULATIVE_TITLE_CATEGORIES = frozenset(
+    slug for slug in os.getenv("LLM_SPECULATIVE_TITLE_CATEGORIES", "").split(",") if slug)
+
+# Share of the speculative title/excerpt's keywords the draft must contain for it to be kept
+LLM_SPECULATIVE_TITLE_MIN_OVERLAP = float(os.getenv("LLM_SPECULATIVE_TITLE_MIN_OVERLAP", "0.6"))
+
+
+# Batch
+# -------------------------------------------------------------------------------- #
+
+# Maximum number of draft generations running at once in a batch request
+LLM_BATCH_CONCURRENCY = int(os.getenv("LLM_BATCH_CONCURRENCY", "4"))
+
+# Seconds between status polls for OpenAI Batch API jobs
+LLM_BATCH_POLL_INTERVAL = float(os.getenv("LLM_BATCH_POLL_INTERVAL", "30"))
+
+
+# Rate Limiting
+# -------------------------------------------------------------------------------- #
+
+# Completion tokens reserved per call when estimating token usage against the rate limit
+O1_EXPECTED_OUTPUT_TOKENS = int(os.getenv("O1_EXPECTED_OUTPUT_TOKENS", "8000"))
+BASE_EXPECTED_OUTPUT_TOKENS = int(os.getenv("BASE_EXPECTED_OUTPUT_TOKENS", "300"))
+
+# Retries for rate limited and transient failures, with full-jitter exponential backoff (seconds)
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "1"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "60"))
+
+
+# Response Cache
+# -------------------------------------------------------------------------------- #
+
+# One of: memory, disk, redis, none
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory").lower()
+
+# Seconds a cached response stays valid
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))
+
+# Maximum total size of cached responses for the memory and disk backends
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Directory for the disk backend (/tmp survives across warm Lambda invocations)
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "/tmp/llm-response-cache")
+
+# Connection URL for the redis backend
+LLM_CACHE_REDIS_URL = os.getenv("LLM_CACHE_REDIS_URL")
+
+
+# Token Budget
+# -------------------------------------------------------------------------------- #
+
+# Maximum raw content tokens sent to the content generation model before it is condensed
+LLM_CONTENT_TOKEN_BUDGET = int(os.getenv("LLM_CONTENT_TOKEN_BUDGET", "60000"))
+
+# Raw content whose approximate count is below this fraction of the budget skips exact counting
+LLM_TOKEN_APPROXIMATE_MARGIN = float(os.getenv("LLM_TOKEN_APPROXIMATE_MARGIN", "0.5"))
+
+# Maximum tokens per chunk when condensing oversized raw content
+LLM_CHUNK_TOKENS = int(os.getenv("LLM_CHUNK_TOKENS", "8000"))
+
+# Maximum number of chunk summaries running at once
+LLM_CHUNK_CONCURRENCY = int(os.getenv("LLM_CHUNK_CONCURRENCY", "4"))
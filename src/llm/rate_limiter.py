@@ -0,0 +1,296 @@
+# -------------------------------------------------------------------------------- #
+# LLM Rate Limiter
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Built-in imports
+import asyncio
+import json
+import random
+import re
+import time
+from functools import cache
+from typing import Optional, Dict, Any, List, Callable, Awaitable, Tuple, TypeVar
+
+# HTTP imports
+import httpx
+
+# LLM Constants
+from src.llm.constants import LLM_MAX_RETRIES, LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY
+
+# Logger imports
+from src.utils.logger import logger
+
+
+# -------------------------------------------------------------------------------- #
+# Constants
+# -------------------------------------------------------------------------------- #
+
+T = TypeVar("T")
+
+# Matches OpenAI reset durations such as "1s", "6m0s" or "20ms"
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# Rough characters per token for prompt size estimates
+CHARS_PER_TOKEN = 4
+
+# Per-message formatting overhead in tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+# -------------------------------------------------------------------------------- #
+# Helper Functions
+# -------------------------------------------------------------------------------- #
+
+@cache
+def retryable_errors() -> Tuple[type, ...]:
+    """
+    Get the OpenAI errors worth retrying. Imported lazily, since the SDK is slow to import.
+    """
+    from openai import RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
+    return RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an OpenAI rate limit reset duration into seconds.
+    """
+    if not value:
+        return None
+    matches = _DURATION_PATTERN.findall(value)
+    if not matches:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in matches)
+
+
+def _parse_retry_after(headers: httpx.Headers) -> Optional[float]:
+    """
+    Get the server-requested delay in seconds from `retry-after-ms` or `retry-after`.
+    """
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        try:
+            return float(headers[header]) * scale
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+def estimate_message_tokens(messages: List[Dict[str, Any]]) -> int:
+    """
+    Cheaply estimate the prompt tokens of a list of chat messages.
+    """
+    total = 0
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            content = "".join(part.get("text", "") for part in content)
+        total += len(content or "") // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+    return total
+
+
+# -------------------------------------------------------------------------------- #
+# Token Bucket
+# -------------------------------------------------------------------------------- #
+
+class TokenBucket:
+    """
+    A continuously refilling bucket synced to the server's view of the limit.
+
+    Until the first rate limit headers arrive the limit is unknown and the bucket never blocks.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.limit: Optional[float] = None
+        self.available: float = 0.0
+        self.refill_rate: float = 0.0
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self.limit is not None:
+            self.available = min(self.limit, self.available + (now - self._updated_at) * self.refill_rate)
+        self._updated_at = now
+
+    def sync(self, limit: Optional[str], remaining: Optional[str], reset: Optional[str]) -> None:
+        """
+        Sync the bucket to the limit, remaining amount and reset duration reported by the server.
+        """
+        try:
+            limit_value, remaining_value = float(limit), float(remaining)
+        except (TypeError, ValueError):
+            return
+
+        self._refill()
+        self.limit = limit_value
+        self.available = remaining_value
+
+        # Refill at the rate that restores the bucket by the reported reset time, or per minute otherwise
+        reset_seconds = _parse_duration(reset)
+        if reset_seconds and limit_value > remaining_value:
+            self.refill_rate = (limit_value - remaining_value) / reset_seconds
+        else:
+            self.refill_rate = limit_value / 60.0
+
+    def wait_time(self, cost: float) -> float:
+        """
+        Seconds until `cost` is available. Zero when it is available now or the limit is unknown.
+        """
+        self._refill()
+        if self.limit is None or self.available >= min(cost, self.limit):
+            return 0.0
+        if self.refill_rate <= 0:
+            return 1.0
+        return (min(cost, self.limit) - self.available) / self.refill_rate
+
+    def consume(self, cost: float) -> None:
+        self._refill()
+        self.available -= cost
+
+
+# -------------------------------------------------------------------------------- #
+# Model Rate Limiter
+# -------------------------------------------------------------------------------- #
+
+class ModelRateLimiter:
+    """
+    Request and token buckets for a single model, plus counters exposed as metrics.
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+        self.requests = TokenBucket(f"{model}:requests")
+        self.tokens = TokenBucket(f"{model}:tokens")
+        self._lock = asyncio.Lock()
+
+        # Counters
+        self.calls = 0
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+        self.rate_limited = 0
+        self.retries = 0
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        """
+        Wait until one request and `estimated_tokens` tokens are available, then reserve them.
+        """
+        # Waiters queue on the lock, so they are served in order
+        async with self._lock:
+            while True:
+                wait_time = max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+                if wait_time <= 0:
+                    break
+                self.throttled += 1
+                self.throttled_seconds += wait_time
+                logger.debug("Throttling %s for %.2fs to stay within the rate limit", self.model, wait_time)
+                await asyncio.sleep(wait_time)
+
+            self.requests.consume(1)
+            self.tokens.consume(estimated_tokens)
+            self.calls += 1
+
+    def update_from_headers(self, headers: httpx.Headers) -> None:
+        """
+        Sync the buckets from the `x-ratelimit-*` response headers.
+        """
+        self.requests.sync(headers.get("x-ratelimit-limit-requests"),
+                           headers.get("x-ratelimit-remaining-requests"),
+                           headers.get("x-ratelimit-reset-requests"))
+        self.tokens.sync(headers.get("x-ratelimit-limit-tokens"),
+                         headers.get("x-ratelimit-remaining-tokens"),
+                         headers.get("x-ratelimit-reset-tokens"))
+
+    def metrics(self) -> Dict[str, Any]:
+        self.requests._refill()
+        self.tokens._refill()
+        return {
+            "requests_limit": self.requests.limit,
+            "requests_available": round(self.requests.available, 2),
+            "tokens_limit": self.tokens.limit,
+            "tokens_available": round(self.tokens.available, 2),
+            "calls": self.calls,
+            "throttled": self.throttled,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+        }
+
+
+# -------------------------------------------------------------------------------- #
+# Rate Limiter
+# -------------------------------------------------------------------------------- #
+
+class RateLimiter:
+    """
+    Per-model adaptive rate limiter and retry scheduler for OpenAI calls.
+    """
+
+    def __init__(self,
+                 max_retries: int = LLM_MAX_RETRIES,
+                 base_delay: float = LLM_RETRY_BASE_DELAY,
+                 max_delay: float = LLM_RETRY_MAX_DELAY):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._models: Dict[str, ModelRateLimiter] = {}
+
+    def for_model(self, model: str) -> ModelRateLimiter:
+        if model not in self._models:
+            self._models[model] = ModelRateLimiter(model)
+        return self._models[model]
+
+    async def on_response(self, response: httpx.Response) -> None:
+        """
+        httpx response hook that feeds rate limit headers from every OpenAI response into the limiter.
+        """
+        if "x-ratelimit-limit-requests" not in response.headers:
+            return
+        try:
+            model = json.loads(response.request.content).get("model")
+        except (ValueError, AttributeError, httpx.RequestNotRead):
+            return
+        if model:
+            self.for_model(model).update_from_headers(response.headers)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """
+        Full-jitter exponential backoff, never shorter than the server's `retry-after`.
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+
+    async def run(self, model: str, estimated_tokens: int, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run an OpenAI call within the model's rate limit, retrying transient failures.
+        """
+        limiter = self.for_model(model)
+        attempt = 0
+        while True:
+            await limiter.acquire(estimated_tokens)
+            try:
+                return await call()
+            except Exception as e:
+                errors = retryable_errors()
+                if not isinstance(e, errors) or attempt >= self.max_retries:
+                    raise
+
+                response = getattr(e, "response", None)
+                retry_after = _parse_retry_after(response.headers) if response is not None else None
+                if isinstance(e, errors[0]):  # RateLimitError
+                    limiter.rate_limited += 1
+
+                delay = self._backoff(attempt, retry_after)
+                limiter.retries += 1
+                attempt += 1
+                logger.warning(f"{model} call failed with {type(e).__name__}. Retry {attempt}/{self.max_retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the limiter state and counters for every model.
+        """
+        return {model: limiter.metrics() for model, limiter in self._models.items()}
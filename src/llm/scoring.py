@@ -0,0 +1,116 @@
+# -------------------------------------------------------------------------------- #
+# Draft Scoring
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Built-in imports
+import re
+from typing import FrozenSet, List, Sequence, Tuple
+
+# CMS Types
+from src.cms.types import CmsXmlBlock
+
+# Types
+from src.llm.types import DraftScore
+
+# LLM Constants
+from src.llm.constants import DRAFT_MIN_WORDS, DRAFT_MAX_WORDS, DRAFT_MIN_SECTIONS, DRAFT_MAX_SECTIONS
+
+# Draft Validation
+from src.llm.validation import build_xml_block_index, validate_draft
+
+
+# -------------------------------------------------------------------------------- #
+# Constants
+# -------------------------------------------------------------------------------- #
+
+# Weights of the checks in a draft's score. Candidates with h1s or invalid XML tags are dropped
+# before scoring, so only checks that vary between valid drafts are scored.
+WORD_COUNT_WEIGHT = 0.6
+SECTION_COUNT_WEIGHT = 0.4
+
+# Keywords are words of four or more characters that are not stop words
+KEYWORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9'-]{3,}")
+STOP_WORDS = frozenset({
+    "about", "after", "also", "been", "before", "being", "between", "both", "could", "does", "each",
+    "every", "from", "have", "here", "into", "just", "like", "more", "most", "much", "only", "other", "over",
+    "same", "should", "some", "such", "than", "that", "their", "them", "then", "there", "these", "they", "this",
+    "those", "through", "very", "what", "when", "where", "which", "while", "will", "with", "without", "would",
+    "your", "article", "guide",
+})
+
+
+# -------------------------------------------------------------------------------- #
+# Helpers
+# -------------------------------------------------------------------------------- #
+
+def _range_score(value: int, low: int, high: int) -> float:
+    if low <= value <= high:
+        return 1.0
+    distance = low - value if value < low else value - high
+    return max(0.0, 1.0 - distance / max(low, 1))
+
+
+def _keywords(text: str) -> FrozenSet[str]:
+    # Plurals and possessives match their singular
+    return frozenset(word.removesuffix("'s").removesuffix("s") for word in KEYWORD_PATTERN.findall(text.lower())
+                     if word not in STOP_WORDS)
+
+
+# -------------------------------------------------------------------------------- #
+# Functions
+# -------------------------------------------------------------------------------- #
+
+def score_drafts(drafts: Sequence[str],
+                 xml_blocks: Sequence[CmsXmlBlock],
+                 min_words: int = DRAFT_MIN_WORDS,
+                 max_words: int = DRAFT_MAX_WORDS,
+                 min_sections: int = DRAFT_MIN_SECTIONS,
+                 max_sections: int = DRAFT_MAX_SECTIONS) -> List[DraftScore]:
+    """
+    Score candidate drafts locally on their word count and number of `##` sections.
+
+    Each draft goes through the validator once, its counts form one column per check over
+    every candidate, and the columns are then combined into the weighted score.
+    """
+    xml_block_index = build_xml_block_index(xml_blocks)
+    validators = [validate_draft(draft, xml_block_index, min_words=0) for draft in drafts]
+
+    # Feature columns
+    word_counts = [validator.words for validator in validators]
+    section_counts = [validator.sections for validator in validators]
+
+    # Score columns
+    word_scores = [_range_score(word_count, min_words, max_words) for word_count in word_counts]
+    section_scores = [_range_score(section_count, min_sections, max_sections) for section_count in section_counts]
+    scores = [WORD_COUNT_WEIGHT * word_score + SECTION_COUNT_WEIGHT * section_score
+              for word_score, section_score in zip(word_scores, section_scores)]
+
+    return [
+        DraftScore(index=index, score=round(score, 4), word_count=word_count, word_score=round(word_score, 4),
+                   section_count=section_count, section_score=round(section_score, 4))
+        for index, (score, word_count, word_score, section_count, section_score)
+        in enumerate(zip(scores, word_counts, word_scores, section_counts, section_scores))
+    ]
+
+
+def select_best_draft(drafts: Sequence[str], xml_blocks: Sequence[CmsXmlBlock]) -> Tuple[str, List[DraftScore]]:
+    """
+    Pick the best scoring candidate draft, the earliest one on ties. Returns it with every score.
+    """
+    scores = score_drafts(drafts, xml_blocks)
+    best = max(scores, key=lambda draft_score: (draft_score.score, -draft_score.index))
+    return drafts[best.index], scores
+
+
+def keyword_overlap(text: str, reference: str) -> float:
+    """
+    Share of the keywords of `text` that also appear in `reference`, e.g. of a title in its draft.
+    """
+    keywords = _keywords(text)
+    if not keywords:
+        return 0.0
+    return len(keywords & _keywords(reference)) / len(keywords)
@@ -0,0 +1,87 @@
+# -------------------------------------------------------------------------------- #
+# Token Counting
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Built-in imports
+from functools import lru_cache
+from typing import Optional, Any
+
+# LLM Constants
+from src.llm.constants import LLM_TOKEN_APPROXIMATE_MARGIN
+
+# Rate Limiter
+from src.llm.rate_limiter import CHARS_PER_TOKEN
+
+# Logger imports
+from src.utils.logger import logger
+
+
+# -------------------------------------------------------------------------------- #
+# Constants
+# -------------------------------------------------------------------------------- #
+
+# Encoding used when tiktoken does not know the model
+DEFAULT_ENCODING = "o200k_base"
+
+
+# -------------------------------------------------------------------------------- #
+# Encodings
+# -------------------------------------------------------------------------------- #
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str) -> Optional[Any]:
+    """
+    Get (and cache) the tiktoken encoding for a model, or None when tiktoken is not installed or cannot load it.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken is not installed. Falling back to approximate token counts.")
+        return None
+
+    # The encoding file is downloaded on first use, which can fail without network access
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:
+        logger.warning(f"Failed to load the tiktoken encoding for {model}. Falling back to approximate token counts. Error: {e}")
+        return None
+
+
+# -------------------------------------------------------------------------------- #
+# Counting
+# -------------------------------------------------------------------------------- #
+
+def approximate_tokens(text: str) -> int:
+    """
+    Cheaply estimate the number of tokens in a text.
+    """
+    return len(text) // CHARS_PER_TOKEN
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    Count the tokens of a text with the model's encoding, approximately if tiktoken is unavailable.
+    """
+    encoding = get_encoding(model)
+    if encoding is None:
+        return approximate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_tokens_for_budget(text: str, model: str, budget: int) -> int:
+    """
+    Count tokens only as precisely as needed to compare against a budget.
+
+    Texts whose approximate count is comfortably within the budget skip the exact encoding pass.
+    """
+    approximate = approximate_tokens(text)
+    if approximate <= budget * LLM_TOKEN_APPROXIMATE_MARGIN:
+        return approximate
+    return count_tokens(text, model)
@@ -25,3 +25,32 @@ class TitleExcerptResponse(BaseModel):
     """Response model for the title and excerpt generation process."""
     title: str = Field(description="The title of the content")
     excerpt: str = Field(description="The excerpt of the content")
+
+
+class PreparedRawContent(BaseModel):
+    """Raw content as sent to the content generation model, with its token accounting."""
+    content: str = Field(description="The raw content, or the condensed notes when it was over budget")
+    source_tokens: int = Field(description="Tokens in the original raw content")
+    prompt_tokens: int = Field(description="Tokens of raw content sent to the content generation model")
+    chunks: int = Field(description="Number of chunks summarized, or 0 when the content was sent as-is", default=0)
+
+    @property
+    def input_tokens_avoided(self) -> int:
+        return max(0, self.source_tokens - self.prompt_tokens)
+
+
+class DraftScore(BaseModel):
+    """Local quality score of a candidate draft, from 0 to 1, with the checks it is made of."""
+    index: int = Field(description="The position of the draft among the candidates")
+    score: float = Field(description="Weighted score of the checks")
+    word_count: int = Field(description="Words outside fenced code blocks")
+    word_score: float = Field(description="1 within the target word range, falling off linearly outside it")
+    section_count: int = Field(description="`##` sections outside fenced code blocks")
+    section_score: float = Field(description="1 within the target section range, falling off linearly outside it")
+
+
+class DraftIssue(BaseModel):
+    """Problem found in a generated draft by the local validator."""
+    kind: str = Field(description="One of: h1, unknown_tag, missing_parameter, unknown_parameter, unbalanced_tag, unclosed_tag, too_short")
+    message: str = Field(description="What is wrong and where")
+    line: int = Field(description="The line of the draft the issue is on")
@@ -0,0 +1,244 @@
+# -------------------------------------------------------------------------------- #
+# Draft Validation
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Built-in imports
+import re
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+# CMS Types
+from src.cms.types import CmsXmlBlock
+
+# CMS Constants
+from src.cms.constants import CMS_XML_BLOCKS_CACHE_MAX_BRANDS
+
+# Types
+from src.llm.types import DraftIssue
+
+# LLM Constants
+from src.llm.constants import DRAFT_VALIDATION_MIN_WORDS
+
+# Logger imports
+from src.utils.logger import logger
+
+
+# -------------------------------------------------------------------------------- #
+# Constants
+# -------------------------------------------------------------------------------- #
+
+# Custom XML tags are the blocks' PascalCase `ts_name`s, like JSX components
+XML_TAG_PATTERN = re.compile(r"<(/?)([A-Z][A-Za-z0-9]*)((?:\s[^<>]*?)?)(/?)>")
+XML_ATTRIBUTE_PATTERN = re.compile(r"([A-Za-z_][\w-]*)(?:\s*=\s*(?:\"[^\"]*\"|'[^']*'|\{[^}]*\}))?")
+XML_TAG_START_PATTERN = re.compile(r"</?[A-Z]")
+
+# Inline code spans, like `List<String>`, are prose rather than tags
+INLINE_CODE_PATTERN = re.compile(r"(`+)(?!`).*?(?<!`)\1(?!`)")
+
+# Issues that doom a draft as soon as they appear
+FATAL_ISSUES = frozenset({"h1", "unknown_tag", "missing_parameter", "unbalanced_tag", "unclosed_tag", "too_short"})
+
+# A tag still open after this many characters is not carried over to the next line any more
+MAX_TAG_CHARS = 4000
+
+# Parameters of a block: (required, all)
+BlockParameters = Tuple[FrozenSet[str], FrozenSet[str]]
+
+
+# -------------------------------------------------------------------------------- #
+# XML Block Index
+# -------------------------------------------------------------------------------- #
+
+# Tag lookup per brand, stored with the exact block objects it was built from
+_xml_block_index_cache: "OrderedDict[str, Tuple[Tuple[CmsXmlBlock, ...], Dict[str, BlockParameters]]]" = OrderedDict()
+
+
+def build_xml_block_index(xml_blocks: Sequence[CmsXmlBlock]) -> Dict[str, BlockParameters]:
+    """
+    Map each block's tag name to its required and known parameter names.
+    """
+    return {
+        block.ts_name: (frozenset(param.ts_name for param in block.parameters if param.required),
+                        frozenset(param.ts_name for param in block.parameters))
+        for block in xml_blocks
+    }
+
+
+def get_xml_block_index(brand_id: str, xml_blocks: Sequence[CmsXmlBlock]) -> Dict[str, BlockParameters]:
+    """
+    Get the tag lookup for a brand, building it only when the catalog changes.
+
+    Like the prompt fragment, it is matched on the identity of the cached block objects.
+    """
+    cached = _xml_block_index_cache.get(brand_id)
+    if cached is not None:
+        cached_blocks, index = cached
+        if len(cached_blocks) == len(xml_blocks) and all(a is b for a, b in zip(cached_blocks, xml_blocks)):
+            _xml_block_index_cache.move_to_end(brand_id)
+            return index
+
+    index = build_xml_block_index(xml_blocks)
+    _xml_block_index_cache[brand_id] = (tuple(xml_blocks), index)
+    _xml_block_index_cache.move_to_end(brand_id)
+    while len(_xml_block_index_cache) > CMS_XML_BLOCKS_CACHE_MAX_BRANDS:
+        _xml_block_index_cache.popitem(last=False)
+    return index
+
+
+# -------------------------------------------------------------------------------- #
+# Validator
+# -------------------------------------------------------------------------------- #
+
+class DraftValidationError(Exception):
+    """
+    Raised when a draft has a fatal issue, so it is regenerated before any downstream call.
+
+    Not a `ValueError`: the draft is model output, so the handler maps it to a 5xx, not a client error.
+    """
+
+    def __init__(self, issues: List[DraftIssue]):
+        self.issues = issues
+        super().__init__("Draft failed validation: " + "; ".join(issue.message for issue in issues))
+
+
+class MdxDraftValidator:
+    """
+    Single-pass, incremental validator of an MDX draft and the brand's custom XML tags.
+
+    Streamed text is checked a line at a time as lines complete, so `feed` reports the
+    first fatal issue (an h1, an unknown tag, a tag missing a required parameter, or a
+    misnested closing tag) while the rest of the draft is still generating. `finish` adds
+    the checks that need the whole draft: unclosed tags and the minimum word count.
+    Fenced code and inline code spans are skipped. A tag spanning lines is carried over until it ends.
+    """
+
+    def __init__(self, xml_block_index: Dict[str, BlockParameters], min_words: int = DRAFT_VALIDATION_MIN_WORDS):
+        self.xml_block_index = xml_block_index
+        self.min_words = min_words
+        self.issues: List[DraftIssue] = []
+        self.error: Optional[DraftIssue] = None
+        self.words = 0
+        self.sections = 0
+        self.tags = 0
+        self.lines = 0
+
+        self._partial: List[str] = []
+        self._fence: Optional[str] = None
+        self._tag_carry = ""
+        self._open_tags: List[Tuple[str, int]] = []
+
+    def feed(self, delta: str) -> Optional[DraftIssue]:
+        """
+        Add streamed text. Returns the first fatal issue once there is one.
+        """
+        if "\n" not in delta:
+            self._partial.append(delta)
+            return self.error
+
+        lines = delta.split("\n")
+        lines[0] = "".join(self._partial) + lines[0]
+        self._partial = [lines.pop()]
+        for line in lines:
+            self._check_line(line)
+        return self.error
+
+    def finish(self) -> List[DraftIssue]:
+        """
+        Check the last line and the whole-draft rules. Returns every issue found.
+        """
+        self._check_line("".join(self._partial))
+        self._partial = []
+
+        for name, line in self._open_tags:
+            self._add_issue("unclosed_tag", f"<{name}> opened on line {line} is never closed", line)
+        self._open_tags = []
+        if self.words < self.min_words:
+            self._add_issue("too_short", f"Draft has {self.words} words, fewer than {self.min_words}", self.lines)
+        return self.issues
+
+    def _add_issue(self, kind: str, message: str, line: int) -> None:
+        issue = DraftIssue(kind=kind, message=message, line=line)
+        self.issues.append(issue)
+        if self.error is None and kind in FATAL_ISSUES:
+            self.error = issue
+
+    def _check_line(self, line: str) -> None:
+        self.lines += 1
+        stripped = line.lstrip()
+
+        # Fenced code
+        if self._fence is not None:
+            if stripped.startswith(self._fence):
+                self._fence = None
+            return
+        if stripped.startswith(("```", "~~~")):
+            self._fence = stripped[:3]
+            return
+
+        # The templates forbid h1s
+        if line.startswith("#") and (len(line) == 1 or line[1] in " \t"):
+            self._add_issue("h1", f"h1 heading on line {self.lines}: {line[:80]}", self.lines)
+        elif line.startswith("## "):
+            self.sections += 1
+
+        self.words += len(line.split())
+        if "`" in line:
+            line = INLINE_CODE_PATTERN.sub("", line)
+        if "<" in line or self._tag_carry:
+            self._check_tags(f"{self._tag_carry}\n{line}" if self._tag_carry else line)
+
+    def _check_tags(self, text: str) -> None:
+        end = 0
+        for match in XML_TAG_PATTERN.finditer(text):
+            self._check_tag(*match.groups())
+            end = match.end()
+
+        # Carry a tag that has started but not ended over to the next line
+        start = XML_TAG_START_PATTERN.search(text, end)
+        self._tag_carry = text[start.start():] if start and len(text) - start.start() <= MAX_TAG_CHARS else ""
+
+    def _check_tag(self, closing: str, name: str, attributes: str, self_closing: str) -> None:
+        self.tags += 1
+        if name not in self.xml_block_index:
+            self._add_issue("unknown_tag", f"Unknown tag <{name}> on line {self.lines}", self.lines)
+            return
+
+        if closing:
+            if self._open_tags and self._open_tags[-1][0] == name:
+                self._open_tags.pop()
+            else:
+                self._add_issue("unbalanced_tag", f"</{name}> on line {self.lines} closes no open <{name}>", self.lines)
+            return
+
+        required, known = self.xml_block_index[name]
+        given = {attribute.group(1) for attribute in XML_ATTRIBUTE_PATTERN.finditer(attributes)}
+        missing, unknown = required - given, given - known
+        if missing:
+            self._add_issue("missing_parameter",
+                            f"<{name}> on line {self.lines} is missing {', '.join(sorted(missing))}", self.lines)
+        if unknown:
+            self._add_issue("unknown_parameter",
+                            f"<{name}> on line {self.lines} has unknown {', '.join(sorted(unknown))}", self.lines)
+        if not self_closing:
+            self._open_tags.append((name, self.lines))
+
+
+# -------------------------------------------------------------------------------- #
+# Functions
+# -------------------------------------------------------------------------------- #
+
+def validate_draft(draft: str, xml_block_index: Dict[str, BlockParameters],
+                   min_words: int = DRAFT_VALIDATION_MIN_WORDS) -> MdxDraftValidator:
+    """
+    Validate a whole draft. Returns the finished validator with its issues and counts.
+    """
+    validator = MdxDraftValidator(xml_block_index, min_words=min_words)
+    validator.feed(draft)
+    validator.finish()
+    if validator.issues:
+        logger.debug("Draft validation issues: %s", [issue.message for issue in validator.issues])
+    return validator
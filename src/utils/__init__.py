@@ -1,7 +1,4 @@
-from src.utils.logger import *
-from src.utils.jinja_utils import *
-from src.utils.llm_utils import *
-
+# Submodules are imported on demand, so importing one utility does not load the others
 __all__ = [
     "logger",
     "jinja_utils",
@@ -0,0 +1,23 @@
+# -------------------------------------------------------------------------------- #
+# Env Utils
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+from functools import cache
+
+from dotenv import load_dotenv
+
+
+# -------------------------------------------------------------------------------- #
+# Functions
+# -------------------------------------------------------------------------------- #
+
+@cache
+def load_environment() -> None:
+    """
+    Load the .env file into the environment. Only the first call does any work.
+    """
+    load_dotenv()
@@ -8,13 +8,25 @@
 
 # Standard Library
 import json
-from typing import Dict, Any, Tuple, Set
+from functools import lru_cache
+from typing import Dict, Any, Tuple, Set, Type, TypeVar
 
 # Pydantic
 from pydantic import BaseModel, ValidationError
 
 # Logger
-from src.utils.logger import logger
+from src.utils.logger import logger, LogPayload
+
+RequestModel = TypeVar("RequestModel", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def required_keys(request_model: Type[BaseModel]) -> Tuple[str, ...]:
+    """
+    Get the keys a request body must contain, in field order. Computed once per model class.
+    """
+    return tuple(field.alias or name for name, field in request_model.model_fields.items() if field.is_required())
+
 
 # -------------------------------------------------------------------------------- #
 # Parse the request body
@@ -37,11 +49,10 @@ def parse_request_body(event: Dict[str, Any], request_model: BaseModel) -> Dict[
         raise ValueError("Request body cannot be empty.")
 
     # 3. For debugging, log minimal details if needed.
-    logger.debug("Parsed JSON body: %s", body)
+    logger.debug("Parsed JSON body: %s", LogPayload(body))
 
     # 4. Validate required keys (optional step, but often recommended).
-    required_keys = request_model.model_json_schema()["required"]
-    missing_keys = [key for key in required_keys if key not in body]
+    missing_keys = [key for key in required_keys(request_model) if key not in body]
 
     # 5. If missing keys, raise an error.
     if missing_keys:
@@ -62,9 +73,30 @@ def validate_request_body(body: Dict[str, Any], request_model: BaseModel) -> Non
     """
     try:
         request_model(**body)
-        logger.debug(f"Request validation passed for the request model: {request_model}")
+        logger.debug("Request validation passed for the request model: %s", request_model)
     except ValidationError as e:
         logger.error(f"Request validation failed for the request model: {request_model}. Error: {e}. Raising ValueError.")
         raise ValueError(f"Request validation failed. {e} for the request model: {request_model}")
 
 
+# -------------------------------------------------------------------------------- #
+# Parse and validate in one pass
+# -------------------------------------------------------------------------------- #
+
+def parse_and_validate_request(event: Dict[str, Any], request_model: Type[RequestModel]) -> RequestModel:
+    """
+    Parse the JSON body of an AWS Lambda event straight into the request model.
+
+    Valid bodies are validated from the raw string in a single pass. Invalid bodies go
+    through `parse_request_body` and `validate_request_body`, so the errors are the same.
+    """
+    raw_body = event.get("body") or "{}"
+    try:
+        request = request_model.model_validate_json(raw_body)
+    except ValidationError as e:
+        body = parse_request_body(event={"body": raw_body}, request_model=request_model)
+        validate_request_body(body=body, request_model=request_model)
+        raise ValueError(f"Request validation failed. {e} for the request model: {request_model}") from e
+
+    logger.debug("Parsed and validated request body: %s", LogPayload(raw_body))
+    return request
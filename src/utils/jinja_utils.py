@@ -8,17 +8,22 @@
 
 # Built-in imports
 import os
-from typing import Optional, Set
+from collections import OrderedDict
+from typing import Optional, Set, List, Sequence, Tuple, Any
 
 # Jinja2 imports
-from jinja2 import Environment, FileSystemLoader, meta
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, Template, meta
+from markupsafe import Markup
 
 # Logging
 from src.utils.logger import logger
 
+# Tracing
+from src.utils.tracing import span
+
 # Load environment variables
-from dotenv import load_dotenv
-load_dotenv()
+from src.utils.env_utils import load_environment
+load_environment()
 
 
 # -------------------------------------------------------------------------------- #
@@ -31,28 +36,107 @@ if not PROMPT_TEMPLATE_DIR:
     raise ValueError("PROMPT_TEMPLATE_DIR environment variable must be set")
 
 
+# -------------------------------------------------------------------------------- #
+# Prompt Template Cache Configuration
+# -------------------------------------------------------------------------------- #
+
+# Maximum number of compiled templates held in memory (LRU, keyed by template name)
+PROMPT_TEMPLATE_CACHE_SIZE = int(os.environ.get("PROMPT_TEMPLATE_CACHE_SIZE", "64"))
+
+# Re-check template mtimes on every lookup. Useful for local development only.
+PROMPT_TEMPLATE_AUTO_RELOAD = os.environ.get("PROMPT_TEMPLATE_AUTO_RELOAD", "false").lower() == "true"
+
+# Optional directory holding precompiled template bytecode (populated at build time)
+PROMPT_TEMPLATE_BYTECODE_CACHE_DIR = os.environ.get("PROMPT_TEMPLATE_BYTECODE_CACHE_DIR")
+
+# Precompile every category template when the environment is first created
+PROMPT_TEMPLATE_PRECOMPILE = os.environ.get("PROMPT_TEMPLATE_PRECOMPILE", "false").lower() == "true"
+
+# Suffix shared by every category template
+CATEGORY_TEMPLATE_SUFFIX = "-template.jinja"
+
+# Partial that renders a brand's XML blocks into the <custom-xml-tags> prompt fragment
+XML_BLOCKS_FRAGMENT_TEMPLATE = "custom-xml-tags.jinja"
+
+# Maximum number of brands whose rendered fragment is kept in memory
+XML_BLOCKS_FRAGMENT_CACHE_SIZE = int(os.environ.get("XML_BLOCKS_FRAGMENT_CACHE_SIZE", "32"))
+
+
 # -------------------------------------------------------------------------------- #
 # Jinja2 Utils
 # -------------------------------------------------------------------------------- #
 
-# TODO: make a singleton
+# Process-wide environment, created once per container
+_prompt_environment: Optional[Environment] = None
+
+
 def create_prompt_environment() -> Environment:
     """
     Create a Jinja2 environment for prompt templates that can load templates from a given directory.
     """
     logger.info(f"Creating Jinja2 environment for prompt templates from directory: {PROMPT_TEMPLATE_DIR}")
+
+    # Attach the bytecode cache if one is configured
+    bytecode_cache = None
+    if PROMPT_TEMPLATE_BYTECODE_CACHE_DIR:
+        os.makedirs(PROMPT_TEMPLATE_BYTECODE_CACHE_DIR, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(PROMPT_TEMPLATE_BYTECODE_CACHE_DIR)
+        logger.info(f"Using Jinja2 bytecode cache at: {PROMPT_TEMPLATE_BYTECODE_CACHE_DIR}")
+
     env = Environment(
         loader=FileSystemLoader(PROMPT_TEMPLATE_DIR),
-        autoescape=True
+        autoescape=True,
+        cache_size=PROMPT_TEMPLATE_CACHE_SIZE,
+        auto_reload=PROMPT_TEMPLATE_AUTO_RELOAD,
+        bytecode_cache=bytecode_cache,
     )
 
-    logger.debug(f"Jinj2 enironment successfully created. Here are the templates within the directory: {env.list_templates()}")
-
-    
     logger.info(f"Jinja2 environment created successfully")
     return env
 
 
+def get_prompt_environment() -> Environment:
+    """
+    Get the process-wide Jinja2 environment, creating it on first use.
+    """
+    global _prompt_environment
+
+    if _prompt_environment is None:
+        _prompt_environment = create_prompt_environment()
+
+        if PROMPT_TEMPLATE_PRECOMPILE:
+            precompile_prompt_templates(env=_prompt_environment)
+
+    return _prompt_environment
+
+
+def precompile_prompt_templates(env: Optional[Environment] = None) -> List[str]:
+    """
+    Load every category template so it is compiled (and written to the bytecode cache, if configured).
+    """
+    # Use the shared environment if none is given
+    if not env:
+        env = get_prompt_environment()
+
+    template_names = env.list_templates(filter_func=lambda name: name.endswith(CATEGORY_TEMPLATE_SUFFIX))
+    for template_name in template_names:
+        env.get_template(template_name)
+
+    logger.info(f"Precompiled {len(template_names)} prompt templates")
+    return template_names
+
+
+def load_prompt_template(template_name: str, env: Optional[Environment] = None) -> Template:
+    """
+    Load (and compile, on first use) a prompt template from the shared environment.
+    """
+    # Use the shared environment if none is given
+    if not env:
+        env = get_prompt_environment()
+
+    return env.get_template(template_name)
+
+
 # def get_template_name(template_name: str,
 #                       env: Optional[Environment] = None) -> Set[str]:
 #     """
@@ -79,19 +163,73 @@ def render_prompt_template_with_kwargs(template_name: str,
     """
     Render a Jinja2 template by name, injecting any variables provided as kwargs.
     """
-    # Create the environment if it doesn't exist
+    # Use the shared environment if none is given
     if not env:
-        env = create_prompt_environment()
+        env = get_prompt_environment()
 
-    # Get the template
-    logger.info(f"Getting template {template_name}")
+    # Get the template (compiled templates are cached by the environment)
+    logger.debug("Getting template %s", template_name)
     try:
         template = env.get_template(template_name)
-        logger.info(f"Template {template_name} fetched successfully")
     except Exception as e:
         logger.error(f"Failed to fetch template {template_name}. Error: {e}")
         raise e
     # Render the template
-    rendered_template = template.render(**kwargs)
-    logger.info(f"Template {template_name} rendered successfully")
+    with span("template.render", template=template_name) as render_span:
+        rendered_template = template.render(**kwargs)
+        render_span.add("bytes", len(rendered_template))
+    logger.info("Template %s rendered successfully", template_name)
     return rendered_template
+
+
+# -------------------------------------------------------------------------------- #
+# XML Block Fragments
+# -------------------------------------------------------------------------------- #
+
+# Rendered fragment per brand, stored with the exact block objects it was rendered from
+_xml_blocks_fragment_cache: "OrderedDict[str, Tuple[Tuple[Any, ...], Markup]]" = OrderedDict()
+
+
+def render_xml_blocks_fragment(xml_blocks: Sequence[Any], env: Optional[Environment] = None) -> Markup:
+    """
+    Render XML blocks into the <custom-xml-tags> fragment, marked safe so templates embed it as-is.
+    """
+    return Markup(render_prompt_template_with_kwargs(XML_BLOCKS_FRAGMENT_TEMPLATE, env=env, xml_blocks=xml_blocks))
+
+
+def get_xml_blocks_fragment(brand_id: str, xml_blocks: Sequence[Any]) -> Markup:
+    """
+    Get the rendered <custom-xml-tags> fragment for a brand, rendering it only when the catalog changes.
+
+    The XML block cache hands out the same parsed block objects until a brand's catalog
+    changes, so an identity match on the blocks means the catalog version is unchanged.
+    The fragment is byte-identical across calls, which also makes it a stable prompt prefix.
+    """
+    cached = _xml_blocks_fragment_cache.get(brand_id)
+    if cached is not None:
+        cached_blocks, fragment = cached
+        if len(cached_blocks) == len(xml_blocks) and all(a is b for a, b in zip(cached_blocks, xml_blocks)):
+            _xml_blocks_fragment_cache.move_to_end(brand_id)
+            logger.debug("XML blocks fragment cache hit for brand ID: %s", brand_id)
+            return fragment
+
+    logger.debug("XML blocks fragment cache miss for brand ID: %s", brand_id)
+    fragment = render_xml_blocks_fragment(xml_blocks)
+    _xml_blocks_fragment_cache[brand_id] = (tuple(xml_blocks), fragment)
+    _xml_blocks_fragment_cache.move_to_end(brand_id)
+    while len(_xml_blocks_fragment_cache) > XML_BLOCKS_FRAGMENT_CACHE_SIZE:
+        _xml_blocks_fragment_cache.popitem(last=False)
+
+    return fragment
+
+
+# -------------------------------------------------------------------------------- #
+# Build-time Precompilation
+# -------------------------------------------------------------------------------- #
+
+if __name__ == "__main__":
+    # Populate the bytecode cache at build time, e.g.:
+    # PROMPT_TEMPLATE_BYTECODE_CACHE_DIR=.jinja_cache python -m src.utils.jinja_utils
+    if not PROMPT_TEMPLATE_BYTECODE_CACHE_DIR:
+        raise ValueError("PROMPT_TEMPLATE_BYTECODE_CACHE_DIR environment variable must be set to precompile templates")
+    precompile_prompt_templates()
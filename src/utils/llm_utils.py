@@ -5,7 +5,15 @@
 # -------------------------------------------------------------------------------- #
 # Imports
 # -------------------------------------------------------------------------------- #
-from typing import List, Dict, Any
+import re
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, Hashable, Callable
+
+# Logger imports
+from src.utils.logger import logger
+
+# Tracing
+from src.utils.tracing import current_span
 
 
 # -------------------------------------------------------------------------------- #
@@ -47,3 +55,325 @@ def base_model_messages_format(developer_prompt: str,
             "text": execution_prompt
         }]
     }]
+
+
+# -------------------------------------------------------------------------------- #
+# Prompt Assembly
+# -------------------------------------------------------------------------------- #
+
+# Everything before this tag in a category template is static per (category, brand)
+PROMPT_VARIABLE_SECTION_MARKER = "<user-input>"
+
+
+def split_static_prefix(prompt: str, marker: str = PROMPT_VARIABLE_SECTION_MARKER) -> Tuple[str, str]:
+    """
+    Split a rendered prompt into its static prefix and its variable suffix at `marker`.
+    """
+    index = prompt.find(marker)
+    if index == -1:
+        return "", prompt
+    return prompt[:index], prompt[index:]
+
+
+class PromptPrefixRegistry:
+    """
+    Remember the static prefix last sent for each key and log when a new one differs from it.
+
+    OpenAI caches prompts by exact prefix, so a prefix that changes for the same key (e.g. the
+    brand's XML block catalog changed, or the template renders non-deterministically) means the
+    next call misses the provider prompt cache. The offset of the first differing character is
+    logged to help find the cause.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._prefixes: "OrderedDict[Hashable, str]" = OrderedDict()
+
+    def check(self, key: Hashable, prefix: str) -> str:
+        """
+        Compare a prefix against the one registered for its key, register it and return it unchanged.
+        """
+        registered = self._prefixes.get(key)
+        if registered is not None and registered != prefix:
+            offset = next((index for index, (old, new) in enumerate(zip(registered, prefix)) if old != new),
+                          min(len(registered), len(prefix)))
+            logger.warning(f"Static prompt prefix changed for {key} at character {offset} "
+                           f"({len(registered)} -> {len(prefix)} characters). The next call will miss the provider prompt cache.")
+
+        self._prefixes[key] = prefix
+        self._prefixes.move_to_end(key)
+        while len(self._prefixes) > self.max_entries:
+            self._prefixes.popitem(last=False)
+        return prefix
+
+
+prompt_prefix_registry = PromptPrefixRegistry()
+
+
+def cached_o1_messages_format(prefix_key: Hashable, developer_prompt: str) -> List[Dict[str, Any]]:
+    """
+    Create o1 messages with the static prefix and the variable suffix as separate text parts.
+
+    The concatenated text is identical to `o1_messages_format`. The prefix is checked against
+    the registry, which logs when it changed since the last call for the same key.
+    """
+    static_prefix, variable_suffix = split_static_prefix(developer_prompt)
+    if not static_prefix:
+        return o1_messages_format(developer_prompt)
+
+    return [{
+        "role": "user",
+        "content": [{
+            "type": "text",
+            "text": prompt_prefix_registry.check(prefix_key, static_prefix)
+        }, {
+            "type": "text",
+            "text": variable_suffix
+        }]
+    }]
+
+
+def cached_base_model_messages_format(prefix_key: Hashable,
+                                      developer_prompt: str,
+                                      execution_prompt: str) -> List[Dict[str, Any]]:
+    """
+    Create base model messages whose system prompt is checked against the prefix registry.
+    """
+    return base_model_messages_format(prompt_prefix_registry.check(prefix_key, developer_prompt),
+                                      execution_prompt)
+
+
+# -------------------------------------------------------------------------------- #
+# Prompt Cache Accounting
+# -------------------------------------------------------------------------------- #
+
+def _usage_value(obj: Any, name: str) -> Any:
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+class PromptCacheStats:
+    """
+    Per-stage counters of prompt, provider-cached prompt and completion tokens.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, Dict[str, int]] = {}
+
+    def record(self, stage: str, usage: Any) -> None:
+        """
+        Record the `usage` of a completion response (an SDK object or a raw dict) and log the hit ratio.
+
+        The token counts are also added to the current tracing span.
+        """
+        prompt_tokens = _usage_value(usage, "prompt_tokens") or 0
+        cached_tokens = _usage_value(_usage_value(usage, "prompt_tokens_details"), "cached_tokens") or 0
+        completion_tokens = _usage_value(usage, "completion_tokens") or 0
+
+        call_span = current_span()
+        call_span.add("prompt_tokens", prompt_tokens)
+        call_span.add("cached_tokens", cached_tokens)
+        call_span.add("completion_tokens", completion_tokens)
+
+        counters = self._stages.setdefault(stage, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0})
+        counters["calls"] += 1
+        counters["prompt_tokens"] += prompt_tokens
+        counters["cached_tokens"] += cached_tokens
+        counters["completion_tokens"] += completion_tokens
+
+        logger.info(f"Prompt cache for stage {stage}: {cached_tokens}/{prompt_tokens} prompt tokens cached. "
+                    f"Stage hit ratio: {self.hit_ratio(stage):.0%} over {counters['calls']} calls.")
+
+    def hit_ratio(self, stage: str) -> float:
+        counters = self._stages.get(stage)
+        if not counters or not counters["prompt_tokens"]:
+            return 0.0
+        return counters["cached_tokens"] / counters["prompt_tokens"]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {stage: {**counters, "hit_ratio": self.hit_ratio(stage)} for stage, counters in self._stages.items()}
+
+
+prompt_cache_stats = PromptCacheStats()
+
+
+# -------------------------------------------------------------------------------- #
+# Speculative Title Accounting
+# -------------------------------------------------------------------------------- #
+
+class SpeculativeTitleStats:
+    """
+    Per-category counters of speculative title/excerpt calls, their hits and the latency the hits saved.
+    """
+
+    def __init__(self):
+        self._categories: Dict[str, Dict[str, float]] = {}
+
+    def record(self, category_slug: str, hit: bool, overlap: float = 0.0, latency_saved: float = 0.0) -> None:
+        """
+        Record whether a speculative result was kept and the seconds that saved, and log the category's hit rate.
+        """
+        counters = self._categories.setdefault(category_slug, {"calls": 0, "hits": 0, "latency_saved": 0.0})
+        counters["calls"] += 1
+        counters["hits"] += int(hit)
+        counters["latency_saved"] += latency_saved
+        current_span().add("speculative_title_hit", int(hit))
+
+        logger.info(f"Speculative title for {category_slug}: {'hit' if hit else 'miss'} (keyword overlap {overlap:.0%}, "
+                    f"saved {latency_saved:.2f}s). Category hit rate: {self.hit_rate(category_slug):.0%} over "
+                    f"{counters['calls']} calls, {counters['latency_saved']:.2f}s saved.")
+
+    def hit_rate(self, category_slug: str) -> float:
+        counters = self._categories.get(category_slug)
+        if not counters or not counters["calls"]:
+            return 0.0
+        return counters["hits"] / counters["calls"]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {category_slug: {**counters, "hit_rate": self.hit_rate(category_slug)}
+                for category_slug, counters in self._categories.items()}
+
+
+speculative_title_stats = SpeculativeTitleStats()
+
+
+# -------------------------------------------------------------------------------- #
+# Chunking
+# -------------------------------------------------------------------------------- #
+
+# Paragraphs are separated by blank lines
+_PARAGRAPH_SEPARATOR = re.compile(r"\n[ \t]*\n")
+
+# Markdown headings, or a short line followed by an underline of = or -
+_HEADING_PATTERN = re.compile(r"^(#{1,6} |.{1,120}\n[=-]{3,}\s*$)")
+
+
+def _split_oversized_block(block: str, max_tokens: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """
+    Split a single paragraph that is larger than a chunk on line breaks, then on sentence ends.
+    """
+    for separator in ("\n", ". ", " "):
+        parts = block.split(separator)
+        if len(parts) > 1:
+            pieces = [part + separator for part in parts[:-1]] + [parts[-1]]
+            return _pack_blocks(pieces, max_tokens, count_tokens, joiner="")
+
+    # No natural split point is left, so cut the text evenly
+    pieces = max(2, -(-count_tokens(block) // max_tokens))
+    size = -(-len(block) // pieces)
+    return [block[i:i + size] for i in range(0, len(block), size)]
+
+
+def _pack_blocks(blocks: List[str],
+                 max_tokens: int,
+                 count_tokens: Callable[[str], int],
+                 joiner: str = "\n\n") -> List[str]:
+    """
+    Greedily pack blocks into chunks of at most `max_tokens`, preferring to start chunks at headings.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for block in blocks:
+        tokens = count_tokens(block)
+        if tokens > max_tokens:
+            if current:
+                chunks.append(joiner.join(current))
+                current, current_tokens = [], 0
+            chunks.extend(_split_oversized_block(block, max_tokens, count_tokens))
+            continue
+
+        # Start a new chunk when the block does not fit, or at a heading once the chunk is half full
+        is_heading = bool(_HEADING_PATTERN.match(block))
+        if current and (current_tokens + tokens > max_tokens or (is_heading and current_tokens >= max_tokens // 2)):
+            chunks.append(joiner.join(current))
+            current, current_tokens = [], 0
+
+        current.append(block)
+        current_tokens += tokens
+
+    if current:
+        chunks.append(joiner.join(current))
+    return chunks
+
+
+def split_into_chunks(text: str, max_tokens: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """
+    Split a text into chunks of at most `max_tokens`, following its paragraph and heading structure.
+    """
+    blocks = [block.strip() for block in _PARAGRAPH_SEPARATOR.split(text) if block.strip()]
+    return _pack_blocks(blocks, max_tokens, count_tokens)
+
+
+# -------------------------------------------------------------------------------- #
+# Streaming Helpers
+# -------------------------------------------------------------------------------- #
+
+# MDX section headings are h2s
+SECTION_HEADING_MARKER = "## "
+
+
+class MdxSectionPrefixTracker:
+    """
+    Incrementally track streamed MDX and detect when the first N sections are complete.
+
+    Sections start at `## ` headings (the templates forbid h1s). A section is complete once the
+    next section heading starts, so the prefix is everything before the (N + 1)-th `## ` line.
+    Only newly streamed text is scanned.
+    """
+
+    def __init__(self, sections: int):
+        self.sections = sections
+        self.prefix: Optional[str] = None
+
+        self._chunks: List[str] = []
+        self._length = 0
+        self._line_start = 0
+        self._line_head = ""
+        self._headings = 0
+
+    def feed(self, delta: str) -> Optional[str]:
+        """
+        Add a streamed chunk. Returns the prefix once, the first time it becomes available.
+        """
+        self._chunks.append(delta)
+        offset = self._length
+        self._length += len(delta)
+
+        if self.prefix is not None or self.sections <= 0:
+            return None
+
+        position = 0
+        while position <= len(delta):
+            newline = delta.find("\n", position)
+            segment = delta[position:] if newline == -1 else delta[position:newline]
+
+            # Only the first few characters of a line decide if it is a section heading
+            if len(self._line_head) < len(SECTION_HEADING_MARKER):
+                self._line_head += segment[:len(SECTION_HEADING_MARKER) - len(self._line_head)]
+                if len(self._line_head) == len(SECTION_HEADING_MARKER) or newline != -1:
+                    if self._line_head == SECTION_HEADING_MARKER:
+                        self._headings += 1
+                        if self._headings == self.sections + 1:
+                            self.prefix = self.text()[:self._line_start]
+                            return self.prefix
+                    # Mark the line as classified
+                    self._line_head = self._line_head.ljust(len(SECTION_HEADING_MARKER))
+
+            if newline == -1:
+                break
+            self._line_start = offset + newline + 1
+            self._line_head = ""
+            position = newline + 1
+
+        return None
+
+    def text(self) -> str:
+        """
+        Get everything streamed so far.
+        """
+        return "".join(self._chunks)
@@ -6,35 +6,159 @@
 # Imports
 # -------------------------------------------------------------------------------- #
 
+import atexit
+import hashlib
+import json
 import logging
+import logging.handlers
+import queue
 import sys
 import os
+import time
+from typing import Any, Optional, TextIO, Tuple
 
 # Load environment variables
-from dotenv import load_dotenv
-load_dotenv()
+from src.utils.env_utils import load_environment
+load_environment()
 
 # -------------------------------------------------------------------------------- #
 # Logger Configuration
 # -------------------------------------------------------------------------------- #
 
-# Create logger
-logger = logging.getLogger('article-handler')
+# Get from environment or default to INFO
+log_level = os.getenv("LOG_LEVEL", "INFO").upper()
 
-# Default log level
+# `json` writes one JSON object per line, `text` the classic human-readable format
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
 
+# Hand records to a background thread that formats and writes them
+LOG_QUEUE_ENABLED = os.getenv("LOG_QUEUE_ENABLED", "false").lower() == "true"
 
-# Get from environment or default to INFO
-log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-logger.setLevel(getattr(logging, log_level, logging.INFO))
+# Longest payload (event, prompt, article body, response) written to a log line
+LOG_MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", "512"))
+
+# Nothing reads the thread, process or multiprocessing fields, so skip collecting them per record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+
+# -------------------------------------------------------------------------------- #
+# Payloads
+# -------------------------------------------------------------------------------- #
+
+class LogPayload:
+    """
+    A large value logged as a lazy argument: `logger.debug("Response: %s", LogPayload(response))`.
+
+    It is only serialized if the record is actually formatted. Values longer than `limit`
+    are truncated, and tagged with their full length and a hash so identical payloads can
+    still be matched across log lines.
+    """
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: int = LOG_MAX_FIELD_CHARS):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        value = self.value
+        if hasattr(value, "model_dump_json"):
+            text = value.model_dump_json()
+        elif isinstance(value, (dict, list)):
+            text = json.dumps(value, default=str)
+        else:
+            text = str(value)
+
+        if len(text) <= self.limit:
+            return text
+        digest = hashlib.sha256(text.encode()).hexdigest()[:12]
+        return f"{text[:self.limit]}... [truncated, {len(text)} chars, sha256:{digest}]"
+
+
+# -------------------------------------------------------------------------------- #
+# Formatters and Handlers
+# -------------------------------------------------------------------------------- #
 
-# Create stdout handler
-stdout_handler = logging.StreamHandler(sys.stdout)
-stdout_handler.setLevel(logger.level)
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as single-line JSON objects, which CloudWatch Logs Insights parses into fields.
 
-# Create formatter with function name
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(funcName)s - %(message)s')
-stdout_handler.setFormatter(formatter)
+    Structured fields can be attached with `extra={"fields": {...}}`.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._second = -1
+        self._second_text = ""
+
+    def _timestamp(self, record: logging.LogRecord) -> str:
+        # Formatting the date dominates the cost of a line, so it is only redone once per second
+        second = int(record.created)
+        if second != self._second:
+            self._second, self._second_text = second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._second_text}.{int(record.msecs):03d}Z"
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self._timestamp(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "function": record.funcName,
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves all formatting to the listener thread.
+
+    The stock handler formats the message in the logging thread before queueing it. Records
+    here keep their arguments, so arguments must not be mutated after they are logged.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def create_log_handler(stream: TextIO = sys.stdout,
+                       log_format: str = LOG_FORMAT,
+                       use_queue: bool = LOG_QUEUE_ENABLED,
+                       ) -> Tuple[logging.Handler, Optional[logging.handlers.QueueListener]]:
+    """
+    Create the handler that writes log records to `stream`, and the queue listener if queued.
+    """
+    stream_handler = logging.StreamHandler(stream)
+    if log_format == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(funcName)s - %(message)s'))
+
+    if not use_queue:
+        return stream_handler, None
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, stream_handler)
+    listener.start()
+    return DeferredQueueHandler(records), listener
+
+
+# -------------------------------------------------------------------------------- #
+# Logger
+# -------------------------------------------------------------------------------- #
+
+# Create logger
+logger = logging.getLogger('article-handler')
+logger.setLevel(getattr(logging, log_level, logging.INFO))
 
-# Add handler to logger
-logger.addHandler(stdout_handler)
+# Add the stdout handler, flushing the queue (if any) on exit
+log_handler, log_listener = create_log_handler()
+logger.addHandler(log_handler)
+if log_listener is not None:
+    atexit.register(log_listener.stop)
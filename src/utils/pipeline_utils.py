@@ -0,0 +1,190 @@
+# -------------------------------------------------------------------------------- #
+# Pipeline Utils
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Built-in imports
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Set, Tuple
+
+# Logging
+from src.utils.logger import logger
+
+# Tracing
+from src.utils.tracing import span
+
+
+# -------------------------------------------------------------------------------- #
+# Types
+# -------------------------------------------------------------------------------- #
+
+@dataclass(frozen=True)
+class PipelineStep:
+    """
+    A single pipeline step. `run` receives the results of every completed step keyed by name.
+
+    Steps with `dump` and `load` are checkpointed: their result is saved as a string once
+    they finish, and restored instead of re-running them on a replay.
+    """
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    dump: Optional[Callable[[Any], str]] = None
+    load: Optional[Callable[[str], Any]] = None
+
+
+class PipelineCheckpoint(Protocol):
+    """
+    Storage for the serialized results of checkpointed steps.
+    """
+
+    def get(self, name: str) -> Optional[str]:
+        ...
+
+    async def save(self, name: str, value: str) -> None:
+        ...
+
+
+# -------------------------------------------------------------------------------- #
+# Helper Functions
+# -------------------------------------------------------------------------------- #
+
+def _validate_pipeline(steps: List[PipelineStep]) -> None:
+    """
+    Check that step names are unique, dependencies exist and there are no cycles.
+    """
+    names = [step.name for step in steps]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Duplicate pipeline step names: {names}")
+
+    dependencies = {step.name: step.depends_on for step in steps}
+    for step in steps:
+        missing = [name for name in step.depends_on if name not in dependencies]
+        if missing:
+            raise ValueError(f"Pipeline step {step.name} depends on unknown steps: {missing}")
+
+    # Depth-first search for cycles
+    visiting, visited = set(), set()
+
+    def visit(name: str) -> None:
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"Pipeline has a dependency cycle through step: {name}")
+        visiting.add(name)
+        for dependency in dependencies[name]:
+            visit(dependency)
+        visiting.remove(name)
+        visited.add(name)
+
+    for name in names:
+        visit(name)
+
+
+def _skippable_steps(steps: List[PipelineStep], restored: Set[str]) -> Set[str]:
+    """
+    Find the steps that only restored steps depend on, so a resumed pipeline need not run them.
+    """
+    dependents: Dict[str, Set[str]] = {step.name: set() for step in steps}
+    for step in steps:
+        for dependency in step.depends_on:
+            dependents[dependency].add(step.name)
+
+    skipped = set(restored)
+    changed = True
+    while changed:
+        changed = False
+        for step in steps:
+            if step.name not in skipped and dependents[step.name] and dependents[step.name] <= skipped:
+                skipped.add(step.name)
+                changed = True
+    return skipped - restored
+
+
+def _first_exception(error: BaseException) -> BaseException:
+    """
+    Unwrap (possibly nested) exception groups raised by a task group into the first real error.
+    """
+    while isinstance(error, BaseExceptionGroup):
+        error = error.exceptions[0]
+    return error
+
+
+# -------------------------------------------------------------------------------- #
+# Functions
+# -------------------------------------------------------------------------------- #
+
+async def run_pipeline(steps: List[PipelineStep],
+                       on_step_complete: Optional[Callable[[str, float], Awaitable[None]]] = None,
+                       checkpoint: Optional[PipelineCheckpoint] = None,
+                       ) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Run pipeline steps with as much concurrency as their dependencies allow.
+
+    Every step starts as soon as the steps it depends on have finished. If any step fails,
+    the remaining steps are cancelled and the original error is raised. `on_step_complete`
+    is awaited with the name and duration of every step as it finishes.
+
+    Every step runs in a `pipeline.<name>` tracing span.
+
+    With a `checkpoint`, checkpointed steps that already finished in an earlier run are
+    restored (with a duration of 0), and steps needed only by restored steps are skipped.
+
+    Returns the results and the duration in seconds of each step, keyed by step name.
+    """
+    _validate_pipeline(steps)
+
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+    done_events = {step.name: asyncio.Event() for step in steps}
+
+    # Restore checkpointed results from an earlier run
+    restored: Set[str] = set()
+    if checkpoint is not None:
+        for step in steps:
+            saved = checkpoint.get(step.name) if step.load is not None else None
+            if saved is not None:
+                results[step.name] = step.load(saved)
+                restored.add(step.name)
+    skipped = _skippable_steps(steps, restored) if restored else set()
+    if restored:
+        logger.info(f"Resuming pipeline. Restored steps: {sorted(restored)}. Skipped steps: {sorted(skipped)}")
+
+    async def run_step(step: PipelineStep) -> None:
+        if step.name in skipped:
+            done_events[step.name].set()
+            return
+
+        # Wait for the dependencies
+        for dependency in step.depends_on:
+            await done_events[dependency].wait()
+
+        start_time = time.monotonic()
+        with span(f"pipeline.{step.name}") as step_span:
+            if step.name in restored:
+                step_span.set("restored", True)
+            else:
+                results[step.name] = await step.run(results)
+                if checkpoint is not None and step.dump is not None:
+                    await checkpoint.save(step.name, step.dump(results[step.name]))
+        timings[step.name] = time.monotonic() - start_time
+
+        logger.debug("Pipeline step %s finished in %.2fs", step.name, timings[step.name])
+        done_events[step.name].set()
+
+        if on_step_complete is not None:
+            await on_step_complete(step.name, timings[step.name])
+
+    try:
+        async with asyncio.TaskGroup() as task_group:
+            for step in steps:
+                task_group.create_task(run_step(step), name=step.name)
+    except BaseExceptionGroup as error_group:
+        raise _first_exception(error_group)
+
+    return results, timings
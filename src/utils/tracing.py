@@ -0,0 +1,186 @@
+# -------------------------------------------------------------------------------- #
+# Tracing
+# -------------------------------------------------------------------------------- #
+
+# -------------------------------------------------------------------------------- #
+# Imports
+# -------------------------------------------------------------------------------- #
+
+# Built-in imports
+import functools
+import json
+import os
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+# Load environment variables
+from src.utils.env_utils import load_environment
+load_environment()
+
+
+# -------------------------------------------------------------------------------- #
+# Tracing Configuration
+# -------------------------------------------------------------------------------- #
+
+# Record spans and emit them as CloudWatch Embedded Metric Format (EMF) log lines
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+
+# CloudWatch namespace the span metrics are published under
+TRACING_NAMESPACE = os.getenv("TRACING_NAMESPACE", "ArticleHandler")
+
+# CloudWatch units of the known span metrics. Other metrics are published as counts.
+METRIC_UNITS = {
+    "duration": "Milliseconds",
+    "bytes": "Bytes",
+    "prompt_tokens": "Count",
+    "cached_tokens": "Count",
+    "completion_tokens": "Count",
+    "cache_hit": "Count",
+    "error": "Count",
+}
+
+
+# -------------------------------------------------------------------------------- #
+# Spans
+# -------------------------------------------------------------------------------- #
+
+class Span:
+    """
+    A timed unit of work. Metrics (durations, tokens, bytes, cache hits) are published to
+    CloudWatch, properties (IDs, names) are only searchable in the log line.
+    """
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "metrics", "properties", "_start_time", "_token")
+
+    def __init__(self, name: str, parent: Optional["Span"], properties: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.metrics: Dict[str, float] = {}
+        self.properties = properties
+        self._start_time = 0.0
+        self._token = None
+
+    def add(self, metric: str, value: float) -> None:
+        """
+        Add to a metric of the span, such as tokens or bytes.
+        """
+        self.metrics[metric] = self.metrics.get(metric, 0) + value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Set a property of the span.
+        """
+        self.properties[key] = value
+
+    def __enter__(self) -> "Span":
+        self._start_time = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.metrics["duration"] = (time.perf_counter() - self._start_time) * 1000
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.metrics["error"] = 1
+            self.properties["error_type"] = exc_type.__name__
+        emit(self)
+
+
+class _NoopSpan:
+    """
+    Shared stand-in returned while tracing is disabled, so instrumented code costs one call.
+    """
+    __slots__ = ()
+
+    def add(self, metric: str, value: float) -> None:
+        pass
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+# The innermost open span of the running task. Tasks inherit it from the code that created them.
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def span(name: str, **properties: Any):
+    """
+    Open a span as a context manager: `with span("cms.create_article") as s: s.add("bytes", n)`.
+    """
+    if not TRACING_ENABLED:
+        return NOOP_SPAN
+    return Span(name, _current_span.get(), properties)
+
+
+def current_span():
+    """
+    Get the innermost open span, to add metrics to it from code that does not own it.
+    """
+    if not TRACING_ENABLED:
+        return NOOP_SPAN
+    return _current_span.get() or NOOP_SPAN
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """
+    Decorate an async function to run it inside a span. A no-op while tracing is disabled.
+    """
+    def decorator(func: F) -> F:
+        if not TRACING_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# -------------------------------------------------------------------------------- #
+# Embedded Metric Format
+# -------------------------------------------------------------------------------- #
+
+def to_emf(finished_span: Span) -> Dict[str, Any]:
+    """
+    Build the CloudWatch Embedded Metric Format document of a finished span.
+    """
+    return {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": TRACING_NAMESPACE,
+                "Dimensions": [["span"]],
+                "Metrics": [{"Name": metric, "Unit": METRIC_UNITS.get(metric, "Count")}
+                            for metric in finished_span.metrics],
+            }],
+        },
+        "span": finished_span.name,
+        "trace_id": finished_span.trace_id,
+        "span_id": finished_span.span_id,
+        "parent_id": finished_span.parent_id,
+        **finished_span.properties,
+        **finished_span.metrics,
+    }
+
+
+def emit(finished_span: Span) -> None:
+    """
+    Write a finished span to stdout as one EMF line, which Lambda forwards to CloudWatch Logs.
+    """
+    sys.stdout.write(json.dumps(to_emf(finished_span), default=str) + "\n")